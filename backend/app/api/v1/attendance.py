@@ -1,15 +1,21 @@
 """Attendance management endpoints."""
 
+import asyncio
+import base64
+import json
 import logging
+import operator
 from datetime import datetime
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import CurrentUser, get_current_user
 from app.core.errors import NotFoundError
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
 from app.schemas.common import PaginatedResponse, PaginationMeta, SuccessResponse
 from app.schemas.person import (
     AttendanceResponse,
@@ -26,10 +32,89 @@ router = APIRouter(tags=["Attendance"])
 logger = logging.getLogger(__name__)
 
 
+# AttendanceResponse fields, read straight off ORM rows for list pages
+_ATTENDANCE_FIELDS = (
+    "id",
+    "person_id",
+    "person_name",
+    "attendance_date",
+    "status",
+    "check_in_time",
+    "check_in_confidence",
+    "check_in_source",
+    "check_out_time",
+    "check_out_confidence",
+    "check_out_source",
+    "duration_minutes",
+    "is_manual",
+    "created_at",
+    "updated_at",
+)
+_ATTENDANCE_KEYS = tuple(AttendanceResponse.model_fields[f].alias or f for f in _ATTENDANCE_FIELDS)
+_attendance_row = operator.attrgetter(*_ATTENDANCE_FIELDS)
+
+# Daily report computations in flight, keyed by ISO day
+_daily_report_in_flight: dict[str, asyncio.Task] = {}
+
+
 # Helper functions
-async def get_attendance_service(db: AsyncSession = Depends(get_db)) -> AttendanceService:
-    """Get attendance service."""
-    return AttendanceService(db)
+async def _count_person(person_id: str, **filters) -> int:
+    """Count a person's records on a separate session, so it can run alongside the page query."""
+    async with AsyncSessionLocal() as db:
+        return await AttendanceService(db).count_person_attendance(person_id, **filters)
+
+
+async def _count_range(from_date: datetime, to_date: datetime, **filters) -> int:
+    """Count records in a date range on a separate session, so it can run alongside the page query."""
+    async with AsyncSessionLocal() as db:
+        return await AttendanceService(db).count_attendance_range(from_date, to_date, **filters)
+
+
+def _encode_cursor(key: tuple[datetime, str]) -> str:
+    """Encode an (attendance_date, id) seek key as an opaque cursor."""
+    attendance_date, attendance_id = key
+    payload = json.dumps({"d": attendance_date.isoformat(), "id": attendance_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode an opaque cursor back into an (attendance_date, id) seek key."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["d"]), str(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _attendance_page(records: list, meta: PaginationMeta) -> ORJSONResponse:
+    """
+    Serialize a page of attendance rows straight to JSON.
+
+    Rows come from the DB already typed, so per-row Pydantic validation is
+    skipped; returning a Response directly also skips response_model
+    re-validation. The response_model is kept for the OpenAPI schema.
+    """
+    return ORJSONResponse(
+        {
+            "success": True,
+            "data": [dict(zip(_ATTENDANCE_KEYS, _attendance_row(record))) for record in records],
+            "meta": meta.model_dump(),
+        }
+    )
+
+
+def _offset_meta(paginated: list, page: int, page_size: int, skip: int, total: int) -> PaginationMeta:
+    """Build offset-mode pagination meta, handing out a cursor so clients can switch to keyset mode."""
+    has_more = bool(paginated) and skip + len(paginated) < total
+    next_cursor = _encode_cursor((paginated[-1].attendance_date, paginated[-1].id)) if has_more else None
+
+    return PaginationMeta(
+        page=page,
+        pageSize=page_size,
+        total=total,
+        totalPages=(total + page_size - 1) // page_size,
+        nextCursor=next_cursor,
+    )
 
 
 # ============================================================================
@@ -41,7 +126,7 @@ async def get_attendance_service(db: AsyncSession = Depends(get_db)) -> Attendan
 async def check_in(
     request: CheckInRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    service: AttendanceService = Depends(get_attendance_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CheckInResponse]:
     """Record check-in for a person."""
     if not current_user.has_permission("attendance:write"):
@@ -50,6 +135,8 @@ async def check_in(
             detail="You don't have permission to record attendance",
         )
 
+    service = AttendanceService(db)
+
     result = await service.check_in(
         person_id=request.person_id,
         confidence=request.confidence_threshold,
@@ -78,7 +165,7 @@ async def check_in(
 async def check_out(
     request: CheckOutRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    service: AttendanceService = Depends(get_attendance_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CheckOutResponse]:
     """Record check-out for a person."""
     if not current_user.has_permission("attendance:write"):
@@ -87,6 +174,8 @@ async def check_out(
             detail="You don't have permission to record attendance",
         )
 
+    service = AttendanceService(db)
+
     result = await service.check_out(person_id=request.person_id)
 
     if result["success"]:
@@ -120,10 +209,11 @@ async def get_attendance(
     person_id: Optional[str] = Query(None, description="Filter by person"),
     from_date: Optional[datetime] = Query(None, description="From date"),
     to_date: Optional[datetime] = Query(None, description="To date"),
-    status: Optional[str] = Query(None, description="Filter by status"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (keyset pagination)"),
     current_user: CurrentUser = Depends(get_current_user),
-    service: AttendanceService = Depends(get_attendance_service),
-) -> PaginatedResponse[AttendanceResponse]:
+    db: AsyncSession = Depends(get_db),
+) -> ORJSONResponse:
     """Get attendance records."""
     if not current_user.has_permission("attendance:read"):
         raise HTTPException(
@@ -131,48 +221,56 @@ async def get_attendance(
             detail="You don't have permission to view attendance",
         )
 
+    service = AttendanceService(db)
+
+    if cursor is not None:
+        after = _decode_cursor(cursor)
+        if person_id or (from_date and to_date):
+            paginated, next_key = await service.list_after(
+                after,
+                page_size,
+                person_id=person_id,
+                from_date=from_date,
+                to_date=to_date,
+                status=status_filter,
+            )
+        else:
+            paginated, next_key = [], None
+
+        return _attendance_page(
+            paginated,
+            PaginationMeta(
+                pageSize=page_size,
+                nextCursor=_encode_cursor(next_key) if next_key else None,
+            ),
+        )
+
     skip = (page - 1) * page_size
 
+    # Paginate in SQL; the count runs concurrently on its own session (never share one across awaits)
     if person_id:
-        records = await service.get_person_attendance(
-            person_id,
-            from_date=from_date,
-            to_date=to_date,
-            limit=page_size + skip,
-            offset=0,
+        from_date, to_date = service.default_range(from_date, to_date)
+        paginated, total = await asyncio.gather(
+            service.get_person_attendance(
+                person_id,
+                from_date=from_date,
+                to_date=to_date,
+                status=status_filter,
+                limit=page_size,
+                offset=skip,
+            ),
+            _count_person(person_id, from_date=from_date, to_date=to_date, status=status_filter),
         )
     elif from_date and to_date:
-        records = await service.get_daily_attendance(from_date)
+        paginated, total = await asyncio.gather(
+            service.get_attendance_range(from_date, to_date, status=status_filter, limit=page_size, offset=skip),
+            _count_range(from_date, to_date, status=status_filter),
+        )
     else:
-        records = []
-
-    # Apply pagination
-    paginated = records[skip : skip + page_size]
-    total = len(records)
-    total_pages = (total + page_size - 1) // page_size
-
-    return PaginatedResponse(
-        data=[
-            AttendanceResponse(
-                id=r.id,
-                person_id=r.person_id,
-                attendance_date=r.attendance_date,
-                check_in_time=r.check_in_time,
-                check_in_confidence=r.check_in_confidence,
-                check_in_source=r.check_in_source,
-                check_out_time=r.check_out_time,
-                check_out_confidence=r.check_out_confidence,
-                check_out_source=r.check_out_source,
-                duration_minutes=r.duration_minutes,
-                status=r.status,
-                is_manual=r.is_manual,
-                createdAt=r.created_at,
-                updatedAt=r.updated_at,
-            )
-            for r in paginated
-        ],
-        meta=PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=total_pages),
-    )
+        paginated = []
+        total = 0
+
+    return _attendance_page(paginated, _offset_meta(paginated, page, page_size, skip, total))
 
 
 @router.get("/{person_id}", response_model=PaginatedResponse[AttendanceResponse])
@@ -182,9 +280,11 @@ async def get_person_attendance(
     page_size: int = Query(30, ge=1, le=100, description="Page size"),
     from_date: Optional[datetime] = Query(None, description="From date"),
     to_date: Optional[datetime] = Query(None, description="To date"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page (keyset pagination)"),
     current_user: CurrentUser = Depends(get_current_user),
-    service: AttendanceService = Depends(get_attendance_service),
-) -> PaginatedResponse[AttendanceResponse]:
+    db: AsyncSession = Depends(get_db),
+) -> ORJSONResponse:
     """Get attendance for a specific person."""
     if not current_user.has_permission("attendance:read"):
         raise HTTPException(
@@ -192,43 +292,43 @@ async def get_person_attendance(
             detail="You don't have permission to view attendance",
         )
 
-    skip = (page - 1) * page_size
+    service = AttendanceService(db)
 
-    try:
-        records = await service.get_person_attendance(
-            person_id,
+    if cursor is not None:
+        paginated, next_key = await service.list_after(
+            _decode_cursor(cursor),
+            page_size,
+            person_id=person_id,
             from_date=from_date,
             to_date=to_date,
-            limit=page_size + skip,
-            offset=0,
+            status=status_filter,
+        )
+
+        return _attendance_page(
+            paginated,
+            PaginationMeta(
+                pageSize=page_size,
+                nextCursor=_encode_cursor(next_key) if next_key else None,
+            ),
         )
 
-        paginated = records[skip : skip + page_size]
-        total = len(records)
-        total_pages = (total + page_size - 1) // page_size
-
-        return PaginatedResponse(
-            data=[
-                AttendanceResponse(
-                    id=r.id,
-                    person_id=r.person_id,
-                    attendance_date=r.attendance_date,
-                    check_in_time=r.check_in_time,
-                    check_in_confidence=r.check_in_confidence,
-                    check_in_source=r.check_in_source,
-                    check_out_time=r.check_out_time,
-                    check_out_confidence=r.check_out_confidence,
-                    check_out_source=r.check_out_source,
-                    duration_minutes=r.duration_minutes,
-                    status=r.status,
-                    is_manual=r.is_manual,
-                    createdAt=r.created_at,
-                    updatedAt=r.updated_at,
-                )
-                for r in paginated
-            ],
-            meta=PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=total_pages),
+    skip = (page - 1) * page_size
+    from_date, to_date = service.default_range(from_date, to_date)
+
+    try:
+        paginated, total = await asyncio.gather(
+            service.get_person_attendance(
+                person_id,
+                from_date=from_date,
+                to_date=to_date,
+                status=status_filter,
+                limit=page_size,
+                offset=skip,
+            ),
+            _count_person(person_id, from_date=from_date, to_date=to_date, status=status_filter),
         )
+
+        return _attendance_page(paginated, _offset_meta(paginated, page, page_size, skip, total))
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -238,11 +338,27 @@ async def get_person_attendance(
 # ============================================================================
 
 
+async def _compute_daily_report(report_date: datetime) -> dict:
+    """Compute the daily report on its own session, independent of any one request."""
+    async with AsyncSessionLocal() as db:
+        return await AttendanceService(db).get_daily_attendance_summary(report_date)
+
+
+def _daily_report(report_date: datetime) -> asyncio.Task:
+    """Get the in-flight report task for a day, starting one if none is running (single flight)."""
+    key = report_date.date().isoformat()
+    task = _daily_report_in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(_compute_daily_report(report_date))
+        _daily_report_in_flight[key] = task
+        task.add_done_callback(lambda _: _daily_report_in_flight.pop(key, None))
+    return task
+
+
 @router.get("/reports/daily", response_model=SuccessResponse[dict])
 async def get_daily_attendance_report(
     date: Optional[datetime] = Query(None, description="Date (default: today)"),
     current_user: CurrentUser = Depends(get_current_user),
-    service: AttendanceService = Depends(get_attendance_service),
 ) -> SuccessResponse[dict]:
     """Get daily attendance report."""
     if not current_user.has_permission("attendance:read"):
@@ -251,19 +367,43 @@ async def get_daily_attendance_report(
             detail="You don't have permission to view reports",
         )
 
-    date = date or datetime.utcnow()
-    report = await service.get_daily_attendance_summary(date)
+    # Concurrent requests for the same day share one computation; shield so a
+    # client disconnecting doesn't cancel it for the others
+    report = await asyncio.shield(_daily_report(date or datetime.utcnow()))
 
     return SuccessResponse(data=report)
 
 
+@router.get("/reports/daily/export")
+async def export_daily_attendance(
+    date: Optional[datetime] = Query(None, description="Date (default: today)"),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> StreamingResponse:
+    """Export a day's attendance records as NDJSON (one record per line), streamed."""
+    if not current_user.has_permission("attendance:read"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view reports",
+        )
+
+    report_date = date or datetime.utcnow()
+
+    async def rows():
+        # Own session: the stream outlives the endpoint call
+        async with AsyncSessionLocal() as db:
+            async for record in AttendanceService(db).stream_daily_attendance(report_date):
+                yield orjson.dumps(dict(zip(_ATTENDANCE_KEYS, _attendance_row(record)))) + b"\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
 @router.get("/{person_id}/statistics", response_model=SuccessResponse[AttendanceStatistics])
 async def get_person_attendance_stats(
     person_id: str,
     from_date: Optional[datetime] = Query(None, description="From date"),
     to_date: Optional[datetime] = Query(None, description="To date"),
     current_user: CurrentUser = Depends(get_current_user),
-    service: AttendanceService = Depends(get_attendance_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[AttendanceStatistics]:
     """Get attendance statistics for a person."""
     if not current_user.has_permission("attendance:read"):
@@ -272,6 +412,8 @@ async def get_person_attendance_stats(
             detail="You don't have permission to view statistics",
         )
 
+    service = AttendanceService(db)
+
     try:
         stats = await service.get_person_attendance_stats(person_id, from_date, to_date)
 
@@ -299,7 +441,7 @@ async def get_person_attendance_stats(
 async def get_person_status(
     person_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    service: AttendanceService = Depends(get_attendance_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[PersonCurrentStatus]:
     """Get current check-in status for a person."""
     if not current_user.has_permission("attendance:read"):
@@ -308,12 +450,14 @@ async def get_person_status(
             detail="You don't have permission to view status",
         )
 
+    service = AttendanceService(db)
+
     status_data = await service.get_current_check_in_status(person_id)
 
     return SuccessResponse(
         data=PersonCurrentStatus(
             person_id=status_data["person_id"],
-            person_name="",  # Would need to fetch from person service
+            person_name=status_data["person_name"] or "",
             checked_in=status_data["checked_in"],
             check_in_time=status_data.get("check_in_time"),
             current_duration_minutes=status_data.get("current_duration_minutes"),
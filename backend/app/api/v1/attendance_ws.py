@@ -1,17 +1,19 @@
 """Real-time attendance WebSocket endpoints for live attendance tracking."""
 
 import asyncio
-import json
 import logging
 from datetime import datetime
-from typing import Optional, Set
+from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocketDisconnect, status, WebSocket
-from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+from fastapi import APIRouter, HTTPException, Query, WebSocketDisconnect, status, WebSocket
+from starlette.websockets import WebSocketState
 
+from app.core.config import settings
 from app.core.deps import CurrentUser, get_current_user
-from app.db.session import get_db
+from app.core.redis import cache_service
+from app.db.session import AsyncSessionLocal
 from app.schemas.person import PersonCurrentStatus
 from app.services.attendance_service import AttendanceService
 
@@ -25,9 +27,12 @@ class AttendanceWebSocketManager:
 
     def __init__(self):
         """Initialize the connection manager."""
-        self.active_connections: dict[str, list[WebSocket]] = {}
-        self.person_subscriptions: dict[str, Set[str]] = {}  # person_id -> client_ids
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        self.client_connections: dict[str, WebSocket] = {}  # client_id -> websocket
+        self.ws_to_client: dict[WebSocket, str] = {}  # websocket -> client_id
+        self.person_subscriptions: dict[str, set[str]] = {}  # person_id -> client_ids
         self.client_filters: dict[str, dict] = {}  # client_id -> filter settings
+        self._ping_task: Optional[asyncio.Task] = None
 
     async def connect(
         self,
@@ -36,13 +41,16 @@ class AttendanceWebSocketManager:
         person_id: Optional[str] = None,
         min_confidence: float = 0.0,
     ):
-        """Register a new WebSocket connection."""
-        await websocket.accept()
+        """Register a new WebSocket connection (or move an accepted one to a new subscription)."""
+        if websocket.application_state == WebSocketState.CONNECTING:
+            await websocket.accept()
 
         # Store connection
         if person_id not in self.active_connections:
-            self.active_connections[person_id] = []
-        self.active_connections[person_id].append(websocket)
+            self.active_connections[person_id] = set()
+        self.active_connections[person_id].add(websocket)
+        self.client_connections[client_id] = websocket
+        self.ws_to_client[websocket] = client_id
 
         # Store subscription info
         if person_id not in self.person_subscriptions:
@@ -59,13 +67,17 @@ class AttendanceWebSocketManager:
 
     async def disconnect(self, client_id: str, person_id: Optional[str] = None):
         """Unregister a WebSocket connection."""
+        websocket = self.client_connections.pop(client_id, None)
+        if websocket is not None:
+            self.ws_to_client.pop(websocket, None)
+
         if person_id and person_id in self.active_connections:
-            # Remove from connections list
-            self.active_connections[person_id] = [
-                ws
-                for ws in self.active_connections[person_id]
-                if not (hasattr(ws, "_client_id") and ws._client_id == client_id)
-            ]
+            # Remove from connections set in place; a broadcast may still hold it
+            connections = self.active_connections[person_id]
+            if websocket is not None:
+                connections.discard(websocket)
+            if not connections:
+                del self.active_connections[person_id]
 
             # Remove from subscriptions
             if person_id in self.person_subscriptions:
@@ -92,55 +104,29 @@ class AttendanceWebSocketManager:
         duration_minutes: Optional[int] = None,
     ):
         """Broadcast attendance event to all subscribed clients."""
+        # datetimes are left as-is; orjson encodes them natively
         event_data = {
             "type": event_type,
-            "event_timestamp": datetime.utcnow().isoformat(),
+            "event_timestamp": datetime.utcnow(),
             "person_id": person_id,
             "person_name": person_name,
             "action": action,
-            "timestamp": timestamp.isoformat(),
+            "timestamp": timestamp,
             "confidence": round(confidence, 3),
             "attendance_id": attendance_id,
         }
 
         if check_in_time:
-            event_data["check_in_time"] = check_in_time.isoformat()
+            event_data["check_in_time"] = check_in_time
 
         if check_out_time:
-            event_data["check_out_time"] = check_out_time.isoformat()
+            event_data["check_out_time"] = check_out_time
 
         if duration_minutes is not None:
             event_data["duration_minutes"] = duration_minutes
 
-        message = json.dumps(event_data)
-
-        # Broadcast to all connections for this person
-        if person_id in self.active_connections:
-            disconnected = []
-            for websocket in self.active_connections[person_id]:
-                try:
-                    await websocket.send_text(message)
-                except Exception as e:
-                    logger.error(f"Error sending attendance event: {e}")
-                    disconnected.append(websocket)
-
-            # Clean up disconnected connections
-            for ws in disconnected:
-                self.active_connections[person_id].remove(ws)
-
-        # Broadcast to "all persons" subscribers
-        if "all" in self.active_connections:
-            disconnected = []
-            for websocket in self.active_connections["all"]:
-                try:
-                    await websocket.send_text(message)
-                except Exception as e:
-                    logger.error(f"Error sending attendance event: {e}")
-                    disconnected.append(websocket)
-
-            # Clean up disconnected connections
-            for ws in disconnected:
-                self.active_connections["all"].remove(ws)
+        message = orjson.dumps(event_data).decode()
+        await self._send_to_subscribers(person_id, message, confidence=confidence)
 
         logger.info(f"Broadcasted {event_type} for person {person_id} to subscribers")
 
@@ -155,53 +141,88 @@ class AttendanceWebSocketManager:
         """Broadcast person status update."""
         event_data = {
             "type": "person_status_update",
-            "event_timestamp": datetime.utcnow().isoformat(),
+            "event_timestamp": datetime.utcnow(),
             "person_id": person_id,
             "person_name": person_name,
             "checked_in": checked_in,
-            "check_in_time": check_in_time.isoformat() if check_in_time else None,
+            "check_in_time": check_in_time,
             "current_duration_minutes": current_duration_minutes,
         }
 
-        message = json.dumps(event_data)
-
-        # Broadcast to all connections for this person
-        if person_id in self.active_connections:
-            disconnected = []
-            for websocket in self.active_connections[person_id]:
-                try:
-                    await websocket.send_text(message)
-                except Exception as e:
-                    logger.error(f"Error sending status update: {e}")
-                    disconnected.append(websocket)
-
-            for ws in disconnected:
-                self.active_connections[person_id].remove(ws)
-
-        # Broadcast to "all persons" subscribers
-        if "all" in self.active_connections:
-            disconnected = []
-            for websocket in self.active_connections["all"]:
-                try:
-                    await websocket.send_text(message)
-                except Exception as e:
-                    logger.error(f"Error sending status update: {e}")
-                    disconnected.append(websocket)
-
-            for ws in disconnected:
-                self.active_connections["all"].remove(ws)
-
-    async def send_ping(self, websocket: WebSocket):
-        """Send keep-alive ping."""
-        try:
-            await websocket.send_json(
-                {
-                    "type": "ping",
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
+        message = orjson.dumps(event_data).decode()
+        await self._send_to_subscribers(person_id, message)
+
+    def _accepts(self, websocket: WebSocket, confidence: float) -> bool:
+        """Check a subscriber's min_confidence filter."""
+        client_filter = self.client_filters.get(self.ws_to_client.get(websocket), {})
+        return client_filter.get("min_confidence", 0.0) <= confidence
+
+    async def _send_to_subscribers(
+        self,
+        person_id: str,
+        message: str,
+        confidence: Optional[float] = None,
+    ):
+        """Send one pre-encoded message concurrently to a person's and "all" subscribers."""
+        person_connections = self.active_connections.get(person_id, set())
+        all_connections = self.active_connections.get("all", set())
+        targets = [
+            websocket
+            for websocket in person_connections | all_connections
+            if confidence is None or self._accepts(websocket, confidence)
+        ]
+        if not targets:
+            return
+
+        results = await asyncio.gather(
+            *(websocket.send_text(message) for websocket in targets),
+            return_exceptions=True,
+        )
+
+        # Drop sockets whose send failed
+        for websocket, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending attendance message: {result}")
+                person_connections.discard(websocket)
+                all_connections.discard(websocket)
+
+        for key in (person_id, "all"):
+            if key in self.active_connections and not self.active_connections[key]:
+                del self.active_connections[key]
+
+    def start_ping_loop(self):
+        """Start the shared keep-alive loop (one task per manager, not per socket)."""
+        if self._ping_task is None or self._ping_task.done():
+            self._ping_task = asyncio.create_task(self._ping_loop())
+
+    async def stop_ping_loop(self):
+        """Stop the shared keep-alive loop."""
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            try:
+                await self._ping_task
+            except asyncio.CancelledError:
+                pass
+            self._ping_task = None
+
+    async def _ping_loop(self):
+        """Send one pre-encoded ping frame to every socket each interval."""
+        while True:
+            await asyncio.sleep(settings.WEBSOCKET_PING_INTERVAL)
+
+            targets = list(self.client_connections.values())
+            if not targets:
+                continue
+
+            frame = orjson.dumps({"type": "ping", "timestamp": datetime.utcnow()}).decode()
+            results = await asyncio.gather(
+                *(websocket.send_text(frame) for websocket in targets),
+                return_exceptions=True,
             )
-        except Exception as e:
-            logger.error(f"Error sending ping: {e}")
+
+            failed = sum(isinstance(result, Exception) for result in results)
+            if failed:
+                logger.debug(f"Ping failed for {failed} of {len(targets)} attendance sockets")
 
 
 # Global connection manager
@@ -219,7 +240,6 @@ async def websocket_attendance(
     client_id: str,
     person_id: Optional[str] = Query(None, description="Subscribe to specific person (None = all persons)"),
     min_confidence: float = Query(0.0, ge=0.0, le=1.0, description="Minimum confidence threshold"),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     WebSocket endpoint for real-time attendance updates.
@@ -262,9 +282,6 @@ async def websocket_attendance(
             min_confidence,
         )
 
-        # Store client_id on websocket for later reference
-        websocket._client_id = client_id
-
         # Send welcome message
         await websocket.send_json(
             {
@@ -278,82 +295,74 @@ async def websocket_attendance(
 
         # Send current status if person-specific subscription
         if person_id:
-            service = AttendanceService(db)
             try:
-                status_data = await service.get_current_check_in_status(person_id)
-                await websocket.send_json(
-                    {
-                        "type": "initial_status",
-                        "person_id": person_id,
+                initial_status = await cache_service.get_cached_person_status(person_id)
+                if initial_status is None:
+                    # Short-lived session; the socket itself never holds a pooled connection
+                    async with AsyncSessionLocal() as db:
+                        status_data = await AttendanceService(db).get_current_check_in_status(person_id)
+                    initial_status = {
                         "checked_in": status_data.get("checked_in", False),
-                        "check_in_time": status_data.get("check_in_time", "").isoformat()
+                        "check_in_time": status_data["check_in_time"].isoformat()
                         if status_data.get("check_in_time")
                         else None,
                         "current_duration_minutes": status_data.get("current_duration_minutes"),
                     }
+                    await cache_service.cache_person_status(person_id, initial_status)
+
+                await websocket.send_json(
+                    {
+                        "type": "initial_status",
+                        "person_id": person_id,
+                        **initial_status,
+                    }
                 )
             except Exception as e:
                 logger.warning(f"Error fetching initial status: {e}")
 
-        # Keep-alive ping task
-        async def send_pings():
-            while True:
-                try:
-                    await asyncio.sleep(30)  # Send ping every 30 seconds
-                    await attendance_manager.send_ping(websocket)
-                except Exception as e:
-                    logger.debug(f"Ping task error: {e}")
-                    break
-
-        ping_task = asyncio.create_task(send_pings())
-
-        # Listen for messages from client
-        try:
-            while True:
-                data = await websocket.receive_text()
-                message = json.loads(data)
-
-                # Handle client messages
-                if message.get("type") == "pong":
-                    logger.debug(f"Received pong from client {client_id}")
-                elif message.get("type") == "subscribe":
-                    # Client can subscribe to different person
-                    new_person_id = message.get("person_id")
-                    new_min_confidence = message.get("min_confidence", 0.0)
-
-                    # Update subscription
-                    if subscription_target != new_person_id:
-                        await attendance_manager.disconnect(client_id, subscription_target)
-                        await attendance_manager.connect(
-                            websocket,
-                            client_id,
-                            new_person_id or "all",
-                            new_min_confidence,
-                        )
-
-                        await websocket.send_json(
-                            {
-                                "type": "subscription_updated",
-                                "new_subscription": new_person_id or "all",
-                                "timestamp": datetime.utcnow().isoformat(),
-                            }
-                        )
-                elif message.get("type") == "unsubscribe":
+        # Listen for messages from client (keep-alive pings come from the manager loop)
+        while True:
+            data = await websocket.receive_text()
+            message = orjson.loads(data)
+
+            # Handle client messages
+            if message.get("type") == "pong":
+                logger.debug(f"Received pong from client {client_id}")
+            elif message.get("type") == "subscribe":
+                # Client can subscribe to different person
+                new_person_id = message.get("person_id")
+                new_min_confidence = message.get("min_confidence", 0.0)
+
+                # Update subscription
+                if subscription_target != new_person_id:
+                    await attendance_manager.disconnect(client_id, subscription_target)
+                    await attendance_manager.connect(
+                        websocket,
+                        client_id,
+                        new_person_id or "all",
+                        new_min_confidence,
+                    )
+                    subscription_target = new_person_id or "all"
+
                     await websocket.send_json(
                         {
-                            "type": "disconnecting",
-                            "reason": "Client requested disconnect",
+                            "type": "subscription_updated",
+                            "new_subscription": new_person_id or "all",
                             "timestamp": datetime.utcnow().isoformat(),
                         }
                     )
-                    break
+            elif message.get("type") == "unsubscribe":
+                await websocket.send_json(
+                    {
+                        "type": "disconnecting",
+                        "reason": "Client requested disconnect",
+                        "timestamp": datetime.utcnow().isoformat(),
+                    }
+                )
+                break
 
-        finally:
-            ping_task.cancel()
-            try:
-                await ping_task
-            except asyncio.CancelledError:
-                pass
+        # Client asked to unsubscribe
+        await attendance_manager.disconnect(client_id, subscription_target)
 
     except WebSocketDisconnect:
         await attendance_manager.disconnect(client_id, subscription_target)
@@ -377,6 +386,7 @@ async def broadcast_check_in_event(
     check_in_time: Optional[datetime] = None,
 ):
     """Broadcast check-in event to all subscribed clients."""
+    await cache_service.invalidate_person_status(person_id)
     await attendance_manager.broadcast_attendance_event(
         event_type="attendance_event",
         person_id=person_id,
@@ -399,6 +409,7 @@ async def broadcast_check_out_event(
     duration_minutes: Optional[int] = None,
 ):
     """Broadcast check-out event to all subscribed clients."""
+    await cache_service.invalidate_person_status(person_id)
     await attendance_manager.broadcast_attendance_event(
         event_type="attendance_event",
         person_id=person_id,
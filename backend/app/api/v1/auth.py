@@ -4,19 +4,32 @@ Authentication endpoints.
 
 from __future__ import annotations
 
-import json
+import asyncio
 from datetime import datetime, timedelta
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import bindparam, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
 
 from app.core.config import settings
-from app.core.deps import CurrentUser, get_current_user
+from app.core.deps import CurrentUser, get_current_user, invalidate_token
 from app.core.errors import AuthenticationError
-from app.core.security import create_access_token, create_refresh_token, hash_password, verify_password, verify_token
-from app.db.session import get_db
-from app.models.user import User, UserSession, Role
+from app.core.logging import get_logger
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    hash_password_async,
+    new_token_id,
+    verify_and_update_password,
+    verify_token,
+)
+from app.db.session import AsyncSessionLocal, get_db
+from app.models.user import Role, User, UserSession
 from app.schemas.common import ErrorDetail, ErrorResponse, SuccessResponse
 from app.schemas.user import (
     ChangePasswordRequest,
@@ -30,8 +43,80 @@ from app.schemas.user import (
     RoleResponse,
 )
 
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Hot-path statements, built once at import and reused with bound parameters
+_USER_WITH_ROLE_BY_EMAIL = select(User).options(joinedload(User.role)).where(User.email == bindparam("email"))
+_USER_WITH_ROLE_BY_ID = select(User).options(joinedload(User.role)).where(User.id == bindparam("user_id"))
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_REVOKE_LIVE_SESSION = (
+    delete(UserSession)
+    .where((UserSession.jti == bindparam("jti")) & (UserSession.expires_at > bindparam("now")))
+    .returning(UserSession.user_id)
+)
+_REVOKE_SESSION = delete(UserSession).where(UserSession.jti == bindparam("jti"))
+_PURGE_EXPIRED_SESSIONS = delete(UserSession).where(UserSession.expires_at <= bindparam("now"))
+
+_purge_task: asyncio.Task | None = None
+
+
+def _token_claims(user: User, role: Role | None) -> dict[str, Any]:
+    """
+    Build the JWT claims shared by the access and refresh tokens.
+
+    Permissions are embedded as a list; the whole payload is serialized once
+    by jose, and get_current_user accepts both the list and the legacy
+    JSON-string form.
+    """
+    return {
+        "sub": user.id,
+        "email": user.email,
+        "role_id": user.role_id,
+        "permissions": role.permission_list if role else [],
+    }
+
+
+async def purge_expired_sessions() -> int:
+    """Delete every expired refresh-token session in one statement."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(_PURGE_EXPIRED_SESSIONS, {"now": datetime.utcnow()})
+        await db.commit()
+        return result.rowcount
+
+
+def start_session_purge_loop():
+    """Start the periodic expired-session cleanup (one task per process)."""
+    global _purge_task
+    if _purge_task is None or _purge_task.done():
+        _purge_task = asyncio.create_task(_session_purge_loop())
+
+
+async def stop_session_purge_loop():
+    """Stop the periodic expired-session cleanup."""
+    global _purge_task
+    if _purge_task is not None:
+        _purge_task.cancel()
+        try:
+            await _purge_task
+        except asyncio.CancelledError:
+            pass
+        _purge_task = None
+
+
+async def _session_purge_loop():
+    """Purge expired sessions every SESSION_CLEANUP_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(settings.SESSION_CLEANUP_INTERVAL)
+        try:
+            purged = await purge_expired_sessions()
+        except Exception as e:
+            logger.error(f"Expired session cleanup failed: {e}")
+            continue
+        if purged:
+            logger.debug(f"Purged {purged} expired sessions")
+
 
 @router.post("/login", response_model=SuccessResponse[LoginResponse], status_code=status.HTTP_200_OK)
 async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)) -> SuccessResponse[LoginResponse]:
@@ -40,69 +125,49 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)) -> Su
 
     Returns access token, refresh token, and user information.
     """
-    # Find user by email
-    result = await db.execute(select(User).where(User.email == request.username))
+    # Find user by email, with their role in the same round-trip
+    result = await db.execute(_USER_WITH_ROLE_BY_EMAIL, {"email": request.username})
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(request.password, user.hashed_password):
+    # End the read transaction so the pooled connection is not held while the
+    # password is verified (or while waiting for a hashing slot)
+    await db.commit()
+
+    verified, new_hash = (
+        await verify_and_update_password(request.password, user.hashed_password) if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    # Get user role and permissions
-    role_result = await db.execute(select(Role).where(Role.id == user.role_id))
-    role = role_result.scalar_one_or_none()
-
-    permissions = json.loads(role.permissions) if role else []
+    # Transparently upgrade bcrypt hashes to Argon2id
+    if new_hash:
+        user.hashed_password = new_hash
 
     # Create tokens
-    access_token = create_access_token(
-        data={
-            "sub": user.id,
-            "email": user.email,
-            "role_id": user.role_id,
-            "permissions": json.dumps(permissions),
-        }
-    )
-
-    refresh_token = create_refresh_token(
-        data={
-            "sub": user.id,
-            "email": user.email,
-            "role_id": user.role_id,
-            "permissions": json.dumps(permissions),
-        }
-    )
+    claims = _token_claims(user, user.role)
+    access_token = create_access_token(data=claims)
+    jti = new_token_id()
+    refresh_token = create_refresh_token(data={**claims, "jti": jti})
 
-    # Store refresh token in database
+    # Store refresh token and last_active in a single transaction
+    user.last_active = datetime.utcnow()
     token_expiry = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     session = UserSession(
         user_id=user.id,
-        refresh_token=refresh_token,
+        jti=jti,
         expires_at=token_expiry,
     )
     db.add(session)
     await db.commit()
 
-    # Update last_active
-    user.last_active = datetime.utcnow()
-    await db.commit()
-
     return SuccessResponse(
         data=LoginResponse(
             accessToken=access_token,
             refreshToken=refresh_token,
-            user=UserResponse(
-                id=user.id,
-                name=user.name,
-                email=user.email,
-                roleId=user.role_id,
-                status=user.status,
-                lastActive=user.last_active,
-                createdAt=user.created_at,
-                updatedAt=user.updated_at,
-            ),
+            user=UserResponse.model_validate(user),
         )
     )
 
@@ -119,57 +184,33 @@ async def refresh(request: RefreshTokenRequest, db: AsyncSession = Depends(get_d
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
-    # Verify refresh token exists in database and hasn't expired
-    result = await db.execute(
-        select(UserSession).where(
-            (UserSession.refresh_token == request.refreshToken)
-            & (UserSession.expires_at > datetime.utcnow())
-        )
-    )
-    session = result.scalar_one_or_none()
+    # Revoke the refresh token; the row must exist and not have expired
+    result = await db.execute(_REVOKE_LIVE_SESSION, {"jti": payload.get("jti"), "now": datetime.utcnow()})
+    user_id = result.scalar_one_or_none()
 
-    if not session:
+    if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
 
     # Get user and role
-    user_result = await db.execute(select(User).where(User.id == session.user_id))
+    user_result = await db.execute(_USER_WITH_ROLE_BY_ID, {"user_id": user_id})
     user = user_result.scalar_one_or_none()
 
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    role_result = await db.execute(select(Role).where(Role.id == user.role_id))
-    role = role_result.scalar_one_or_none()
-
-    permissions = json.loads(role.permissions) if role else []
-
     # Create new tokens
-    new_access_token = create_access_token(
-        data={
-            "sub": user.id,
-            "email": user.email,
-            "role_id": user.role_id,
-            "permissions": json.dumps(permissions),
-        }
-    )
-
-    new_refresh_token = create_refresh_token(
-        data={
-            "sub": user.id,
-            "email": user.email,
-            "role_id": user.role_id,
-            "permissions": json.dumps(permissions),
-        }
-    )
+    claims = _token_claims(user, user.role)
+    new_access_token = create_access_token(data=claims)
+    new_jti = new_token_id()
+    new_refresh_token = create_refresh_token(data={**claims, "jti": new_jti})
 
-    # Update refresh token in database (revoke old, create new)
-    db.delete(session)
+    # Store the new refresh token in the same transaction as the revocation
     new_session = UserSession(
         user_id=user.id,
-        refresh_token=new_refresh_token,
+        jti=new_jti,
         expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
     )
     db.add(new_session)
@@ -185,22 +226,37 @@ async def refresh(request: RefreshTokenRequest, db: AsyncSession = Depends(get_d
     )
 
 
-@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout(request: LogoutRequest, db: AsyncSession = Depends(get_db)):
+# Logout works without an access token; when one is sent its cached user is dropped
+_optional_bearer = HTTPBearer(auto_error=False)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
+async def logout(
+    request: LogoutRequest,
+    db: AsyncSession = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials | None = Depends(_optional_bearer),
+) -> Response:
     """
     User logout endpoint.
 
     Revokes the refresh token.
     """
-    # Delete refresh token from database
-    result = await db.execute(select(UserSession).where(UserSession.refresh_token == request.refreshToken))
-    session = result.scalar_one_or_none()
+    if credentials:
+        invalidate_token(credentials.credentials)
 
-    if session:
-        db.delete(session)
-        await db.commit()
+    # Delete the refresh token's session; unreadable tokens have nothing to revoke
+    try:
+        jti = decode_token(request.refreshToken).get("jti")
+    except ValueError:
+        jti = None
 
-    return None
+    if jti:
+        result = await db.execute(_REVOKE_SESSION, {"jti": jti})
+        # Nothing deleted means nothing to commit; the session rolls back on close
+        if result.rowcount:
+            await db.commit()
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/me", response_model=SuccessResponse[CurrentUserResponse], status_code=status.HTTP_200_OK)
@@ -213,7 +269,7 @@ async def get_me(
     Returns user details and permissions.
     """
     # Get user from database
-    result = await db.execute(select(User).where(User.id == current_user.user_id))
+    result = await db.execute(_USER_BY_ID, {"user_id": current_user.user_id})
     user = result.scalar_one_or_none()
 
     if not user:
@@ -221,16 +277,7 @@ async def get_me(
 
     return SuccessResponse(
         data=CurrentUserResponse(
-            user=UserResponse(
-                id=user.id,
-                name=user.name,
-                email=user.email,
-                roleId=user.role_id,
-                status=user.status,
-                lastActive=user.last_active,
-                createdAt=user.created_at,
-                updatedAt=user.updated_at,
-            ),
+            user=UserResponse.model_validate(user),
             permissions=current_user.permissions,
         )
     )
@@ -250,17 +297,20 @@ async def change_password(
         )
 
     # Get user
-    result = await db.execute(select(User).where(User.id == current_user.user_id))
+    result = await db.execute(_USER_BY_ID, {"user_id": current_user.user_id})
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(request.currentPassword, user.hashed_password):
+    verified, _ = (
+        await verify_and_update_password(request.currentPassword, user.hashed_password) if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid current password",
         )
 
     # Update password
-    user.hashed_password = hash_password(request.newPassword)
+    user.hashed_password = await hash_password_async(request.newPassword)
     await db.commit()
 
     return SuccessResponse(data={"message": "Password changed successfully"})
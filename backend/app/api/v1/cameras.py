@@ -1,26 +1,30 @@
 """Camera management endpoints."""
 
-import base64
-import json
+import asyncio
+import codecs
+import csv
+import io
+import itertools
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import AsyncIterator, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, File, Form, Query, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import CurrentUser, get_current_user
-from app.db.session import get_db
+from app.core.config import settings
+from app.core.deps import require_permission
+from app.db.session import AsyncSessionLocal, get_db
 from app.schemas.camera import (
     CameraConnectionTestRequest,
     CameraConnectionTestResponse,
     CameraCreate,
-    CameraExportRequest,
-    CameraExportResponse,
     CameraGroupCreate,
     CameraGroupResponse,
     CameraGroupUpdate,
-    CameraImportRequest,
     CameraImportResponse,
     CameraResponse,
     CameraSnapshotRequest,
@@ -37,96 +41,80 @@ from app.services.storage_service import StorageService
 router = APIRouter(tags=["Cameras"])
 logger = logging.getLogger(__name__)
 
-# Helper functions
-async def get_camera_service(db: AsyncSession = Depends(get_db)) -> CameraService:
-    """Get camera service."""
-    return CameraService(db)
-
-async def get_camera_group_service(db: AsyncSession = Depends(get_db)) -> CameraGroupService:
-    """Get camera group service."""
-    return CameraGroupService(db)
+# Route-level permission checks; they run before the endpoint's own dependencies
+_can_view = Depends(require_permission("cameras:read", "You don't have permission to view cameras"))
+_can_access = Depends(require_permission("cameras:read", "You don't have permission to access cameras"))
+_can_export = Depends(require_permission("cameras:read", "You don't have permission to export cameras"))
+_can_manage = Depends(require_permission("cameras:write", "You don't have permission to manage cameras"))
+
+_SNAPSHOT_URL_PREFIX = settings.SNAPSHOT_URL_PREFIX
+
+
+def _camera_page(cameras: list, meta: PaginationMeta) -> ORJSONResponse:
+    """
+    Serialize a page of cameras straight to JSON.
+
+    Each row is dumped once by Pydantic's JSON-mode serializer and the page
+    is encoded by orjson; returning a Response directly skips response_model
+    re-validation and jsonable_encoder. The response_model is kept for the
+    OpenAPI schema.
+    """
+    return ORJSONResponse(
+        {
+            "success": True,
+            "data": [CameraResponse.model_validate(c).model_dump(mode="json", by_alias=True) for c in cameras],
+            "meta": meta.model_dump(),
+        }
+    )
 
 
 # ============================================================================
 # Camera Group Endpoints
 # ============================================================================
 
-@router.get("/groups", response_model=SuccessResponse[list[CameraGroupResponse]])
+@router.get("/groups", response_model=SuccessResponse[list[CameraGroupResponse]], dependencies=[_can_view])
 async def list_camera_groups(
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraGroupService = Depends(get_camera_group_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[list[CameraGroupResponse]]:
     """List all camera groups."""
-    if not current_user.has_permission("cameras:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view cameras",
-        )
+    service = CameraGroupService(db)
 
     groups = await service.list_groups()
-    return SuccessResponse(
-        data=[
-            CameraGroupResponse(
-                id=g.id,
-                name=g.name,
-                description=g.description,
-                location=g.location,
-                order=g.order,
-                createdAt=g.created_at,
-                updatedAt=g.updated_at,
-            )
-            for g in groups
-        ]
-    )
+    return SuccessResponse(data=[CameraGroupResponse.model_validate(g) for g in groups])
 
 
-@router.post("/groups", response_model=SuccessResponse[CameraGroupResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/groups",
+    response_model=SuccessResponse[CameraGroupResponse],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[_can_manage],
+)
 async def create_camera_group(
     request: CameraGroupCreate,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraGroupService = Depends(get_camera_group_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CameraGroupResponse]:
     """Create a new camera group."""
-    if not current_user.has_permission("cameras:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage cameras",
-        )
+    service = CameraGroupService(db)
 
     group = await service.create_group(request)
-    return SuccessResponse(
-        data=CameraGroupResponse(
-            id=group.id,
-            name=group.name,
-            description=group.description,
-            location=group.location,
-            order=group.order,
-            createdAt=group.created_at,
-            updatedAt=group.updated_at,
-        )
-    )
+    return SuccessResponse(data=CameraGroupResponse.model_validate(group))
 
 
 # ============================================================================
 # Camera CRUD Endpoints
 # ============================================================================
 
-@router.get("", response_model=PaginatedResponse[CameraResponse])
+@router.get("", response_model=PaginatedResponse[CameraResponse], dependencies=[_can_view])
 async def list_cameras(
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     group_id: Optional[str] = Query(None),
-    status: Optional[str] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
     active_only: bool = Query(False),
-) -> PaginatedResponse[CameraResponse]:
+) -> ORJSONResponse:
     """List all cameras with pagination and filtering."""
-    if not current_user.has_permission("cameras:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view cameras",
-        )
+    service = CameraService(db)
 
     skip = (page - 1) * page_size
 
@@ -134,252 +122,78 @@ async def list_cameras(
         cameras = await service.list_active_cameras(skip=skip, limit=page_size)
         total = await service.repo.count_active()
     elif group_id:
-        cameras = await service.get_cameras_by_group(group_id)
-        cameras = cameras[skip : skip + page_size]
-        total = len(await service.get_cameras_by_group(group_id))
-    elif status:
-        cameras = await service.repo.get_by_status(status)
-        cameras = cameras[skip : skip + page_size]
-        total = await service.repo.count_by_status(status)
+        cameras = await service.list_cameras_by_group(group_id, skip=skip, limit=page_size)
+        total = await service.repo.count_by_group(group_id)
+    elif status_filter:
+        cameras = await service.repo.get_by_status(status_filter, skip=skip, limit=page_size)
+        total = await service.repo.count_by_status(status_filter)
     else:
         cameras = await service.list_cameras(skip=skip, limit=page_size)
         total = await service.repo.count_all()
 
     total_pages = (total + page_size - 1) // page_size
 
-    return PaginatedResponse(
-        data=[
-            CameraResponse(
-                id=c.id,
-                name=c.name,
-                description=c.description,
-                rtsp_url=c.rtsp_url,
-                username=c.username,
-                password=c.password,
-                resolution=c.resolution,
-                fps=c.fps,
-                codec=c.codec,
-                location=c.location,
-                latitude=c.latitude,
-                longitude=c.longitude,
-                group_id=c.group_id,
-                is_active=c.is_active,
-                is_primary=c.is_primary,
-                enable_recording=c.enable_recording,
-                enable_snapshots=c.enable_snapshots,
-                enable_detection=c.enable_detection,
-                detection_sensitivity=c.detection_sensitivity,
-                status=c.status,
-                last_connected=c.last_connected,
-                last_error=c.last_error,
-                connection_retries=c.connection_retries,
-                createdAt=c.created_at,
-                updatedAt=c.updated_at,
-            )
-            for c in cameras
-        ],
-        meta=PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=total_pages),
+    return _camera_page(
+        cameras, PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=total_pages)
     )
 
 
-@router.post("", response_model=SuccessResponse[CameraResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=SuccessResponse[CameraResponse],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[_can_manage],
+)
 async def create_camera(
     request: CameraCreate,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CameraResponse]:
     """Create a new camera."""
-    if not current_user.has_permission("cameras:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage cameras",
-        )
+    service = CameraService(db)
 
     camera = await service.create_camera(request)
     return SuccessResponse(
-        data=CameraResponse(
-            id=camera.id,
-            name=camera.name,
-            description=camera.description,
-            rtsp_url=camera.rtsp_url,
-            username=camera.username,
-            password=camera.password,
-            resolution=camera.resolution,
-            fps=camera.fps,
-            codec=camera.codec,
-            location=camera.location,
-            latitude=camera.latitude,
-            longitude=camera.longitude,
-            group_id=camera.group_id,
-            is_active=camera.is_active,
-            is_primary=camera.is_primary,
-            enable_recording=camera.enable_recording,
-            enable_snapshots=camera.enable_snapshots,
-            enable_detection=camera.enable_detection,
-            detection_sensitivity=camera.detection_sensitivity,
-            status=camera.status,
-            last_connected=camera.last_connected,
-            last_error=camera.last_error,
-            connection_retries=camera.connection_retries,
-            createdAt=camera.created_at,
-            updatedAt=camera.updated_at,
-        ),
+        data=CameraResponse.model_validate(camera),
         meta={"created": True},
     )
 
 
-@router.get("/{camera_id}", response_model=SuccessResponse[CameraResponse])
-async def get_camera(
-    camera_id: str,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
-) -> SuccessResponse[CameraResponse]:
-    """Get a specific camera."""
-    if not current_user.has_permission("cameras:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view cameras",
-        )
-
-    camera = await service.get_camera(camera_id)
-    return SuccessResponse(
-        data=CameraResponse(
-            id=camera.id,
-            name=camera.name,
-            description=camera.description,
-            rtsp_url=camera.rtsp_url,
-            username=camera.username,
-            password=camera.password,
-            resolution=camera.resolution,
-            fps=camera.fps,
-            codec=camera.codec,
-            location=camera.location,
-            latitude=camera.latitude,
-            longitude=camera.longitude,
-            group_id=camera.group_id,
-            is_active=camera.is_active,
-            is_primary=camera.is_primary,
-            enable_recording=camera.enable_recording,
-            enable_snapshots=camera.enable_snapshots,
-            enable_detection=camera.enable_detection,
-            detection_sensitivity=camera.detection_sensitivity,
-            status=camera.status,
-            last_connected=camera.last_connected,
-            last_error=camera.last_error,
-            connection_retries=camera.connection_retries,
-            createdAt=camera.created_at,
-            updatedAt=camera.updated_at,
-        )
-    )
-
-
-@router.put("/{camera_id}", response_model=SuccessResponse[CameraResponse])
+@router.put("/{camera_id}", response_model=SuccessResponse[CameraResponse], dependencies=[_can_manage])
 async def update_camera(
     camera_id: str,
     request: CameraUpdate,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CameraResponse]:
     """Update a camera."""
-    if not current_user.has_permission("cameras:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage cameras",
-        )
+    service = CameraService(db)
 
     camera = await service.update_camera(camera_id, request)
-    return SuccessResponse(
-        data=CameraResponse(
-            id=camera.id,
-            name=camera.name,
-            description=camera.description,
-            rtsp_url=camera.rtsp_url,
-            username=camera.username,
-            password=camera.password,
-            resolution=camera.resolution,
-            fps=camera.fps,
-            codec=camera.codec,
-            location=camera.location,
-            latitude=camera.latitude,
-            longitude=camera.longitude,
-            group_id=camera.group_id,
-            is_active=camera.is_active,
-            is_primary=camera.is_primary,
-            enable_recording=camera.enable_recording,
-            enable_snapshots=camera.enable_snapshots,
-            enable_detection=camera.enable_detection,
-            detection_sensitivity=camera.detection_sensitivity,
-            status=camera.status,
-            last_connected=camera.last_connected,
-            last_error=camera.last_error,
-            connection_retries=camera.connection_retries,
-            createdAt=camera.created_at,
-            updatedAt=camera.updated_at,
-        )
-    )
+    return SuccessResponse(data=CameraResponse.model_validate(camera))
 
 
-@router.patch("/{camera_id}/state", response_model=SuccessResponse[CameraResponse])
+@router.patch("/{camera_id}/state", response_model=SuccessResponse[CameraResponse], dependencies=[_can_manage])
 async def update_camera_state(
     camera_id: str,
     request: CameraStateUpdate,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CameraResponse]:
     """Update camera state (status, active status)."""
-    if not current_user.has_permission("cameras:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage cameras",
-        )
+    service = CameraService(db)
 
     # Use the update endpoint for partial updates
     update_data = request.dict(exclude_unset=True)
     camera = await service.update_camera(camera_id, CameraUpdate(**update_data))
 
-    return SuccessResponse(
-        data=CameraResponse(
-            id=camera.id,
-            name=camera.name,
-            description=camera.description,
-            rtsp_url=camera.rtsp_url,
-            username=camera.username,
-            password=camera.password,
-            resolution=camera.resolution,
-            fps=camera.fps,
-            codec=camera.codec,
-            location=camera.location,
-            latitude=camera.latitude,
-            longitude=camera.longitude,
-            group_id=camera.group_id,
-            is_active=camera.is_active,
-            is_primary=camera.is_primary,
-            enable_recording=camera.enable_recording,
-            enable_snapshots=camera.enable_snapshots,
-            enable_detection=camera.enable_detection,
-            detection_sensitivity=camera.detection_sensitivity,
-            status=camera.status,
-            last_connected=camera.last_connected,
-            last_error=camera.last_error,
-            connection_retries=camera.connection_retries,
-            createdAt=camera.created_at,
-            updatedAt=camera.updated_at,
-        )
-    )
+    return SuccessResponse(data=CameraResponse.model_validate(camera))
 
 
-@router.delete("/{camera_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{camera_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[_can_manage])
 async def delete_camera(
     camera_id: str,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
 ) -> None:
     """Delete a camera."""
-    if not current_user.has_permission("cameras:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage cameras",
-        )
+    service = CameraService(db)
 
     await service.delete_camera(camera_id)
 
@@ -388,37 +202,35 @@ async def delete_camera(
 # Camera Operation Endpoints
 # ============================================================================
 
-@router.post("/{camera_id}/test-connection", response_model=SuccessResponse[CameraConnectionTestResponse])
+@router.post(
+    "/{camera_id}/test-connection",
+    response_model=SuccessResponse[CameraConnectionTestResponse],
+    dependencies=[_can_access],
+)
 async def test_camera_connection(
     camera_id: str,
     request: CameraConnectionTestRequest,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CameraConnectionTestResponse]:
     """Test camera connection."""
-    if not current_user.has_permission("cameras:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to access cameras",
-        )
+    service = CameraService(db)
 
     result = await service.test_connection(camera_id, request.timeout_seconds)
     return SuccessResponse(data=result)
 
 
-@router.post("/{camera_id}/snapshot", response_model=SuccessResponse[CameraSnapshotResponse])
+@router.post(
+    "/{camera_id}/snapshot",
+    response_model=SuccessResponse[CameraSnapshotResponse],
+    dependencies=[_can_access],
+)
 async def capture_camera_snapshot(
     camera_id: str,
     request: CameraSnapshotRequest,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CameraSnapshotResponse]:
     """Capture snapshot from camera."""
-    if not current_user.has_permission("cameras:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to access cameras",
-        )
+    service = CameraService(db)
 
     result = await service.capture_snapshot(camera_id, request.timeout_seconds)
 
@@ -429,7 +241,7 @@ async def capture_camera_snapshot(
                 camera_id=camera_id,
                 snapshot_id=result.get("snapshot_id"),
                 storage_path=result.get("storage_path"),
-                url=f"http://localhost:8000/snapshots/{result.get('snapshot_id')}",
+                url=_SNAPSHOT_URL_PREFIX + result["snapshot_id"],
             )
         )
     else:
@@ -442,20 +254,14 @@ async def capture_camera_snapshot(
         )
 
 
-@router.get("/summary", response_model=SuccessResponse[CameraSummaryResponse])
+@router.get("/summary", response_model=SuccessResponse[CameraSummaryResponse], dependencies=[_can_view])
 async def get_camera_summary(
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+    db: AsyncSession = Depends(get_db),
 ) -> SuccessResponse[CameraSummaryResponse]:
     """Get camera system summary."""
-    if not current_user.has_permission("cameras:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view cameras",
-        )
+    service = CameraService(db)
 
     summary = await service.get_summary()
-    from datetime import datetime
 
     return SuccessResponse(
         data=CameraSummaryResponse(
@@ -464,118 +270,140 @@ async def get_camera_summary(
             offline_cameras=summary.get("offline_cameras", 0),
             recording_cameras=summary.get("recording_cameras", 0),
             detection_enabled=summary.get("detection_enabled", 0),
-            total_groups=0,  # TODO: Implement group counting
+            total_groups=summary.get("total_groups", 0),
             last_update=datetime.utcnow(),
             health_check_status=summary.get("health_check_status", "healthy"),
         )
     )
 
 
-@router.post("/import", response_model=SuccessResponse[CameraImportResponse])
-async def import_cameras(
-    request: CameraImportRequest,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
-) -> SuccessResponse[CameraImportResponse]:
-    """Import cameras from CSV or JSON."""
-    if not current_user.has_permission("cameras:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage cameras",
-        )
+# Rows parsed and imported per batch from an uploaded file
+IMPORT_CHUNK_ROWS = 1000
 
-    try:
-        # Decode base64 data
-        file_data = base64.b64decode(request.data)
 
-        # Parse based on format
-        if request.format == "json":
-            cameras_data = json.loads(file_data.decode())
-            if isinstance(cameras_data, dict):
-                cameras_data = cameras_data.get("cameras", [])
-        else:  # CSV
-            import csv
-            import io
+async def _import_batches(file: UploadFile, format: str) -> AsyncIterator[tuple[int, list[dict]]]:
+    """Yield (first row number, rows) batches parsed from an uploaded import file."""
+    if format == "json":
+        data = orjson.loads(await file.read())
+        rows = data.get("cameras", []) if isinstance(data, dict) else data
+        for start in range(0, len(rows), IMPORT_CHUNK_ROWS):
+            yield start + 1, rows[start : start + IMPORT_CHUNK_ROWS]
+        return
 
-            file_content = file_data.decode()
-            reader = csv.DictReader(io.StringIO(file_content))
-            cameras_data = list(reader)
+    # CSV is decoded and parsed straight from the spooled upload, a batch at a time
+    reader = csv.DictReader(codecs.iterdecode(file.file, "utf-8-sig"))
+    first_row = 1
+    while batch := await asyncio.to_thread(list, itertools.islice(reader, IMPORT_CHUNK_ROWS)):
+        yield first_row, batch
+        first_row += len(batch)
 
-        # Import cameras
-        result = await service.import_cameras(cameras_data, request.group_id)
+
+@router.post("/import", response_model=SuccessResponse[CameraImportResponse], dependencies=[_can_manage])
+async def import_cameras(
+    file: UploadFile = File(..., description="CSV or JSON file"),
+    format: str = Form("csv", description="Import format: csv or json"),
+    group_id: Optional[str] = Form(None, description="Group to assign cameras to"),
+    db: AsyncSession = Depends(get_db),
+) -> SuccessResponse[CameraImportResponse]:
+    """Import cameras from an uploaded CSV or JSON file."""
+    service = CameraService(db)
+    imported, skipped, errors = 0, 0, []
+
+    try:
+        async for first_row, batch in _import_batches(file, format):
+            result = await service.import_cameras(batch, group_id, first_row=first_row)
+            imported += result["imported_count"]
+            skipped += result["skipped_count"]
+            errors.extend(result["errors"])
 
         return SuccessResponse(
             data=CameraImportResponse(
                 success=True,
-                imported_count=result.get("imported_count", 0),
-                skipped_count=result.get("skipped_count", 0),
-                errors=result.get("errors", []),
+                imported_count=imported,
+                skipped_count=skipped,
+                errors=errors,
             )
         )
     except Exception as e:
+        # Batches before the failure are already committed
         return SuccessResponse(
             data=CameraImportResponse(
                 success=False,
-                imported_count=0,
-                skipped_count=0,
-                errors=[{"error": str(e)}],
+                imported_count=imported,
+                skipped_count=skipped,
+                errors=errors + [{"error": str(e)}],
             )
         )
 
 
-@router.get("/export", response_model=SuccessResponse[CameraExportResponse])
-async def export_cameras(
-    current_user: CurrentUser = Depends(get_current_user),
-    service: CameraService = Depends(get_camera_service),
+# Rows buffered per chunk written to the download stream
+EXPORT_CHUNK_ROWS = 200
+
+
+async def _export_csv(group_id: Optional[str], include_credentials: bool) -> AsyncIterator[str]:
+    """Yield a CSV export in chunks of EXPORT_CHUNK_ROWS rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CameraService.export_fields(include_credentials))
+    writer.writeheader()
+    rows = 0
+
+    # Own session: the stream outlives the endpoint call
+    async with AsyncSessionLocal() as db:
+        async for row in CameraService(db).stream_export_rows(group_id, include_credentials):
+            writer.writerow(row)
+            rows += 1
+            if rows % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def _export_json(group_id: Optional[str], include_credentials: bool) -> AsyncIterator[bytes]:
+    """Yield a JSON export shaped like {"cameras": [...], "count": n}."""
+    yield b'{"cameras":['
+    count = 0
+
+    async with AsyncSessionLocal() as db:
+        async for row in CameraService(db).stream_export_rows(group_id, include_credentials):
+            yield (b"," if count else b"") + orjson.dumps(row)
+            count += 1
+
+    yield b'],"count":%d}' % count
+
+
+@router.get("/export", dependencies=[_can_export])
+@router.get("/export/download", dependencies=[_can_export])
+async def download_camera_export(
     format: str = Query("csv", description="Export format: csv or json"),
     include_credentials: bool = Query(False),
     group_id: Optional[str] = Query(None),
-) -> SuccessResponse[CameraExportResponse]:
-    """Export cameras to CSV or JSON."""
-    if not current_user.has_permission("cameras:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to export cameras",
-        )
+) -> StreamingResponse:
+    """Download cameras as a streamed CSV or JSON attachment."""
+    if format == "json":
+        body, media_type = _export_json(group_id, include_credentials), "application/json"
+    else:
+        body, media_type = _export_csv(group_id, include_credentials), "text/csv"
+    filename = f"cameras_{group_id or 'all'}.{'json' if format == 'json' else 'csv'}"
 
-    try:
-        cameras_data = await service.export_cameras(group_id, include_credentials)
-
-        if format == "json":
-            import json
-            data_str = json.dumps({"cameras": cameras_data, "count": len(cameras_data)})
-            filename = f"cameras_{group_id or 'all'}.json" if group_id else "cameras_all.json"
-        else:  # CSV
-            import csv
-            import io
-
-            output = io.StringIO()
-            if cameras_data:
-                writer = csv.DictWriter(output, fieldnames=cameras_data[0].keys())
-                writer.writeheader()
-                writer.writerows(cameras_data)
-            data_str = output.getvalue()
-            filename = f"cameras_{group_id or 'all'}.csv" if group_id else "cameras_all.csv"
-
-        # Encode to base64
-        encoded_data = base64.b64encode(data_str.encode()).decode()
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-        return SuccessResponse(
-            data=CameraExportResponse(
-                success=True,
-                format=format,
-                data=encoded_data,
-                camera_count=len(cameras_data),
-                filename=filename,
-            )
-        )
-    except Exception as e:
-        return SuccessResponse(
-            data=CameraExportResponse(
-                success=False,
-                format=format,
-                data="",
-                camera_count=0,
-                filename="",
-            )
-        )
+
+# Registered after the static GET routes (/summary, /export) so their paths
+# are not captured as a camera_id
+@router.get("/{camera_id}", response_model=SuccessResponse[CameraResponse], dependencies=[_can_view])
+async def get_camera(
+    camera_id: str,
+    db: AsyncSession = Depends(get_db),
+) -> SuccessResponse[CameraResponse]:
+    """Get a specific camera."""
+    service = CameraService(db)
+
+    camera = await service.get_camera(camera_id)
+    return SuccessResponse(data=CameraResponse.model_validate(camera))
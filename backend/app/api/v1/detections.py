@@ -1,18 +1,39 @@
 """Detection endpoints."""
 
-import base64
-import json
+import asyncio
+import binascii
 import logging
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+import operator
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError as PydanticValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import CurrentUser, get_current_user
+from app.core.deps import require_permission
 from app.core.errors import NotFoundError, ValidationError
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
 from app.schemas.common import PaginatedResponse, PaginationMeta, SuccessResponse
 from app.schemas.detection import (
+    BoundingBox,
     DetectionEventLogResponse,
     DetectionEventsQuery,
     DetectionMetricsResponse,
@@ -33,9 +54,42 @@ from app.schemas.detection import (
 from app.services.detection_service import DetectionService
 from app.services.websocket_manager import ws_manager
 
+# SIMD base64 decoder for JSON frame uploads; same API and errors as the stdlib one
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
 router = APIRouter(tags=["Detections"])
 logger = logging.getLogger(__name__)
 
+_utcnow = datetime.utcnow
+
+# Route-level permission checks; they run before the endpoint's own dependencies
+_can_view_settings = Depends(
+    require_permission("detections:read", "You don't have permission to view detection settings")
+)
+_can_manage_settings = Depends(
+    require_permission("detections:write", "You don't have permission to manage detection settings")
+)
+_can_test_provider = Depends(
+    require_permission("detections:write", "You don't have permission to test detection provider")
+)
+_can_view_detections = Depends(require_permission("detections:read", "You don't have permission to view detections"))
+_can_send_frames = Depends(
+    require_permission("detections:write", "You don't have permission to send frames for detection")
+)
+_can_view_events = Depends(require_permission("detections:read", "You don't have permission to view detection events"))
+_can_view_statistics = Depends(
+    require_permission("detections:read", "You don't have permission to view detection statistics")
+)
+_can_view_queue_stats = Depends(
+    require_permission("detections:read", "You don't have permission to view queue statistics")
+)
+_can_view_summary = Depends(
+    require_permission("detections:read", "You don't have permission to view detection summary")
+)
+
 
 # Helper functions
 async def get_detection_service(db: AsyncSession = Depends(get_db)) -> DetectionService:
@@ -43,90 +97,176 @@ async def get_detection_service(db: AsyncSession = Depends(get_db)) -> Detection
     return DetectionService(db)
 
 
+# Responses are built from trusted ORM rows, so skip per-field validation
+_mk_bbox = BoundingBox.model_construct
+_mk_detection = DetectionResponse.model_construct
+_mk_provider_config = DetectionProviderConfigResponse.model_construct
+
+
+def _detection_response(d) -> DetectionResponse:
+    """Build a detection response from a stored detection without re-validating it."""
+    return _mk_detection(
+        id=d.id,
+        camera_id=d.camera_id,
+        detection_type=d.detection_type,
+        confidence=d.confidence,
+        bbox=_mk_bbox(x=d.bbox_x, y=d.bbox_y, width=d.bbox_width, height=d.bbox_height),
+        person_name=d.person_name,
+        person_id=d.person_id,
+        face_encoding=d.face_encoding,
+        is_processed=d.is_processed,
+        processing_status=d.processing_status,
+        frame_number=d.frame_number,
+        frame_timestamp=d.frame_timestamp,
+        createdAt=d.created_at,
+        updatedAt=d.updated_at,
+    )
+
+
+def _live_detections_body(camera_id: str, result: dict) -> bytes:
+    """Wrap the database-built detections array in the success envelope without re-parsing it."""
+    return b"".join(
+        (
+            b'{"success":true,"data":{"camera_id":',
+            orjson.dumps(camera_id),
+            b',"detections":',
+            result["detections_json"].encode(),
+            b',"total_detections":',
+            orjson.dumps(result["total_detections"]),
+            b',"last_updated":',
+            orjson.dumps(result["last_updated"]),
+            b',"cache_hit":',
+            orjson.dumps(result["cache_hit"]),
+            b'},"meta":null}',
+        )
+    )
+
+
+# Event log columns in DetectionEventLogResponse field order
+_EVENT_FIELDS = (
+    "id",
+    "detection_id",
+    "camera_id",
+    "event_type",
+    "severity",
+    "message",
+    "person_id",
+    "person_name",
+    "confidence_score",
+    "action_taken",
+    "action_timestamp",
+    "source_system",
+    "created_at",
+    "updated_at",
+)
+_EVENT_KEYS = tuple(DetectionEventLogResponse.model_fields)
+_event_row = operator.attrgetter(*_EVENT_FIELDS)
+
+
+def _provider_config_response(config) -> DetectionProviderConfigResponse:
+    """Build a provider config response from the stored config without re-validating it."""
+    return _mk_provider_config(
+        id=config.id,
+        provider_name=config.provider_name,
+        provider_type=config.provider_type,
+        endpoint_url=config.endpoint_url,
+        api_key=config.api_key,
+        api_secret=config.api_secret,
+        timeout_seconds=config.timeout_seconds,
+        max_faces_per_frame=config.max_faces_per_frame,
+        confidence_threshold=config.confidence_threshold,
+        enable_person_detection=config.enable_person_detection,
+        enable_face_detection=config.enable_face_detection,
+        enable_face_encoding=config.enable_face_encoding,
+        is_active=config.is_active,
+        last_tested=config.last_tested,
+        test_status=config.test_status,
+        last_error=config.last_error,
+        createdAt=config.created_at,
+        updatedAt=config.updated_at,
+    )
+
+
+async def _read_frame(
+    request: Request,
+    camera_id: Optional[str],
+    frame_number: Optional[int],
+    timestamp: Optional[datetime],
+) -> tuple[str, bytes, Optional[int], Optional[datetime]]:
+    """
+    Read a frame and its metadata from a send-frame request.
+
+    Raw ``application/octet-stream`` bodies are used as-is with the metadata
+    taken from the X-Camera-Id / X-Frame-Number / X-Frame-Timestamp headers.
+    Any other body is the legacy JSON form, parsed in one pass and with the
+    frame base64-decoded.
+    """
+    body = await request.body()
+
+    if request.headers.get("content-type", "").startswith("application/octet-stream"):
+        if not camera_id:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="X-Camera-Id header is required"
+            )
+        if not body:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Frame body is empty")
+        return camera_id, body, frame_number, timestamp
+
+    try:
+        frame = SendFrameRequest.model_validate_json(body)
+    except PydanticValidationError as e:
+        raise RequestValidationError(e.errors())
+
+    try:
+        frame_data = b64decode(frame.frame_data)
+    except binascii.Error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="frame_data is not valid base64")
+
+    return frame.camera_id, frame_data, frame.frame_number, frame.timestamp
+
+
 # ============================================================================
 # Provider Configuration Endpoints
 # ============================================================================
 
 
-@router.get("/provider/config", response_model=SuccessResponse[DetectionProviderConfigResponse])
+@router.get(
+    "/provider/config",
+    response_model=SuccessResponse[DetectionProviderConfigResponse],
+    dependencies=[_can_view_settings],
+)
 async def get_provider_config(
-    current_user: CurrentUser = Depends(get_current_user),
     service: DetectionService = Depends(get_detection_service),
-) -> SuccessResponse[DetectionProviderConfigResponse]:
-    """Get active detection provider configuration."""
-    if not current_user.has_permission("detections:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view detection settings",
-        )
+) -> ORJSONResponse:
+    """Get active detection provider configuration, cached until it changes."""
+    cached = await service.cache.get_cached_provider_config()
+    if cached:
+        return ORJSONResponse({"success": True, "data": cached, "meta": None})
 
     try:
         config = await service.get_provider_config()
-        return SuccessResponse(
-            data=DetectionProviderConfigResponse(
-                id=config.id,
-                provider_name=config.provider_name,
-                provider_type=config.provider_type,
-                endpoint_url=config.endpoint_url,
-                api_key=config.api_key,
-                api_secret=config.api_secret,
-                timeout_seconds=config.timeout_seconds,
-                max_faces_per_frame=config.max_faces_per_frame,
-                confidence_threshold=config.confidence_threshold,
-                enable_person_detection=config.enable_person_detection,
-                enable_face_detection=config.enable_face_detection,
-                enable_face_encoding=config.enable_face_encoding,
-                is_active=config.is_active,
-                last_tested=config.last_tested,
-                test_status=config.test_status,
-                last_error=config.last_error,
-                createdAt=config.created_at,
-                updatedAt=config.updated_at,
-            )
-        )
+        data = _provider_config_response(config).model_dump(mode="json")
+        await service.cache.cache_provider_config(data)
+        return ORJSONResponse({"success": True, "data": data, "meta": None})
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
-@router.put("/provider/config", response_model=SuccessResponse[DetectionProviderConfigResponse])
+@router.put(
+    "/provider/config",
+    response_model=SuccessResponse[DetectionProviderConfigResponse],
+    dependencies=[_can_manage_settings],
+)
 async def update_provider_config(
     request: DetectionProviderConfigUpdate,
-    current_user: CurrentUser = Depends(get_current_user),
     service: DetectionService = Depends(get_detection_service),
 ) -> SuccessResponse[DetectionProviderConfigResponse]:
     """Update detection provider configuration."""
-    if not current_user.has_permission("detections:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage detection settings",
-        )
-
     try:
         config = await service.get_provider_config()
         updated_config = await service.update_provider_config(config.id, request)
 
-        return SuccessResponse(
-            data=DetectionProviderConfigResponse(
-                id=updated_config.id,
-                provider_name=updated_config.provider_name,
-                provider_type=updated_config.provider_type,
-                endpoint_url=updated_config.endpoint_url,
-                api_key=updated_config.api_key,
-                api_secret=updated_config.api_secret,
-                timeout_seconds=updated_config.timeout_seconds,
-                max_faces_per_frame=updated_config.max_faces_per_frame,
-                confidence_threshold=updated_config.confidence_threshold,
-                enable_person_detection=updated_config.enable_person_detection,
-                enable_face_detection=updated_config.enable_face_detection,
-                enable_face_encoding=updated_config.enable_face_encoding,
-                is_active=updated_config.is_active,
-                last_tested=updated_config.last_tested,
-                test_status=updated_config.test_status,
-                last_error=updated_config.last_error,
-                createdAt=updated_config.created_at,
-                updatedAt=updated_config.updated_at,
-            )
-        )
+        return SuccessResponse(data=_provider_config_response(updated_config))
     except (NotFoundError, ValidationError) as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND if isinstance(e, NotFoundError) else status.HTTP_400_BAD_REQUEST,
@@ -139,19 +279,16 @@ async def update_provider_config(
 # ============================================================================
 
 
-@router.post("/test-provider", response_model=SuccessResponse[TestDetectionProviderResponse])
+@router.post(
+    "/test-provider",
+    response_model=SuccessResponse[TestDetectionProviderResponse],
+    dependencies=[_can_test_provider],
+)
 async def test_provider(
     request: TestDetectionProviderRequest,
-    current_user: CurrentUser = Depends(get_current_user),
     service: DetectionService = Depends(get_detection_service),
 ) -> SuccessResponse[TestDetectionProviderResponse]:
     """Test detection provider connection."""
-    if not current_user.has_permission("detections:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to test detection provider",
-        )
-
     try:
         result = await service.test_provider_connection(
             config_id=request.provider_config_id,
@@ -170,7 +307,7 @@ async def test_provider(
 # ============================================================================
 
 
-@router.get("/live", response_model=SuccessResponse[LiveDetectionsResponse])
+@router.get("/live", response_model=SuccessResponse[LiveDetectionsResponse], dependencies=[_can_view_detections])
 async def get_live_detections(
     camera_id: Optional[str] = Query(None, description="Filter by camera ID"),
     detection_type: Optional[str] = Query(None, description="Filter by detection type (person, face, vehicle)"),
@@ -178,18 +315,11 @@ async def get_live_detections(
     limit: int = Query(100, ge=1, le=1000, description="Result limit"),
     offset: int = Query(0, ge=0, description="Result offset"),
     use_cache: bool = Query(True, description="Use Redis cache if available"),
-    current_user: CurrentUser = Depends(get_current_user),
     service: DetectionService = Depends(get_detection_service),
-) -> SuccessResponse[LiveDetectionsResponse]:
+) -> Response:
     """Get live detections with optional caching."""
-    if not current_user.has_permission("detections:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view detections",
-        )
-
     try:
-        result = await service.get_live_detections(
+        result = await service.get_live_detections_json(
             camera_id=camera_id,
             detection_type=detection_type,
             min_confidence=min_confidence,
@@ -198,65 +328,53 @@ async def get_live_detections(
             use_cache=use_cache,
         )
 
-        return SuccessResponse(
-            data=LiveDetectionsResponse(
-                camera_id=camera_id or "all",
-                detections=[
-                    DetectionResponse(
-                        id=d.id,
-                        camera_id=d.camera_id,
-                        detection_type=d.detection_type,
-                        confidence=d.confidence,
-                        bbox={
-                            "x": d.bbox_x,
-                            "y": d.bbox_y,
-                            "width": d.bbox_width,
-                            "height": d.bbox_height,
-                        },
-                        person_name=d.person_name,
-                        person_id=d.person_id,
-                        face_encoding=d.face_encoding,
-                        is_processed=d.is_processed,
-                        processing_status=d.processing_status,
-                        frame_number=d.frame_number,
-                        frame_timestamp=d.frame_timestamp,
-                        createdAt=d.created_at,
-                        updatedAt=d.updated_at,
-                    )
-                    for d in result["detections"]
-                ],
-                total_detections=result["total_detections"],
-                last_updated=result["last_updated"],
-                cache_hit=result["cache_hit"],
-            )
-        )
+        # The database returns the detections array as JSON text; splice it into
+        # the envelope as-is. The response_model is kept for the OpenAPI schema
+        return Response(content=_live_detections_body(camera_id or "all", result), media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting live detections: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get detections")
 
 
-@router.post("/send-frame", response_model=SuccessResponse[SendFrameResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/send-frame",
+    response_model=SuccessResponse[SendFrameResponse],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[_can_send_frames],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+                "application/json": {"schema": SendFrameRequest.model_json_schema()},
+            },
+        },
+    },
+)
 async def send_frame_for_detection(
-    request: SendFrameRequest,
-    current_user: CurrentUser = Depends(get_current_user),
+    request: Request,
+    x_camera_id: Optional[str] = Header(None),
+    x_frame_number: Optional[int] = Header(None),
+    x_frame_timestamp: Optional[datetime] = Header(None),
     service: DetectionService = Depends(get_detection_service),
 ) -> SuccessResponse[SendFrameResponse]:
-    """Send frame for detection processing."""
-    if not current_user.has_permission("detections:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to send frames for detection",
-        )
+    """
+    Send frame for detection processing.
+
+    Send the encoded frame as a raw ``application/octet-stream`` body with
+    its metadata in X-Camera-Id, X-Frame-Number and X-Frame-Timestamp
+    headers. The JSON body with a base64 ``frame_data`` field is still
+    accepted.
+    """
+    camera_id, frame_data, frame_number, frame_timestamp = await _read_frame(
+        request, x_camera_id, x_frame_number, x_frame_timestamp
+    )
 
     try:
-        # Decode base64 frame
-        frame_data = base64.b64decode(request.frame_data)
-
         result = await service.send_frame_for_detection(
-            camera_id=request.camera_id,
+            camera_id=camera_id,
             frame_data=frame_data,
-            frame_number=request.frame_number,
-            frame_timestamp=request.timestamp,
+            frame_number=frame_number,
+            frame_timestamp=frame_timestamp,
         )
 
         return SuccessResponse(
@@ -265,27 +383,7 @@ async def send_frame_for_detection(
                 camera_id=result["camera_id"],
                 detection_count=result["detection_count"],
                 detections=[
-                    DetectionResponse(
-                        id=d.id,
-                        camera_id=d.camera_id,
-                        detection_type=d.detection_type,
-                        confidence=d.confidence,
-                        bbox={
-                            "x": d.bbox_x,
-                            "y": d.bbox_y,
-                            "width": d.bbox_width,
-                            "height": d.bbox_height,
-                        },
-                        person_name=d.person_name,
-                        person_id=d.person_id,
-                        face_encoding=d.face_encoding,
-                        is_processed=d.is_processed,
-                        processing_status=d.processing_status,
-                        frame_number=d.frame_number,
-                        frame_timestamp=d.frame_timestamp,
-                        createdAt=d.created_at,
-                        updatedAt=d.updated_at,
-                    )
+                    _detection_response(d)
                     for d in result["detections"]
                 ],
                 processing_time_ms=result["processing_time_ms"],
@@ -304,7 +402,22 @@ async def send_frame_for_detection(
 # ============================================================================
 
 
-@router.get("/events", response_model=PaginatedResponse[DetectionEventLogResponse])
+async def _events_body(limit: int, offset: int, **filters) -> AsyncIterator[bytes]:
+    """Yield an events page row by row; meta trails the data so the row count is known."""
+    yield b'{"success":true,"data":['
+    count = 0
+
+    # Own session: the stream outlives the endpoint call
+    async with AsyncSessionLocal() as db:
+        async for event in DetectionService(db).stream_detection_events(limit=limit, offset=offset, **filters):
+            yield (b"," if count else b"") + orjson.dumps(dict(zip(_EVENT_KEYS, _event_row(event))))
+            count += 1
+
+    meta = PaginationMeta(page=offset // limit + 1, pageSize=limit, total=count, totalPages=(count + limit - 1) // limit)
+    yield b'],"meta":' + orjson.dumps(meta.model_dump()) + b"}"
+
+
+@router.get("/events", response_model=PaginatedResponse[DetectionEventLogResponse], dependencies=[_can_view_events])
 async def get_detection_events(
     camera_id: Optional[str] = Query(None, description="Filter by camera ID"),
     event_type: Optional[str] = Query(None, description="Filter by event type"),
@@ -312,61 +425,19 @@ async def get_detection_events(
     person_id: Optional[str] = Query(None, description="Filter by person ID"),
     limit: int = Query(100, ge=1, le=1000, description="Result limit"),
     offset: int = Query(0, ge=0, description="Result offset"),
-    current_user: CurrentUser = Depends(get_current_user),
-    service: DetectionService = Depends(get_detection_service),
-) -> PaginatedResponse[DetectionEventLogResponse]:
-    """Get detection events with filtering."""
-    if not current_user.has_permission("detections:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view detection events",
-        )
-
-    try:
-        result = await service.get_detection_events(
+) -> StreamingResponse:
+    """Get detection events with filtering, streamed as they are read."""
+    return StreamingResponse(
+        _events_body(
+            limit,
+            offset,
             camera_id=camera_id,
             event_type=event_type,
             severity=severity,
             person_id=person_id,
-            limit=limit,
-            offset=offset,
-        )
-
-        events = result["events"]
-        total = result["total_events"]
-        page = offset // limit + 1 if limit > 0 else 1
-        total_pages = (total + limit - 1) // limit if limit > 0 else 1
-
-        return PaginatedResponse(
-            data=[
-                DetectionEventLogResponse(
-                    id=e.id,
-                    detection_id=e.detection_id,
-                    camera_id=e.camera_id,
-                    event_type=e.event_type,
-                    severity=e.severity,
-                    message=e.message,
-                    person_id=e.person_id,
-                    person_name=e.person_name,
-                    confidence_score=e.confidence_score,
-                    action_taken=e.action_taken,
-                    action_timestamp=e.action_timestamp,
-                    source_system=e.source_system,
-                    createdAt=e.created_at,
-                    updatedAt=e.updated_at,
-                )
-                for e in events
-            ],
-            meta=PaginationMeta(
-                page=page,
-                pageSize=limit,
-                total=total,
-                totalPages=total_pages,
-            ),
-        )
-    except Exception as e:
-        logger.error(f"Error getting detection events: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get events")
+        ),
+        media_type="application/json",
+    )
 
 
 # ============================================================================
@@ -374,19 +445,16 @@ async def get_detection_events(
 # ============================================================================
 
 
-@router.get("/statistics", response_model=SuccessResponse[DetectionStatisticsResponse])
+@router.get(
+    "/statistics",
+    response_model=SuccessResponse[DetectionStatisticsResponse],
+    dependencies=[_can_view_statistics],
+)
 async def get_detection_statistics(
     camera_id: Optional[str] = Query(None, description="Filter by camera ID"),
-    current_user: CurrentUser = Depends(get_current_user),
     service: DetectionService = Depends(get_detection_service),
 ) -> SuccessResponse[DetectionStatisticsResponse]:
     """Get detection statistics."""
-    if not current_user.has_permission("detections:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view detection statistics",
-        )
-
     try:
         stats = await service.get_detection_statistics(camera_id=camera_id)
 
@@ -407,18 +475,11 @@ async def get_detection_statistics(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get statistics")
 
 
-@router.get("/queue-stats", response_model=SuccessResponse[dict])
+@router.get("/queue-stats", response_model=SuccessResponse[dict], dependencies=[_can_view_queue_stats])
 async def get_queue_stats(
-    current_user: CurrentUser = Depends(get_current_user),
     service: DetectionService = Depends(get_detection_service),
 ) -> SuccessResponse[dict]:
     """Get detection processing queue statistics."""
-    if not current_user.has_permission("detections:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view queue statistics",
-        )
-
     try:
         stats = await service.get_queue_stats()
         return SuccessResponse(data=stats)
@@ -427,18 +488,11 @@ async def get_queue_stats(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get queue stats")
 
 
-@router.get("/summary", response_model=SuccessResponse[dict])
+@router.get("/summary", response_model=SuccessResponse[dict], dependencies=[_can_view_summary])
 async def get_detection_summary(
-    current_user: CurrentUser = Depends(get_current_user),
     service: DetectionService = Depends(get_detection_service),
 ) -> SuccessResponse[dict]:
     """Get detection system summary."""
-    if not current_user.has_permission("detections:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view detection summary",
-        )
-
     try:
         summary = await service.get_detection_summary()
         return SuccessResponse(data=summary)
@@ -451,16 +505,182 @@ async def get_detection_summary(
 # WebSocket Endpoint
 # ============================================================================
 
+_subscribe = ws_manager.subscribe
+_subscribe_many = ws_manager.subscribe_many
+_unsubscribe = ws_manager.unsubscribe
+_unsubscribe_many = ws_manager.unsubscribe_many
+_send = ws_manager.send
+_send_encoded = ws_manager.send_encoded
+
+
+# Channel names are rebuilt on every (un)subscribe and broadcast; memoize and
+# intern them so the manager's channel sets compare them by identity
+@lru_cache(maxsize=4096)
+def _camera_channel(camera_id: str) -> str:
+    """Get the channel name for a camera's detections."""
+    return sys.intern(f"camera:{camera_id}")
+
+
+@lru_cache(maxsize=4096)
+def _event_channel(event_type: str) -> str:
+    """Get the channel name for an event type."""
+    return sys.intern(f"events:{event_type}")
+
+
+# Encoded subscribe replies per (camera_id, min_confidence): (expires_at, task).
+# Dropped when the camera broadcasts a new detection.
+SUBSCRIBE_PAYLOAD_TTL = 2.0
+_subscribe_payloads: dict[tuple[str, float], tuple[float, asyncio.Task]] = {}
+
+
+async def _compute_subscribe_payload(camera_id: str, min_confidence: float) -> str:
+    """Encode a camera's subscribe reply on its own session, independent of any one connection."""
+    async with AsyncSessionLocal() as db:
+        result = await DetectionService(db).get_live_detections(
+            camera_id=camera_id,
+            min_confidence=min_confidence,
+            use_cache=True,
+        )
+
+    detections_data = result["detections"]
+    return orjson.dumps(
+        {
+            "type": "subscription",
+            "camera_id": camera_id,
+            "subscribed": True,
+            "message": f"Subscribed to camera {camera_id}",
+            "current_detections": detections_data,
+            "detection_count": len(detections_data),
+        }
+    ).decode()
+
+
+def _subscribe_payload(camera_id: str, min_confidence: float) -> asyncio.Task:
+    """Get the fresh or in-flight subscribe reply for a camera, starting one if there is none (single flight)."""
+    key = (camera_id, round(min_confidence, 1))
+    now = time.monotonic()
+
+    entry = _subscribe_payloads.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    # Prune expired replies so one-off camera ids don't accumulate
+    for stale in [k for k, (expires_at, _) in _subscribe_payloads.items() if expires_at <= now]:
+        del _subscribe_payloads[stale]
+
+    task = asyncio.create_task(_compute_subscribe_payload(*key))
+    entry = (now + SUBSCRIBE_PAYLOAD_TTL, task)
+    _subscribe_payloads[key] = entry
+
+    def forget_failure(done: asyncio.Task):
+        if (done.cancelled() or done.exception() is not None) and _subscribe_payloads.get(key) is entry:
+            del _subscribe_payloads[key]
+
+    task.add_done_callback(forget_failure)
+    return task
+
+
+def _invalidate_subscribe_payloads(camera_id: str):
+    """Drop a camera's cached subscribe replies."""
+    for key in [k for k in _subscribe_payloads if k[0] == camera_id]:
+        del _subscribe_payloads[key]
+
+
+async def _handle_subscribe(websocket: WebSocket, message: dict):
+    """Subscribe to a camera and/or event types, sending the camera's current detections."""
+    camera_id = message.get("camera_id")
+    event_types = message.get("event_types", [])
+
+    if camera_id:
+        await _subscribe(websocket, _camera_channel(camera_id))
+
+        # Send current detections; subscribers to the same camera share one query
+        min_confidence = min(max(message.get("min_confidence") or 0.5, 0.0), 1.0)
+        _send_encoded(websocket, await asyncio.shield(_subscribe_payload(camera_id, min_confidence)))
+
+    if event_types:
+        await _subscribe_many(websocket, [_event_channel(event_type) for event_type in event_types])
+
+        _send(
+            websocket,
+            {
+                "type": "subscription",
+                "event_types": event_types,
+                "subscribed": True,
+                "message": f"Subscribed to event types: {', '.join(event_types)}",
+            },
+        )
+
+
+async def _handle_unsubscribe(websocket: WebSocket, message: dict):
+    """Unsubscribe from a camera and/or event types."""
+    camera_id = message.get("camera_id")
+    event_types = message.get("event_types", [])
+
+    if camera_id:
+        await _unsubscribe(websocket, _camera_channel(camera_id))
+
+        _send(
+            websocket,
+            {
+                "type": "subscription",
+                "camera_id": camera_id,
+                "subscribed": False,
+                "message": f"Unsubscribed from camera {camera_id}",
+            },
+        )
+
+    if event_types:
+        await _unsubscribe_many(websocket, [_event_channel(event_type) for event_type in event_types])
+
+        _send(
+            websocket,
+            {
+                "type": "subscription",
+                "event_types": event_types,
+                "subscribed": False,
+                "message": f"Unsubscribed from event types: {', '.join(event_types)}",
+            },
+        )
+
+
+async def _handle_ping(websocket: WebSocket, message: dict):
+    """Respond to a client ping."""
+    _send(websocket, {"type": "pong", "timestamp": _utcnow().isoformat()})
+
+
+async def _handle_get_stats(websocket: WebSocket, message: dict):
+    """Send the detection queue statistics."""
+    # Short-lived session: the connection holds no pooled connection between messages
+    async with AsyncSessionLocal() as db:
+        stats = await DetectionService(db).get_queue_stats()
+    _send(websocket, {"type": "stats", "queue_stats": stats})
+
+
+async def _handle_unknown(websocket: WebSocket, message: dict):
+    """Reject a message type the endpoint does not understand."""
+    _send(
+        websocket,
+        {
+            "type": "error",
+            "message": f"Unknown message type: {message.get('type', '').lower()}",
+        },
+    )
+
+
+# Client message type -> handler, looked up once per message
+_WS_HANDLERS = {
+    "subscribe": _handle_subscribe,
+    "unsubscribe": _handle_unsubscribe,
+    "ping": _handle_ping,
+    "get_stats": _handle_get_stats,
+}
+
 
 @router.websocket("/ws/{client_id}")
-async def websocket_endpoint(
-    websocket: WebSocket,
-    client_id: str,
-    db: AsyncSession = Depends(get_db),
-):
+async def websocket_endpoint(websocket: WebSocket, client_id: str):
     """WebSocket endpoint for real-time detection streaming."""
     await ws_manager.connect(websocket, client_id)
-    service = DetectionService(db)
 
     try:
         while True:
@@ -468,137 +688,14 @@ async def websocket_endpoint(
             data = await websocket.receive_text()
 
             try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "message": "Invalid JSON format",
-                    }
-                )
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                _send(websocket, {"type": "error", "message": "Invalid JSON format"})
                 continue
 
-            # Handle subscription messages
             message_type = message.get("type", "").lower()
-
-            if message_type == "subscribe":
-                # Subscribe to a camera or event type
-                camera_id = message.get("camera_id")
-                event_types = message.get("event_types", [])
-                min_confidence = message.get("min_confidence")
-
-                if camera_id:
-                    channel = f"camera:{camera_id}"
-                    await ws_manager.subscribe(websocket, channel)
-
-                    # Send current detections
-                    result = await service.get_live_detections(
-                        camera_id=camera_id,
-                        min_confidence=min_confidence or 0.5,
-                        use_cache=True,
-                    )
-
-                    detections_data = []
-                    for d in result["detections"]:
-                        detections_data.append(
-                            {
-                                "id": d.id,
-                                "detection_type": d.detection_type,
-                                "confidence": d.confidence,
-                                "bbox": {
-                                    "x": d.bbox_x,
-                                    "y": d.bbox_y,
-                                    "width": d.bbox_width,
-                                    "height": d.bbox_height,
-                                },
-                                "person_name": d.person_name,
-                                "person_id": d.person_id,
-                            }
-                        )
-
-                    await websocket.send_json(
-                        {
-                            "type": "subscription",
-                            "camera_id": camera_id,
-                            "subscribed": True,
-                            "message": f"Subscribed to camera {camera_id}",
-                            "current_detections": detections_data,
-                            "detection_count": len(detections_data),
-                        }
-                    )
-
-                if event_types:
-                    for event_type in event_types:
-                        channel = f"events:{event_type}"
-                        await ws_manager.subscribe(websocket, channel)
-
-                    await websocket.send_json(
-                        {
-                            "type": "subscription",
-                            "event_types": event_types,
-                            "subscribed": True,
-                            "message": f"Subscribed to event types: {', '.join(event_types)}",
-                        }
-                    )
-
-            elif message_type == "unsubscribe":
-                # Unsubscribe from a camera or event type
-                camera_id = message.get("camera_id")
-                event_types = message.get("event_types", [])
-
-                if camera_id:
-                    channel = f"camera:{camera_id}"
-                    await ws_manager.unsubscribe(websocket, channel)
-
-                    await websocket.send_json(
-                        {
-                            "type": "subscription",
-                            "camera_id": camera_id,
-                            "subscribed": False,
-                            "message": f"Unsubscribed from camera {camera_id}",
-                        }
-                    )
-
-                if event_types:
-                    for event_type in event_types:
-                        channel = f"events:{event_type}"
-                        await ws_manager.unsubscribe(websocket, channel)
-
-                    await websocket.send_json(
-                        {
-                            "type": "subscription",
-                            "event_types": event_types,
-                            "subscribed": False,
-                            "message": f"Unsubscribed from event types: {', '.join(event_types)}",
-                        }
-                    )
-
-            elif message_type == "ping":
-                # Respond to ping
-                await websocket.send_json(
-                    {
-                        "type": "pong",
-                        "timestamp": __import__("datetime").datetime.utcnow().isoformat(),
-                    }
-                )
-
-            elif message_type == "get_stats":
-                # Get queue statistics
-                stats = await service.get_queue_stats()
-                await websocket.send_json(
-                    {
-                        "type": "stats",
-                        "queue_stats": stats,
-                    }
-                )
-
-            else:
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "message": f"Unknown message type: {message_type}",
-                    }
-                )
+            handler = _WS_HANDLERS.get(message_type, _handle_unknown)
+            await handler(websocket, message)
 
     except WebSocketDisconnect:
         await ws_manager.disconnect(websocket, client_id)
@@ -617,7 +714,7 @@ async def broadcast_detection(
     person_id: Optional[str] = None,
 ):
     """Broadcast detection to subscribed clients."""
-    channel = f"camera:{camera_id}"
+    channel = _camera_channel(camera_id)
     message = {
         "type": "detection",
         "detection_id": detection_id,
@@ -626,8 +723,9 @@ async def broadcast_detection(
         "confidence": confidence,
         "person_name": person_name,
         "person_id": person_id,
-        "timestamp": __import__("datetime").datetime.utcnow().isoformat(),
+        "timestamp": _utcnow().isoformat(),
     }
+    _invalidate_subscribe_payloads(camera_id)
     await ws_manager.broadcast_to_channel(channel, message)
 
 
@@ -639,7 +737,7 @@ async def broadcast_event(
     camera_id: Optional[str] = None,
 ):
     """Broadcast event to subscribed clients."""
-    channel = f"events:{event_type}"
+    channel = _event_channel(event_type)
     message = {
         "type": "event",
         "event_id": event_id,
@@ -647,6 +745,6 @@ async def broadcast_event(
         "severity": severity,
         "message": message_text,
         "camera_id": camera_id,
-        "timestamp": __import__("datetime").datetime.utcnow().isoformat(),
+        "timestamp": _utcnow().isoformat(),
     }
     await ws_manager.broadcast_to_channel(channel, message)
@@ -2,14 +2,19 @@
 
 import base64
 import logging
-from typing import Optional
+import operator
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import CurrentUser, get_current_user
+from app.core.deps import require_permission
 from app.core.errors import NotFoundError, ValidationError
-from app.db.session import get_db
+from app.core.responses import PydanticResponse, etag_matches, not_modified, weak_etag
+from app.db.session import AsyncSessionLocal, get_db
+from app.models.person import Person
 from app.schemas.common import PaginatedResponse, PaginationMeta, SuccessResponse
 from app.schemas.person import (
     PersonCreate,
@@ -26,6 +31,13 @@ from app.services.person_service import PersonService
 router = APIRouter(tags=["Persons"])
 logger = logging.getLogger(__name__)
 
+# Route-level permission checks; they run before the endpoint's own dependencies
+_can_view = Depends(require_permission("persons:read", "You don't have permission to view persons"))
+_can_search = Depends(require_permission("persons:read", "You don't have permission to search persons"))
+_can_create = Depends(require_permission("persons:write", "You don't have permission to create persons"))
+_can_enroll = Depends(require_permission("persons:write", "You don't have permission to enroll faces"))
+_can_manage = Depends(require_permission("persons:write", "You don't have permission to manage persons"))
+
 
 # Helper functions
 async def get_person_service(db: AsyncSession = Depends(get_db)) -> PersonService:
@@ -33,227 +45,111 @@ async def get_person_service(db: AsyncSession = Depends(get_db)) -> PersonServic
     return PersonService(db)
 
 
+# PersonResponse field names are the Person column attribute names
+_PERSON_FIELDS = tuple(PersonResponse.model_fields)
+_PERSON_KEYS = tuple(field.alias or name for name, field in PersonResponse.model_fields.items())
+_person_row = operator.attrgetter(*_PERSON_FIELDS)
+
+
+def _to_person_response(p: Person, _construct=PersonResponse.model_construct) -> PersonResponse:
+    """
+    Build a PersonResponse from a loaded row without re-validating it.
+
+    Column values already have the schema's types, so model_construct skips
+    the per-field validators that model_validate would run for every person;
+    attrgetter reads all the columns in one call.
+    """
+    return _construct(**dict(zip(_PERSON_FIELDS, _person_row(p))))
+
+
 # ============================================================================
 # Person CRUD Endpoints
 # ============================================================================
 
 
-@router.post("", response_model=SuccessResponse[PersonResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=SuccessResponse[PersonResponse],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[_can_create],
+)
 async def create_person(
     request: PersonCreate,
-    current_user: CurrentUser = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
-) -> SuccessResponse[PersonResponse]:
+) -> PydanticResponse:
     """Create a new person."""
-    if not current_user.has_permission("persons:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to create persons",
-        )
-
     try:
         person = await service.create_person(request)
-        return SuccessResponse(
-            data=PersonResponse(
-                id=person.id,
-                first_name=person.first_name,
-                last_name=person.last_name,
-                email=person.email,
-                phone=person.phone,
-                person_type=person.person_type,
-                id_number=person.id_number,
-                id_type=person.id_type,
-                department=person.department,
-                organization=person.organization,
-                status=person.status,
-                face_encoding_count=person.face_encoding_count,
-                enrolled_at=person.enrolled_at,
-                last_face_enrolled=person.last_face_enrolled,
-                createdAt=person.created_at,
-                updatedAt=person.updated_at,
-            ),
+        envelope = SuccessResponse(
+            data=_to_person_response(person),
             meta={"created": True},
         )
+        return PydanticResponse(envelope, status_code=status.HTTP_201_CREATED)
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("", response_model=PaginatedResponse[PersonResponse])
+async def _persons_body(meta: PaginationMeta, **page) -> AsyncIterator[bytes]:
+    """
+    Yield a person list page row by row in the PaginatedResponse layout.
+
+    Rows are Core column tuples dumped straight by orjson under the schema's
+    aliases; no Person or PersonResponse objects are built.
+    """
+    yield b'{"success":true,"data":['
+    first = True
+
+    # Own session: the stream outlives the endpoint call
+    async with AsyncSessionLocal() as db:
+        async for row in PersonService(db).stream_persons(_PERSON_FIELDS, **page):
+            yield (b"" if first else b",") + orjson.dumps(dict(zip(_PERSON_KEYS, row)), option=orjson.OPT_UTC_Z)
+            first = False
+
+    yield b'],"meta":' + meta.model_dump_json().encode() + b"}"
+
+
+@router.get("", response_model=PaginatedResponse[PersonResponse], dependencies=[_can_view])
 async def list_persons(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
     status: Optional[str] = Query(None, description="Filter by status"),
     person_type: Optional[str] = Query(None, description="Filter by type"),
     department: Optional[str] = Query(None, description="Filter by department"),
-    current_user: CurrentUser = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
-) -> PaginatedResponse[PersonResponse]:
-    """List persons with optional filtering."""
-    if not current_user.has_permission("persons:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view persons",
-        )
-
-    skip = (page - 1) * page_size
-    persons = await service.list_persons(
-        skip=skip,
-        limit=page_size,
-        status=status,
-        person_type=person_type,
-        department=department,
-    )
-
-    # Get total count
-    total = len(persons) + skip  # Simplified, in production would query count
-    total_pages = (total + page_size - 1) // page_size
-
-    return PaginatedResponse(
-        data=[
-            PersonResponse(
-                id=p.id,
-                first_name=p.first_name,
-                last_name=p.last_name,
-                email=p.email,
-                phone=p.phone,
-                person_type=p.person_type,
-                id_number=p.id_number,
-                id_type=p.id_type,
-                department=p.department,
-                organization=p.organization,
-                status=p.status,
-                face_encoding_count=p.face_encoding_count,
-                enrolled_at=p.enrolled_at,
-                last_face_enrolled=p.last_face_enrolled,
-                createdAt=p.created_at,
-                updatedAt=p.updated_at,
-            )
-            for p in persons
-        ],
-        meta=PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=total_pages),
+) -> StreamingResponse:
+    """List persons with optional filtering, streamed as rows are read."""
+    total = await service.count_persons(status=status, person_type=person_type, department=department)
+    meta = PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=(total + page_size - 1) // page_size)
+
+    return StreamingResponse(
+        _persons_body(
+            meta,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+            status=status,
+            person_type=person_type,
+            department=department,
+        ),
+        media_type="application/json",
     )
 
 
-@router.get("/{person_id}", response_model=SuccessResponse[PersonResponse])
-async def get_person(
-    person_id: str,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: PersonService = Depends(get_person_service),
-) -> SuccessResponse[PersonResponse]:
-    """Get person by ID."""
-    if not current_user.has_permission("persons:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view persons",
-        )
-
-    try:
-        person = await service.get_person(person_id)
-        return SuccessResponse(
-            data=PersonResponse(
-                id=person.id,
-                first_name=person.first_name,
-                last_name=person.last_name,
-                email=person.email,
-                phone=person.phone,
-                person_type=person.person_type,
-                id_number=person.id_number,
-                id_type=person.id_type,
-                department=person.department,
-                organization=person.organization,
-                status=person.status,
-                face_encoding_count=person.face_encoding_count,
-                enrolled_at=person.enrolled_at,
-                last_face_enrolled=person.last_face_enrolled,
-                createdAt=person.created_at,
-                updatedAt=person.updated_at,
-            )
-        )
-    except NotFoundError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-
-
-@router.put("/{person_id}", response_model=SuccessResponse[PersonResponse])
-async def update_person(
-    person_id: str,
-    request: PersonUpdate,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: PersonService = Depends(get_person_service),
-) -> SuccessResponse[PersonResponse]:
-    """Update person."""
-    if not current_user.has_permission("persons:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage persons",
-        )
-
-    try:
-        person = await service.update_person(person_id, request)
-        return SuccessResponse(
-            data=PersonResponse(
-                id=person.id,
-                first_name=person.first_name,
-                last_name=person.last_name,
-                email=person.email,
-                phone=person.phone,
-                person_type=person.person_type,
-                id_number=person.id_number,
-                id_type=person.id_type,
-                department=person.department,
-                organization=person.organization,
-                status=person.status,
-                face_encoding_count=person.face_encoding_count,
-                enrolled_at=person.enrolled_at,
-                last_face_enrolled=person.last_face_enrolled,
-                createdAt=person.created_at,
-                updatedAt=person.updated_at,
-            )
-        )
-    except (NotFoundError, ValidationError) as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND if isinstance(e, NotFoundError) else status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
-
-
-@router.delete("/{person_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_person(
-    person_id: str,
-    current_user: CurrentUser = Depends(get_current_user),
-    service: PersonService = Depends(get_person_service),
-):
-    """Delete person."""
-    if not current_user.has_permission("persons:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to manage persons",
-        )
-
-    try:
-        await service.delete_person(person_id)
-    except NotFoundError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-
-
 # ============================================================================
 # Face Enrollment Endpoints
 # ============================================================================
 
 
-@router.post("/{person_id}/enroll", response_model=SuccessResponse[PersonEnrollmentResponse])
+@router.post(
+    "/{person_id}/enroll",
+    response_model=SuccessResponse[PersonEnrollmentResponse],
+    dependencies=[_can_enroll],
+)
 async def enroll_face(
     person_id: str,
     request: PersonEnrollmentRequest,
-    current_user: CurrentUser = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
 ) -> SuccessResponse[PersonEnrollmentResponse]:
     """Enroll a face for a person."""
-    if not current_user.has_permission("persons:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to enroll faces",
-        )
-
     result = await service.enroll_face(
         person_id=person_id,
         frame_data=request.frame_data,
@@ -272,19 +168,13 @@ async def enroll_face(
 @router.post(
     "/search/by-face",
     response_model=SuccessResponse[PersonSearchByFaceResponse],
+    dependencies=[_can_search],
 )
 async def search_by_face(
     request: PersonSearchByFaceRequest,
-    current_user: CurrentUser = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
 ) -> SuccessResponse[PersonSearchByFaceResponse]:
     """Find person by face."""
-    if not current_user.has_permission("persons:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to search persons",
-        )
-
     result = await service.find_person_by_face(
         frame_data=request.frame_data,
         confidence_threshold=request.confidence_threshold,
@@ -293,53 +183,22 @@ async def search_by_face(
     return SuccessResponse(data=result)
 
 
-@router.get("/search", response_model=PaginatedResponse[PersonResponse])
+@router.get("/search", response_model=PaginatedResponse[PersonResponse], dependencies=[_can_search])
 async def search_persons(
     q: str = Query(..., description="Search query"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
-    current_user: CurrentUser = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
-) -> PaginatedResponse[PersonResponse]:
+) -> PydanticResponse:
     """Search persons by name, email, or ID."""
-    if not current_user.has_permission("persons:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to search persons",
-        )
-
-    persons = await service.search_persons(q)
-
-    # Apply pagination
-    skip = (page - 1) * page_size
-    paginated = persons[skip : skip + page_size]
-    total = len(persons)
+    persons, total = await service.search_persons(q, skip=(page - 1) * page_size, limit=page_size)
     total_pages = (total + page_size - 1) // page_size
 
-    return PaginatedResponse(
-        data=[
-            PersonResponse(
-                id=p.id,
-                first_name=p.first_name,
-                last_name=p.last_name,
-                email=p.email,
-                phone=p.phone,
-                person_type=p.person_type,
-                id_number=p.id_number,
-                id_type=p.id_type,
-                department=p.department,
-                organization=p.organization,
-                status=p.status,
-                face_encoding_count=p.face_encoding_count,
-                enrolled_at=p.enrolled_at,
-                last_face_enrolled=p.last_face_enrolled,
-                createdAt=p.created_at,
-                updatedAt=p.updated_at,
-            )
-            for p in paginated
-        ],
+    envelope = PaginatedResponse(
+        data=[_to_person_response(p) for p in persons],
         meta=PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=total_pages),
     )
+    return await PydanticResponse.create(envelope, items=len(envelope.data))
 
 
 # ============================================================================
@@ -347,17 +206,68 @@ async def search_persons(
 # ============================================================================
 
 
-@router.get("/summary", response_model=SuccessResponse[dict])
+@router.get("/summary", response_model=SuccessResponse[dict], dependencies=[_can_view])
 async def get_person_summary(
-    current_user: CurrentUser = Depends(get_current_user),
     service: PersonService = Depends(get_person_service),
 ) -> SuccessResponse[dict]:
     """Get person system summary."""
-    if not current_user.has_permission("persons:read"):
+    summary = await service.get_person_summary()
+    return SuccessResponse(data=summary)
+
+
+# ============================================================================
+# Person by ID Endpoints
+# ============================================================================
+# Registered after the static paths so /search and /summary are not matched as
+# a person_id.
+
+
+@router.get("/{person_id}", response_model=SuccessResponse[PersonResponse], dependencies=[_can_view])
+async def get_person(
+    person_id: str,
+    request: Request,
+    service: PersonService = Depends(get_person_service),
+) -> Response:
+    """Get person by ID (304 when If-None-Match still matches)."""
+    if request.headers.get("if-none-match"):
+        etag = weak_etag(await service.get_person_updated_at(person_id))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    try:
+        person = await service.get_person(person_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    etag = weak_etag(person.updated_at)
+    headers = {"ETag": etag} if etag else None
+    return PydanticResponse(SuccessResponse(data=_to_person_response(person)), headers=headers)
+
+
+@router.put("/{person_id}", response_model=SuccessResponse[PersonResponse], dependencies=[_can_manage])
+async def update_person(
+    person_id: str,
+    request: PersonUpdate,
+    service: PersonService = Depends(get_person_service),
+) -> PydanticResponse:
+    """Update person."""
+    try:
+        person = await service.update_person(person_id, request)
+        return PydanticResponse(SuccessResponse(data=_to_person_response(person)))
+    except (NotFoundError, ValidationError) as e:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view persons",
+            status_code=status.HTTP_404_NOT_FOUND if isinstance(e, NotFoundError) else status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
 
-    summary = await service.get_person_summary()
-    return SuccessResponse(data=summary)
+
+@router.delete("/{person_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[_can_manage])
+async def delete_person(
+    person_id: str,
+    service: PersonService = Depends(get_person_service),
+):
+    """Delete person."""
+    try:
+        await service.delete_person(person_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
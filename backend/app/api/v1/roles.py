@@ -2,13 +2,13 @@
 Roles endpoint.
 """
 
-import json
-
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core.deps import CurrentUser, get_current_user
+from app.core.responses import PydanticResponse, etag_matches, not_modified, weak_etag
 from app.db.session import get_db
 from app.models.user import Role
 from app.schemas.common import SuccessResponse
@@ -19,22 +19,32 @@ router = APIRouter(prefix="/roles", tags=["Roles"])
 
 @router.get("", response_model=SuccessResponse[list[RoleResponse]])
 async def get_roles(
-    current_user: CurrentUser = Depends(get_current_user), db: AsyncSession = Depends(get_db)
-) -> SuccessResponse[list[RoleResponse]]:
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
     """
     Get all roles.
 
-    Returns list of all roles and their permissions.
+    Returns list of all roles and their permissions. The ETag covers the role
+    count and the latest updated_at, so a matching If-None-Match is answered
+    with 304 from one aggregate query.
     """
+    if request.headers.get("if-none-match"):
+        count, last_updated = (await db.execute(select(func.count(Role.id), func.max(Role.updated_at)))).one()
+        etag = weak_etag(last_updated, count)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
     result = await db.execute(select(Role))
     roles = result.scalars().all()
 
-    return SuccessResponse(
+    envelope = SuccessResponse(
         data=[
             RoleResponse(
                 id=role.id,
                 name=role.name,
-                permissions=json.loads(role.permissions) if role.permissions else [],
+                permissions=role.permission_list,
                 description=role.description,
                 createdAt=role.created_at,
                 updatedAt=role.updated_at,
@@ -42,3 +52,6 @@ async def get_roles(
             for role in roles
         ]
     )
+    etag = weak_etag(max((role.updated_at for role in roles), default=None), len(roles))
+    headers = {"ETag": etag} if etag else None
+    return PydanticResponse(envelope, headers=headers)
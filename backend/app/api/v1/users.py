@@ -1,56 +1,105 @@
 """User management endpoints."""
 
-from typing import Optional
+import operator
+from typing import AsyncIterator, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, select
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.core.deps import CurrentUser, get_current_user
-from app.core.security import hash_password
-from app.db.session import get_db
+from app.core.deps import CurrentUser, require_permission
+from app.core.redis import cache_service
+from app.core.responses import PydanticResponse, etag_matches, not_modified, weak_etag
+from app.core.security import hash_password_async
+from app.db.session import AsyncSessionLocal, get_db
 from app.models.user import User
 from app.schemas.common import PaginatedResponse, PaginationMeta, SuccessResponse
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Route-level permission checks; they run before the endpoint's own dependencies
+_can_view = Depends(require_permission("users:read", "You don't have permission to view users"))
+_can_create = Depends(require_permission("users:write", "You don't have permission to create users"))
+_can_update = Depends(require_permission("users:write", "You don't have permission to update users"))
+_can_delete = Depends(require_permission("users:write", "You don't have permission to delete users"))
 
-@router.get("", response_model=PaginatedResponse[UserResponse])
+
+async def _commit_user(db: AsyncSession) -> None:
+    """
+    Commit a user insert/update, reporting a duplicate email as a 400.
+
+    users.email is unique, so the constraint is the duplicate check; no
+    SELECT is issued beforehand.
+    """
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists",
+        )
+
+
+# UserResponse field names are the User column attribute names
+_USER_FIELDS = tuple(UserResponse.model_fields)
+_USER_KEYS = tuple(field.alias or name for name, field in UserResponse.model_fields.items())
+_USER_COLUMNS = tuple(getattr(User, name) for name in _USER_FIELDS)
+_user_row = operator.attrgetter(*_USER_FIELDS)
+
+
+def _to_user_response(user: User, _construct=UserResponse.model_construct) -> UserResponse:
+    """Build a UserResponse from a loaded row without re-validating it."""
+    return _construct(**dict(zip(_USER_FIELDS, _user_row(user))))
+
+
+async def _users_body(query: Select, meta: PaginationMeta) -> AsyncIterator[bytes]:
+    """
+    Yield a user list page row by row in the PaginatedResponse layout.
+
+    The query selects the response columns, so rows are plain tuples dumped by
+    orjson under the schema's aliases without building User objects.
+    """
+    yield b'{"success":true,"data":['
+    first = True
+
+    # Own session: the stream outlives the endpoint call
+    async with AsyncSessionLocal() as db:
+        async for row in await db.stream(query.execution_options(yield_per=50)):
+            yield (b"" if first else b",") + orjson.dumps(dict(zip(_USER_KEYS, row)), option=orjson.OPT_UTC_Z)
+            first = False
+
+    yield b'],"meta":' + meta.model_dump_json().encode() + b"}"
+
+
+@router.get("", response_model=PaginatedResponse[UserResponse], dependencies=[_can_view])
 async def list_users(
-    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search by name or email"),
     role_id: Optional[str] = Query(None, description="Filter by role ID"),
     status: Optional[str] = Query(None, description="Filter by status"),
-) -> PaginatedResponse[UserResponse]:
+) -> StreamingResponse:
     """
-    List all users with pagination and filtering.
+    List all users with pagination and filtering, streamed as rows are read.
 
     Requires: `users:read` permission
     """
-    # Check permission
-    if not current_user.has_permission("users:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view users",
-        )
-
-    # Build query
-    query = select(User)
+    # Build query over the response columns only
+    query = select(*_USER_COLUMNS)
 
     # Apply filters
     filters = []
 
     if search:
         search_pattern = f"%{search}%"
-        filters.append(
-            (User.name.ilike(search_pattern)) | (User.email.ilike(search_pattern))
-        )
+        filters.append(or_(User.name.ilike(search_pattern), User.email.ilike(search_pattern)))
 
     if role_id:
         filters.append(User.role_id == role_id)
@@ -58,84 +107,46 @@ async def list_users(
     if status:
         filters.append(User.status == status)
 
+    count_query = select(func.count()).select_from(User)
     if filters:
-        from sqlalchemy import or_
-
-        query = query.where(or_(*filters) if len(filters) > 1 else filters[0])
-
-    # Get total count before pagination
-    count_query = select(User)
-    if filters:
-        from sqlalchemy import or_
-
-        count_query = count_query.where(
-            or_(*filters) if len(filters) > 1 else filters[0]
-        )
-    count_result = await db.execute(count_query)
-    total = len(count_result.scalars().all())
+        # Every filter must match; only the search terms are alternatives
+        where_clause = and_(*filters)
+        query = query.where(where_clause)
+        count_query = count_query.where(where_clause)
+
+    # Cached per filter set so every page of one listing shares the COUNT
+    count_filters = (search, role_id, status)
+    total = await cache_service.get_cached_list_count(cache_service.USER_PREFIX, count_filters)
+    if total is None:
+        total = await db.scalar(count_query) or 0
+        await cache_service.cache_list_count(cache_service.USER_PREFIX, count_filters, total)
 
     # Apply pagination
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size)
 
-    # Execute query
-    result = await db.execute(query)
-    users = result.scalars().all()
-
-    # Convert to response schema
-    user_responses = [
-        UserResponse(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            roleId=user.role_id,
-            status=user.status,
-            lastActive=user.last_active,
-            createdAt=user.created_at,
-            updatedAt=user.updated_at,
-        )
-        for user in users
-    ]
-
     total_pages = (total + page_size - 1) // page_size
+    meta = PaginationMeta(page=page, pageSize=page_size, total=total, totalPages=total_pages)
+    return StreamingResponse(_users_body(query, meta), media_type="application/json")
 
-    return PaginatedResponse(
-        data=user_responses,
-        meta=PaginationMeta(
-            page=page, pageSize=page_size, total=total, totalPages=total_pages
-        ),
-    )
 
-
-@router.post("", response_model=SuccessResponse[UserResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=SuccessResponse[UserResponse],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[_can_create],
+)
 async def create_user(
     request: UserCreate,
-    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> SuccessResponse[UserResponse]:
+) -> PydanticResponse:
     """
     Create a new user.
 
     Requires: `users:write` permission
     """
-    # Check permission
-    if not current_user.has_permission("users:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to create users",
-        )
-
-    # Check if email already exists
-    result = await db.execute(select(User).where(User.email == request.email))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email already exists",
-        )
-
     # Create new user
     user = User(
-        id=str(uuid4()),
         name=request.name,
         email=request.email,
         role_id=request.roleId,
@@ -144,49 +155,41 @@ async def create_user(
 
     # Set password if provided
     if request.password:
-        user.hashed_password = hash_password(request.password)
+        user.hashed_password = await hash_password_async(request.password)
     else:
         # TODO: Generate temporary password and send via email
-        user.hashed_password = hash_password(str(uuid4()))
+        user.hashed_password = await hash_password_async(str(uuid4()))
 
     db.add(user)
-    await db.commit()
+    await _commit_user(db)
     await db.refresh(user)
+    await cache_service.invalidate_list_counts(cache_service.USER_PREFIX)
 
-    user_response = UserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        roleId=user.role_id,
-        status=user.status,
-        lastActive=user.last_active,
-        createdAt=user.created_at,
-        updatedAt=user.updated_at,
-    )
+    user_response = _to_user_response(user)
 
-    return SuccessResponse(
+    envelope = SuccessResponse(
         data=user_response,
         meta={"createdAt": user.created_at.isoformat()},
     )
+    return PydanticResponse(envelope, status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/{user_id}", response_model=SuccessResponse[UserResponse])
+@router.get("/{user_id}", response_model=SuccessResponse[UserResponse], dependencies=[_can_view])
 async def get_user(
     user_id: str,
-    current_user: CurrentUser = Depends(get_current_user),
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> SuccessResponse[UserResponse]:
+) -> Response:
     """
     Get a specific user by ID.
 
     Requires: `users:read` permission
     """
-    # Check permission
-    if not current_user.has_permission("users:read"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to view users",
-        )
+    # Answer a matching If-None-Match from updated_at alone
+    if request.headers.get("if-none-match"):
+        etag = weak_etag(await db.scalar(select(User.updated_at).where(User.id == user_id)))
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
     # Get user
     result = await db.execute(select(User).where(User.id == user_id))
@@ -198,39 +201,24 @@ async def get_user(
             detail="User not found",
         )
 
-    user_response = UserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        roleId=user.role_id,
-        status=user.status,
-        lastActive=user.last_active,
-        createdAt=user.created_at,
-        updatedAt=user.updated_at,
-    )
+    user_response = _to_user_response(user)
 
-    return SuccessResponse(data=user_response)
+    etag = weak_etag(user.updated_at)
+    headers = {"ETag": etag} if etag else None
+    return PydanticResponse(SuccessResponse(data=user_response), headers=headers)
 
 
-@router.put("/{user_id}", response_model=SuccessResponse[UserResponse])
+@router.put("/{user_id}", response_model=SuccessResponse[UserResponse], dependencies=[_can_update])
 async def update_user(
     user_id: str,
     request: UserUpdate,
-    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> SuccessResponse[UserResponse]:
+) -> PydanticResponse:
     """
     Update a user.
 
     Requires: `users:write` permission
     """
-    # Check permission
-    if not current_user.has_permission("users:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to update users",
-        )
-
     # Get user
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
@@ -241,19 +229,6 @@ async def update_user(
             detail="User not found",
         )
 
-    # Check if email is already taken by another user
-    if request.email and request.email != user.email:
-        result = await db.execute(
-            select(User).where(
-                and_(User.email == request.email, User.id != user_id)
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User with this email already exists",
-            )
-
     # Update fields
     if request.name is not None:
         user.name = request.name
@@ -265,27 +240,19 @@ async def update_user(
         user.status = request.status
 
     db.add(user)
-    await db.commit()
+    await _commit_user(db)
     await db.refresh(user)
+    await cache_service.invalidate_list_counts(cache_service.USER_PREFIX)
 
-    user_response = UserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        roleId=user.role_id,
-        status=user.status,
-        lastActive=user.last_active,
-        createdAt=user.created_at,
-        updatedAt=user.updated_at,
-    )
+    user_response = _to_user_response(user)
 
-    return SuccessResponse(data=user_response)
+    return PydanticResponse(SuccessResponse(data=user_response))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: str,
-    current_user: CurrentUser = Depends(get_current_user),
+    current_user: CurrentUser = _can_delete,
     db: AsyncSession = Depends(get_db),
 ) -> None:
     """
@@ -293,13 +260,6 @@ async def delete_user(
 
     Requires: `users:write` permission
     """
-    # Check permission
-    if not current_user.has_permission("users:write"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to delete users",
-        )
-
     # Prevent deleting yourself
     if user_id == current_user.user_id:
         raise HTTPException(
@@ -320,3 +280,4 @@ async def delete_user(
     # Delete user
     await db.delete(user)
     await db.commit()
+    await cache_service.invalidate_list_counts(cache_service.USER_PREFIX)
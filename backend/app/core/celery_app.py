@@ -10,6 +10,7 @@ from __future__ import annotations
 from celery import Celery, Task
 from celery.schedules import crontab
 
+from app.core.celery_serialization import ORJSON_SERIALIZER
 from app.core.config import settings
 
 # Create Celery app instance
@@ -23,7 +24,9 @@ celery_app = Celery(
 celery_app.conf.update(
     # Task configuration
     task_serializer=settings.CELERY_TASK_SERIALIZER,
-    accept_content=["json"],
+    # json stays accepted so messages queued before the switch still run
+    accept_content=[ORJSON_SERIALIZER, "json"],
+    result_accept_content=[ORJSON_SERIALIZER, "json"],
     result_serializer=settings.CELERY_RESULT_SERIALIZER,
     timezone=settings.CELERY_TIMEZONE,
     enable_utc=True,
@@ -33,8 +36,13 @@ celery_app.conf.update(
     task_time_limit=settings.CELERY_TASK_TIME_LIMIT,
     task_soft_time_limit=settings.CELERY_TASK_SOFT_TIME_LIMIT,
 
-    # Worker configuration
-    worker_prefetch_multiplier=4,
+    # Worker configuration: detection tasks are long, so a worker reserves one
+    # task at a time instead of holding extras while others idle. Acking after
+    # the run redelivers tasks whose worker died (Redis' default one-hour
+    # visibility timeout is longer than task_time_limit).
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
     worker_max_tasks_per_child=1000,
 
     # Result backend configuration
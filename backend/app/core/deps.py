@@ -2,9 +2,12 @@
 FastAPI dependencies for authentication and database access.
 """
 
-import json
+import time
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Optional
 
+import orjson
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,45 +23,95 @@ security = HTTPBearer()
 class CurrentUser:
     """Current user information from JWT token."""
 
+    __slots__ = ("user_id", "email", "role_id", "permissions", "_permission_set", "_is_admin")
+
     def __init__(self, user_id: str, email: str, role_id: str, permissions: list[str]):
         """Initialize current user."""
         self.user_id = user_id
         self.email = email
         self.role_id = role_id
         self.permissions = permissions
+        self._permission_set = frozenset(permissions)
+        self._is_admin = "*" in self._permission_set
 
     def has_permission(self, permission: str) -> bool:
         """Check if user has permission."""
-        return "*" in self.permissions or permission in self.permissions
+        return self._is_admin or permission in self._permission_set
 
     def __repr__(self) -> str:
         return f"<CurrentUser user_id={self.user_id} email={self.email}>"
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> CurrentUser:
-    """Get current user from JWT token."""
-    try:
-        token = credentials.credentials
-        payload = verify_token(token)
+# Authenticated users per access token digest: (expires_at, user). Entries
+# live for TOKEN_CACHE_TTL seconds at most and never past the token's exp.
+TOKEN_CACHE_TTL = 60.0
+TOKEN_CACHE_MAXSIZE = 10_000
+_token_cache: dict[bytes, tuple[float, CurrentUser]] = {}
+
+
+def _token_key(token: str) -> bytes:
+    """Digest a token so the cache does not hold raw credentials."""
+    return blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cache_user(key: bytes, user: CurrentUser, token_exp: Optional[float]):
+    """Remember a verified token's user until the TTL or the token's exp, whichever is first."""
+    now = time.monotonic()
+    ttl = TOKEN_CACHE_TTL if token_exp is None else min(TOKEN_CACHE_TTL, token_exp - time.time())
+    if ttl <= 0:
+        return
+
+    if len(_token_cache) >= TOKEN_CACHE_MAXSIZE:
+        for stale in [k for k, (expires_at, _) in _token_cache.items() if expires_at <= now]:
+            del _token_cache[stale]
+        # Still full: drop the oldest entry
+        if len(_token_cache) >= TOKEN_CACHE_MAXSIZE:
+            del _token_cache[next(iter(_token_cache))]
+
+    _token_cache[key] = (now + ttl, user)
 
-        user_id: str = payload.get("sub")
-        email: str = payload.get("email")
-        role_id: str = payload.get("role_id")
-        permissions_str: str = payload.get("permissions", "[]")
 
-        if not user_id:
-            raise AuthenticationError("Invalid token")
+def invalidate_token(token: str):
+    """Forget a token's cached user, e.g. on logout."""
+    _token_cache.pop(_token_key(token), None)
 
-        # Parse permissions (stored as JSON string in token)
+
+def _authenticate(token: str, key: bytes) -> CurrentUser:
+    """Verify a token and build its user."""
+    payload = verify_token(token)
+
+    user_id: str = payload.get("sub")
+    email: str = payload.get("email")
+    role_id: str = payload.get("role_id")
+    permissions: list[str] | str = payload.get("permissions") or []
+
+    if not user_id:
+        raise AuthenticationError("Invalid token")
+
+    # Tokens minted before permissions became a native array carry a JSON string
+    if isinstance(permissions, str):
         try:
-            permissions = json.loads(permissions_str) if isinstance(permissions_str, str) else permissions_str
-        except (json.JSONDecodeError, TypeError):
+            permissions = orjson.loads(permissions)
+        except orjson.JSONDecodeError:
             permissions = []
 
-        return CurrentUser(user_id=user_id, email=email, role_id=role_id, permissions=permissions)
+    user = CurrentUser(user_id=user_id, email=email, role_id=role_id, permissions=permissions)
+    _cache_user(key, user, payload.get("exp"))
+    return user
+
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> CurrentUser:
+    """Get current user from JWT token (cached briefly per token)."""
+    token = credentials.credentials
+    key = _token_key(token)
+    entry = _token_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    try:
+        return _authenticate(token, key)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -79,31 +132,33 @@ async def get_optional_user(
         return None
 
 
-def require_permission(permission: str):
+# Factories are memoized so routes sharing a requirement share one dependency
+# callable, which FastAPI resolves once per request
+@lru_cache(maxsize=256)
+def require_permission(permission: str, detail: str = "Insufficient permissions"):
     """Dependency to require a specific permission."""
+    # Built once per dependency; the denial is identical for every request
+    forbidden = HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
 
     async def permission_checker(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         """Check if user has permission."""
         if not current_user.has_permission(permission):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions",
-            )
+            # Drop the previous raise's traceback so it does not grow on every denial
+            raise forbidden.with_traceback(None)
         return current_user
 
     return permission_checker
 
 
+@lru_cache(maxsize=256)
 def require_role(role_id: str):
     """Dependency to require a specific role."""
+    forbidden = HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
 
     async def role_checker(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         """Check if user has role."""
         if current_user.role_id != role_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions",
-            )
+            raise forbidden.with_traceback(None)
         return current_user
 
     return role_checker
@@ -112,6 +167,7 @@ def require_role(role_id: str):
 __all__ = [
     "get_current_user",
     "get_optional_user",
+    "invalidate_token",
     "require_permission",
     "require_role",
     "CurrentUser",
@@ -1,29 +1,122 @@
 """
 Logging configuration for the application.
 
-Sets up structured logging with optional JSON output.
+Sets up structured logging with optional JSON output. Handlers run on a
+background QueueListener thread; loggers only enqueue records.
 """
 
-import json
+import atexit
+import copy
 import logging
 import logging.config
+import queue
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+import orjson
+
 from app.core.config import settings
 
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    JSON log formatter backed by orjson.
+
+    Emits asctime, name, levelname and message, then any extra= fields and
+    the formatted exception, matching the keys of the previous
+    python-json-logger output.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize a record to a single JSON line."""
+        payload = {
+            "asctime": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "levelname": record.levelname,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        # Records from the log queue carry the traceback pre-rendered in exc_text
+        exc_text = record.exc_text or (record.exc_info and self.formatException(record.exc_info))
+        if exc_text:
+            payload["exc_info"] = exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+
+        return orjson.dumps(payload, default=str).decode()
+
+
+class _LogQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the target handlers.
+
+    The stock prepare() folds the traceback into the message; this keeps it
+    in exc_text so the JSON formatter can still emit it as its own field.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the message and traceback so the record can cross threads."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: QueueListener | None = None
+
+# Set once logging is configured; later setup_logging calls are no-ops
+_configured = False
+
 
 def setup_logging() -> None:
-    """Configure logging for the application."""
+    """Configure logging for the application (once per process)."""
+    global _configured
+    if _configured:
+        return
+    _configured = True
 
     # Create logs directory if it doesn't exist
     logs_dir = Path(settings.LOG_FILE).parent
-    logs_dir.mkdir(exist_ok=True)
+    logs_dir.mkdir(parents=True, exist_ok=True)
 
     if settings.LOG_FORMAT == "json":
         _setup_json_logging()
     else:
         _setup_text_logging()
 
+    _start_queue_listener(("", "uvicorn.access", "sqlalchemy"))
+
+
+def _start_queue_listener(logger_names: tuple[str, ...]) -> None:
+    """Move the configured loggers' handlers behind a queue drained on a background thread."""
+    global _listener
+
+    loggers = [logging.getLogger(name) for name in logger_names]
+    loggers = [logger for logger in loggers if logger.handlers]
+    handlers = list(dict.fromkeys(handler for logger in loggers for handler in logger.handlers))
+
+    queue_handler = _LogQueueHandler(_log_queue)
+    for logger in loggers:
+        logger.handlers = [queue_handler]
+
+    _listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Flush queued records on shutdown
+    atexit.register(_listener.stop)
+
 
 def _setup_text_logging() -> None:
     """Set up text-based logging."""
@@ -85,8 +178,7 @@ def _setup_json_logging() -> None:
         "disable_existing_loggers": False,
         "formatters": {
             "json": {
-                "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
-                "fmt": "%(asctime)s %(name)s %(levelname)s %(message)s",
+                "()": OrjsonFormatter,
             },
         },
         "handlers": {
@@ -118,13 +210,10 @@ def _setup_json_logging() -> None:
         },
     }
 
-    try:
-        logging.config.dictConfig(config)
-    except ImportError:
-        # Fallback to text logging if pythonjsonlogger is not installed
-        _setup_text_logging()
+    logging.config.dictConfig(config)
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
-    """Get a logger instance."""
+    """Get a logger instance (memoized; loggers are singletons per name)."""
     return logging.getLogger(name)
@@ -1,11 +1,16 @@
 """Redis client and caching service."""
 
+import hashlib
 import json
 import logging
+import random
+from datetime import date, datetime
 from typing import Any, Optional
 
+import orjson
 import redis
 from redis import ConnectionPool, Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from app.core.config import settings
 
@@ -17,6 +22,7 @@ class RedisClient:
 
     _instance: Optional["RedisClient"] = None
     _redis: Optional[Redis] = None
+    _async_redis: Optional[AsyncRedis] = None
 
     def __new__(cls) -> "RedisClient":
         """Singleton pattern for Redis client."""
@@ -51,6 +57,24 @@ class RedisClient:
             self._initialize()
         return self._redis
 
+    @property
+    def async_client(self) -> AsyncRedis:
+        """Get asyncio Redis client for use on the event loop (connects lazily)."""
+        if self._async_redis is None:
+            self._async_redis = AsyncRedis.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+            )
+        return self._async_redis
+
+    async def close(self) -> None:
+        """Close the asyncio Redis client."""
+        if self._async_redis is not None:
+            await self._async_redis.aclose()
+            self._async_redis = None
+
     def is_connected(self) -> bool:
         """Check if Redis is connected."""
         try:
@@ -293,13 +317,22 @@ class CacheService:
     DETECTION_PREFIX = "detection:"
     CAMERA_PREFIX = "camera:"
     USER_PREFIX = "user:"
+    PERSON_PREFIX = "person:"
     SESSION_PREFIX = "session:"
+    ATTENDANCE_PREFIX = "attendance:"
 
     # Cache TTLs
     LIVE_DETECTIONS_TTL = 3  # 3 seconds for live data
     CAMERA_STATE_TTL = 60  # 1 minute
-    STATISTICS_TTL = 300  # 5 minutes
+    STATISTICS_TTL = 60  # 1 minute
+    DETECTION_SUMMARY_TTL = 120  # 2 minutes
+    QUEUE_STATS_TTL = 10  # 10 seconds
+    PROVIDER_CONFIG_TTL = 300  # 5 minutes, also invalidated on config changes
     SESSION_TTL = 86400  # 24 hours
+    PERSON_STATUS_TTL = 30  # 30 seconds, also invalidated on check-in/out
+    DAILY_REPORT_TTL = 60  # 1 minute for today, also invalidated on check-in/out
+    DAILY_REPORT_PAST_TTL = 86400  # 24 hours for past days
+    LIST_COUNT_TTL = 60  # 1 minute, also invalidated on create/update/delete
 
     def __init__(self):
         """Initialize cache service."""
@@ -312,7 +345,7 @@ class CacheService:
             key,
             {
                 "detections": detections,
-                "timestamp": str(__import__("datetime").datetime.utcnow()),
+                "timestamp": str(datetime.utcnow()),
                 "count": len(detections),
             },
             ttl=self.LIVE_DETECTIONS_TTL,
@@ -323,20 +356,72 @@ class CacheService:
         key = f"{self.DETECTION_PREFIX}live:{camera_id}"
         return await self.redis.get(key)
 
+    @staticmethod
+    def _live_json_key(camera_id: str, params: tuple) -> str:
+        """Build the key for one camera's live detections page under a filter/page set."""
+        digest = hashlib.blake2b(repr(params).encode(), digest_size=8).hexdigest()
+        return f"live_json:{camera_id}:{digest}"
+
+    async def cache_live_detections_json(self, camera_id: str, params: tuple, page: dict) -> bool:
+        """Cache a database-built live detections page for its filter/page set."""
+        key = f"{self.DETECTION_PREFIX}{self._live_json_key(camera_id, params)}"
+        return await self._set_json(key, page, self.LIVE_DETECTIONS_TTL)
+
+    async def get_cached_live_detections_json(self, camera_id: str, params: tuple) -> Optional[dict]:
+        """Get a cached live detections page for its filter/page set."""
+        return await self._get_json(f"{self.DETECTION_PREFIX}{self._live_json_key(camera_id, params)}")
+
     async def clear_live_detections(self, camera_id: str) -> bool:
         """Clear live detections cache for a camera."""
         key = f"{self.DETECTION_PREFIX}live:{camera_id}"
         return await self.redis.delete(key)
 
+    @staticmethod
+    def _jittered(ttl: int) -> int:
+        """Spread a TTL by +/-10% so keys cached together do not all expire together."""
+        return max(1, round(ttl * random.uniform(0.9, 1.1)))
+
     async def cache_detection_statistics(self, stats_key: str, stats: dict) -> bool:
         """Cache detection statistics."""
         key = f"{self.DETECTION_PREFIX}stats:{stats_key}"
-        return await self.redis.set(key, stats, ttl=self.STATISTICS_TTL)
+        return await self._set_json(key, stats, self._jittered(self.STATISTICS_TTL))
 
     async def get_cached_statistics(self, stats_key: str) -> Optional[dict]:
         """Get cached detection statistics."""
         key = f"{self.DETECTION_PREFIX}stats:{stats_key}"
-        return await self.redis.get(key)
+        return await self._get_json(key)
+
+    async def cache_detection_summary(self, summary: dict) -> bool:
+        """Cache the detection system summary."""
+        key = f"{self.DETECTION_PREFIX}summary"
+        return await self._set_json(key, summary, self._jittered(self.DETECTION_SUMMARY_TTL))
+
+    async def get_cached_detection_summary(self) -> Optional[dict]:
+        """Get cached detection system summary."""
+        return await self._get_json(f"{self.DETECTION_PREFIX}summary")
+
+    async def cache_queue_stats(self, stats: dict) -> bool:
+        """Cache detection processing queue statistics."""
+        key = f"{self.DETECTION_PREFIX}queue_stats"
+        return await self._set_json(key, stats, self._jittered(self.QUEUE_STATS_TTL))
+
+    async def get_cached_queue_stats(self) -> Optional[dict]:
+        """Get cached detection processing queue statistics."""
+        return await self._get_json(f"{self.DETECTION_PREFIX}queue_stats")
+
+    async def cache_provider_config(self, config: dict) -> bool:
+        """Cache the active detection provider config response."""
+        key = f"{self.DETECTION_PREFIX}provider_config"
+        return await self._set_json(key, config, self._jittered(self.PROVIDER_CONFIG_TTL))
+
+    async def get_cached_provider_config(self) -> Optional[dict]:
+        """Get cached active detection provider config response."""
+        return await self._get_json(f"{self.DETECTION_PREFIX}provider_config")
+
+    async def invalidate_provider_config(self) -> bool:
+        """Drop the cached provider config and the summary that embeds it."""
+        await self._delete(f"{self.DETECTION_PREFIX}summary")
+        return await self._delete(f"{self.DETECTION_PREFIX}provider_config")
 
     async def cache_camera_state(self, camera_id: str, state: dict) -> bool:
         """Cache camera state."""
@@ -358,13 +443,113 @@ class CacheService:
         key = f"{self.SESSION_PREFIX}{session_id}"
         return await self.redis.get(key)
 
+    # Attendance and detection dashboard keys are read on hot paths (WebSocket
+    # connects, dashboard polling), so they go through the asyncio client
+    # rather than blocking the event loop on the sync one.
+
+    async def _get_json(self, key: str) -> Optional[Any]:
+        """Get a JSON value via the asyncio client."""
+        try:
+            value = await self.redis.async_client.get(key)
+            return orjson.loads(value) if value is not None else None
+        except Exception as e:
+            logger.error(f"Error getting key {key} from Redis: {e}")
+            return None
+
+    async def _set_json(self, key: str, value: Any, ttl: int) -> bool:
+        """Set a JSON value with TTL via the asyncio client."""
+        try:
+            await self.redis.async_client.set(key, orjson.dumps(value), ex=ttl)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting key {key} in Redis: {e}")
+            return False
+
+    async def _delete(self, key: str) -> bool:
+        """Delete a key via the asyncio client."""
+        try:
+            return bool(await self.redis.async_client.delete(key))
+        except Exception as e:
+            logger.error(f"Error deleting key {key} from Redis: {e}")
+            return False
+
+    async def cache_person_status(self, person_id: str, status: dict) -> bool:
+        """Cache current check-in status for a person (JSON-safe values only)."""
+        key = f"{self.ATTENDANCE_PREFIX}status:{person_id}"
+        return await self._set_json(key, status, self.PERSON_STATUS_TTL)
+
+    async def get_cached_person_status(self, person_id: str) -> Optional[dict]:
+        """Get cached check-in status for a person."""
+        key = f"{self.ATTENDANCE_PREFIX}status:{person_id}"
+        return await self._get_json(key)
+
+    async def invalidate_person_status(self, person_id: str) -> bool:
+        """Drop cached check-in status for a person."""
+        key = f"{self.ATTENDANCE_PREFIX}status:{person_id}"
+        return await self._delete(key)
+
+    async def cache_daily_report(self, report_date: date, report: dict) -> bool:
+        """Cache daily attendance report; past days change rarely and live longer."""
+        key = f"{self.ATTENDANCE_PREFIX}daily:{report_date.isoformat()}"
+        ttl = self.DAILY_REPORT_TTL if report_date >= datetime.utcnow().date() else self.DAILY_REPORT_PAST_TTL
+        return await self._set_json(key, report, ttl)
+
+    async def get_cached_daily_report(self, report_date: date) -> Optional[dict]:
+        """Get cached daily attendance report."""
+        key = f"{self.ATTENDANCE_PREFIX}daily:{report_date.isoformat()}"
+        return await self._get_json(key)
+
+    async def invalidate_daily_report(self, report_date: date) -> bool:
+        """Drop cached daily attendance report."""
+        key = f"{self.ATTENDANCE_PREFIX}daily:{report_date.isoformat()}"
+        return await self._delete(key)
+
+    # List totals are cached per filter set, without page/offset, so every page
+    # of one listing shares a single COUNT. Keys embed a per-prefix version that
+    # writes bump, which retires every filter set without a KEYS scan.
+
+    async def _list_count_key(self, prefix: str, filters: tuple) -> str:
+        """Build the versioned count key for a filter set."""
+        version = await self.redis.async_client.get(f"{prefix}count:ver") or "0"
+        digest = hashlib.blake2b(repr(filters).encode(), digest_size=8).hexdigest()
+        return f"{prefix}count:{version}:{digest}"
+
+    async def get_cached_list_count(self, prefix: str, filters: tuple) -> Optional[int]:
+        """Get the cached total for a filtered listing."""
+        try:
+            key = await self._list_count_key(prefix, filters)
+        except Exception as e:
+            logger.error(f"Error getting count version for {prefix} from Redis: {e}")
+            return None
+        return await self._get_json(key)
+
+    async def cache_list_count(self, prefix: str, filters: tuple, count: int) -> bool:
+        """Cache the total for a filtered listing."""
+        try:
+            key = await self._list_count_key(prefix, filters)
+        except Exception as e:
+            logger.error(f"Error getting count version for {prefix} from Redis: {e}")
+            return False
+        return await self._set_json(key, count, self.LIST_COUNT_TTL)
+
+    async def invalidate_list_counts(self, prefix: str) -> bool:
+        """Retire every cached total under a prefix by bumping its version."""
+        try:
+            await self.redis.async_client.incr(f"{prefix}count:ver")
+            return True
+        except Exception as e:
+            logger.error(f"Error bumping count version for {prefix} in Redis: {e}")
+            return False
+
     async def invalidate_all_caches(self) -> int:
         """Clear all application caches."""
         count = 0
         count += await self.redis.clear_pattern(f"{self.DETECTION_PREFIX}*")
         count += await self.redis.clear_pattern(f"{self.CAMERA_PREFIX}*")
         count += await self.redis.clear_pattern(f"{self.USER_PREFIX}*")
+        count += await self.redis.clear_pattern(f"{self.PERSON_PREFIX}*")
         count += await self.redis.clear_pattern(f"{self.SESSION_PREFIX}*")
+        count += await self.redis.clear_pattern(f"{self.ATTENDANCE_PREFIX}*")
         logger.info(f"Cleared {count} cache keys")
         return count
 
@@ -0,0 +1,72 @@
+"""
+Response classes shared by the API routers.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class PydanticResponse(Response):
+    """
+    JSON response rendered straight from a Pydantic model.
+
+    The model is serialized once by ``model_dump_json``. Returning it from a
+    handler skips FastAPI's response_model re-validation and jsonable_encoder
+    pass; keep the route's response_model for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    # Pages with at least this many items are serialized on a worker thread
+    OFFLOAD_MIN_ITEMS = 50
+
+    def render(self, content: BaseModel | bytes) -> bytes:
+        """Serialize the model to JSON bytes (already-rendered bytes pass through)."""
+        if isinstance(content, bytes):
+            return content
+        return content.model_dump_json(by_alias=True).encode()
+
+    @classmethod
+    async def create(cls, content: BaseModel, items: int = 0, **kwargs: Any) -> "PydanticResponse":
+        """
+        Build the response, serializing large list bodies off the event loop.
+
+        ``items`` is the number of records in the body; below
+        OFFLOAD_MIN_ITEMS the thread hop costs more than the serialization.
+        """
+        if items < cls.OFFLOAD_MIN_ITEMS:
+            return cls(content, **kwargs)
+        body = await asyncio.to_thread(content.model_dump_json, by_alias=True)
+        return cls(body.encode(), **kwargs)
+
+
+def weak_etag(updated_at: Optional[datetime], *parts: Any) -> Optional[str]:
+    """Build a weak ETag from a row's last-modified time (plus any extra parts)."""
+    if updated_at is None:
+        return None
+    tag = "-".join(str(p) for p in (*parts, updated_at.timestamp()))
+    return f'W/"{tag}"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Check If-None-Match against an ETag using weak comparison."""
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+__all__ = ["PydanticResponse", "etag_matches", "not_modified", "weak_etag"]
@@ -2,20 +2,36 @@
 Security utilities for JWT tokens and password hashing.
 """
 
+import asyncio
+import os
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Optional
+from uuid import uuid4
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context: new hashes use Argon2id, existing bcrypt hashes
+# still verify and are flagged for re-hashing on the next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+
+
+# Bounds concurrent password hashing to one Argon2 computation per CPU; each
+# needs ~19 MiB and a core, and extra concurrency only queues in the executor
+_hashing_slots = asyncio.Semaphore(os.cpu_count() or 1)
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+    """Hash a password using Argon2id."""
     return pwd_context.hash(password)
 
 
@@ -24,6 +40,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread, keeping the event loop free."""
+    async with _hashing_slots:
+        return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password in a worker thread, keeping the event loop free.
+
+    Returns (verified, new_hash); new_hash is set when the stored hash uses a
+    deprecated scheme or parameters and should be replaced.
+    """
+    async with _hashing_slots:
+        return await asyncio.to_thread(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -38,10 +71,16 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
     return encoded_jwt
 
 
+def new_token_id() -> str:
+    """Random JWT ID identifying a refresh token server-side."""
+    return uuid4().hex
+
+
 def create_refresh_token(data: dict[str, Any]) -> str:
-    """Create a JWT refresh token."""
+    """Create a JWT refresh token, with a random jti unless one is given."""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.setdefault("jti", new_token_id())
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
@@ -2,34 +2,34 @@
 Database session management and engine configuration.
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 
-# Create async engine
+# Create async engine; one pooled engine per process, shared by every request
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.SQL_ECHO,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
     future=True,
 )
 
 # Create async session factory
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
-    autocommit=False,
     autoflush=False,
 )
 
 
 async def get_db() -> AsyncSession:
-    """Get database session."""
+    """Get database session (returned to the pool when the request finishes)."""
     async with AsyncSessionLocal() as session:
         yield session
 
@@ -39,6 +39,9 @@ async def init_db() -> None:
     from app.db.base import Base
 
     async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Needed by the gin_trgm_ops search indexes on users and persons
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -7,11 +7,14 @@ from datetime import datetime
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.api.v1.api import api_router
+from app.api.v1.attendance_ws import attendance_manager
+from app.api.v1.auth import start_session_purge_loop, stop_session_purge_loop
 from app.core.config import settings
 from app.core.logging import get_logger, setup_logging
+from app.core.redis import redis_client
 from app.schemas.common import ErrorResponse, HealthStatus
 
 # Setup logging
@@ -29,6 +32,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        default_response_class=ORJSONResponse,
     )
 
     # =========================================================================
@@ -118,6 +122,8 @@ def create_app() -> FastAPI:
         logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
         logger.info(f"Environment: {settings.ENVIRONMENT}")
         logger.info(f"Debug mode: {settings.DEBUG}")
+        attendance_manager.start_ping_loop()
+        start_session_purge_loop()
         # TODO: Initialize database connection
         # TODO: Initialize Redis connection
         # TODO: Initialize MinIO connection
@@ -126,8 +132,10 @@ def create_app() -> FastAPI:
     async def shutdown_event():
         """Run on application shutdown."""
         logger.info(f"Shutting down {settings.APP_NAME}")
+        await attendance_manager.stop_ping_loop()
+        await stop_session_purge_loop()
         # TODO: Close database connection
-        # TODO: Close Redis connection
+        await redis_client.close()
         # TODO: Close MinIO connection
 
     return app
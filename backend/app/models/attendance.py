@@ -14,6 +14,7 @@ from sqlalchemy import (
     String,
     Text,
     Time,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -100,12 +101,34 @@ class Attendance(Base, TimestampMixin):
     person = relationship("Person", back_populates="attendance_records")
     session = relationship("AttendanceSession", back_populates="attendance_records")
 
+    @property
+    def person_name(self) -> Optional[str]:
+        """Person display name, if the person relationship was loaded with the row."""
+        person = self.__dict__.get("person")
+        return f"{person.first_name} {person.last_name}" if person else None
+
     # Indexes
     __table_args__ = (
         Index("ix_attendance_person_id", "person_id"),
-        Index("ix_attendance_date", "attendance_date"),
-        Index("ix_attendance_person_date", "person_id", "attendance_date"),
+        # List pages order by (attendance_date desc, id desc); id makes the
+        # order total so keyset pages can seek, and a backward index scan
+        # serves the DESC order without a sort step.
+        Index("ix_attendance_date", "attendance_date", "id"),
+        Index(
+            "ix_attendance_person_date",
+            "person_id",
+            "attendance_date",
+            "id",
+            postgresql_include=["status", "duration_minutes"],
+        ),
         Index("ix_attendance_status", "status"),
+        # Absence/lateness reports filter on these two statuses by date
+        Index(
+            "ix_attendance_status_date",
+            "status",
+            "attendance_date",
+            postgresql_where=text("status IN ('absent', 'late')"),
+        ),
         Index("ix_attendance_is_manual", "is_manual"),
     )
 
@@ -100,6 +100,17 @@ class Person(Base, TimestampMixin):
         Index("ix_person_person_type", "person_type"),
         Index("ix_person_department", "department"),
         Index("ix_person_created_at", "created_at"),
+        # Trigram indexes serve the search's ILIKE '%q%' terms, which a btree
+        # cannot; Postgres only (init_db enables pg_trgm)
+        *(
+            Index(
+                f"ix_person_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("first_name", "last_name", "email", "id_number")
+        ),
     )
 
 
@@ -3,12 +3,21 @@ User, Role, and authentication models.
 """
 
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 from uuid import uuid4
 
+import orjson
 from sqlalchemy import Column, DateTime, String, Text, UUID, Boolean, Index, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base import Base, TimestampMixin
+from app.db.base import Base, TimestampMixin, new_id
+
+
+@lru_cache(maxsize=64)
+def parse_permissions(raw: str) -> tuple[str, ...]:
+    """Parse a role's JSON permissions column, memoized on the raw string."""
+    return tuple(orjson.loads(raw)) if raw else ()
 
 
 class Role(Base):
@@ -25,6 +34,11 @@ class Role(Base):
         DateTime(timezone=True), default=func.now(), onupdate=func.now()
     )
 
+    @property
+    def permission_list(self) -> list[str]:
+        """Decoded permissions; the JSON is parsed once per distinct value, not per access."""
+        return list(parse_permissions(self.permissions))
+
     def __repr__(self) -> str:
         return f"<Role id={self.id} name={self.name}>"
 
@@ -34,7 +48,7 @@ class User(Base, TimestampMixin):
 
     __tablename__ = "users"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     email: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -43,10 +57,28 @@ class User(Base, TimestampMixin):
     last_active: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     version: Mapped[int] = mapped_column(default=1)
 
+    # role_id has no FK constraint, so the join condition is spelled out;
+    # load explicitly with joinedload(User.role) where the role is needed
+    role: Mapped[Optional[Role]] = relationship(
+        "Role", primaryjoin="foreign(User.role_id) == Role.id", lazy="raise", viewonly=True
+    )
+
     __table_args__ = (
         Index("idx_users_email", "email"),
         Index("idx_users_role_id", "role_id"),
-        Index("idx_users_status", "status"),
+        # Serves status-only filters too, as the leftmost column
+        Index("idx_users_status_role_id", "status", "role_id"),
+        # Trigram indexes serve the list search's ILIKE '%q%' on name/email;
+        # Postgres only (init_db enables pg_trgm)
+        *(
+            Index(
+                f"idx_users_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("name", "email")
+        ),
     )
 
     def __repr__(self) -> str:
@@ -58,9 +90,9 @@ class UserSession(Base):
 
     __tablename__ = "user_sessions"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     user_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
-    refresh_token: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)
+    jti: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)  # refresh token's JWT ID
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
 
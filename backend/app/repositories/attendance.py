@@ -1,12 +1,18 @@
 """Attendance repositories for database operations."""
 
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import Select, and_, func, lambda_stmt, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.models.attendance import Attendance, AttendanceSession
+from app.models.person import Person
+
+# Batch-load the person behind a page of rows (one SELECT ... IN) for display
+# names, without cascading into the person's face encodings and images.
+_with_person = selectinload(Attendance.person).raiseload("*")
 
 
 class AttendanceRepository:
@@ -51,26 +57,139 @@ class AttendanceRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_person_name_and_attendance(
+        self,
+        person_id: str,
+        attendance_date: datetime,
+    ) -> Optional[tuple[str, Optional[Attendance]]]:
+        """
+        Get a person's display name and their attendance on a date in one query.
+
+        Returns None if the person does not exist.
+        """
+        date_start = attendance_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        date_end = date_start.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+        result = await self.db.execute(
+            select(Person.first_name, Person.last_name, Attendance)
+            .outerjoin(
+                Attendance,
+                and_(
+                    Attendance.person_id == Person.id,
+                    Attendance.attendance_date >= date_start,
+                    Attendance.attendance_date <= date_end,
+                ),
+            )
+            .where(Person.id == person_id)
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return f"{row.first_name} {row.last_name}", row.Attendance
+
+    @staticmethod
+    def _apply_filters(
+        query: Select,
+        person_id: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        status: Optional[str] = None,
+    ) -> Select:
+        """Apply the shared list filters (date bounds inclusive)."""
+        if person_id:
+            query = query.where(Attendance.person_id == person_id)
+        if from_date:
+            query = query.where(Attendance.attendance_date >= from_date)
+        if to_date:
+            query = query.where(Attendance.attendance_date <= to_date)
+        if status:
+            query = query.where(Attendance.status == status)
+        return query
+
     async def get_by_person(
         self,
         person_id: str,
         from_date: Optional[datetime] = None,
         to_date: Optional[datetime] = None,
+        status: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
     ) -> list[Attendance]:
-        """Get attendance for a person."""
-        query = select(Attendance).where(Attendance.person_id == person_id)
-
+        """
+        Get attendance for a person.
+
+        Built as a lambda statement: this is the per-person list hot path, and
+        SQLAlchemy caches the constructed statement per code location, so only
+        the bound values change between calls.
+        """
+        query = lambda_stmt(
+            lambda: select(Attendance).options(_with_person).where(Attendance.person_id == person_id)
+        )
         if from_date:
-            query = query.where(Attendance.attendance_date >= from_date)
+            query += lambda s: s.where(Attendance.attendance_date >= from_date)
         if to_date:
-            query = query.where(Attendance.attendance_date <= to_date)
+            query += lambda s: s.where(Attendance.attendance_date <= to_date)
+        if status:
+            query += lambda s: s.where(Attendance.status == status)
+        query += lambda s: (
+            s.order_by(Attendance.attendance_date.desc(), Attendance.id.desc()).offset(offset).limit(limit)
+        )
 
-        query = query.order_by(Attendance.attendance_date.desc()).offset(offset).limit(limit)
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def count_by_person(
+        self,
+        person_id: str,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """Count attendance for a person."""
+        query = self._apply_filters(select(func.count(Attendance.id)), person_id, from_date, to_date, status)
+        result = await self.db.execute(query)
+        return result.scalar() or 0
+
+    async def get_page_after(
+        self,
+        after: Optional[tuple[datetime, str]],
+        limit: int,
+        person_id: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        status: Optional[str] = None,
+    ) -> list[Attendance]:
+        """Get attendance ordered by (attendance_date, id) desc, seeking past the given key."""
+        query = self._apply_filters(select(Attendance).options(_with_person), person_id, from_date, to_date, status)
+        if after:
+            query = query.where(tuple_(Attendance.attendance_date, Attendance.id) < tuple_(*after))
+
+        query = query.order_by(Attendance.attendance_date.desc(), Attendance.id.desc()).limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def stream_by_date_range(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        chunk_size: int = 200,
+    ) -> AsyncIterator[Attendance]:
+        """Stream all attendance in date range through a server-side cursor, chunk_size rows at a time."""
+        result = await self.db.stream_scalars(
+            select(Attendance)
+            .where(
+                and_(
+                    Attendance.attendance_date >= from_date,
+                    Attendance.attendance_date < to_date,
+                )
+            )
+            .order_by(Attendance.attendance_date, Attendance.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for attendance in result:
+            yield attendance
+
     async def get_by_date_range(
         self,
         from_date: datetime,
@@ -91,6 +210,35 @@ class AttendanceRepository:
         )
         return result.scalars().all()
 
+    async def get_in_range(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[Attendance]:
+        """Get a page of attendance in date range (both bounds inclusive)."""
+        query = self._apply_filters(select(Attendance).options(_with_person), None, from_date, to_date, status)
+        query = (
+            query.order_by(Attendance.attendance_date.desc(), Attendance.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def count_in_range(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        status: Optional[str] = None,
+    ) -> int:
+        """Count attendance in date range (both bounds inclusive)."""
+        query = self._apply_filters(select(func.count(Attendance.id)), None, from_date, to_date, status)
+        result = await self.db.execute(query)
+        return result.scalar() or 0
+
     async def get_by_status(
         self,
         status: str,
@@ -130,6 +278,26 @@ class AttendanceRepository:
         result = await self.db.execute(query)
         return result.scalar() or 0
 
+    async def get_status_totals(
+        self,
+        person_id: Optional[str],
+        from_date: datetime,
+        to_date: datetime,
+    ) -> dict[str, tuple[int, int]]:
+        """Get per-status record count and total duration (for one person, or everyone) in one aggregate query."""
+        query = self._apply_filters(
+            select(
+                Attendance.status,
+                func.count(Attendance.id),
+                func.coalesce(func.sum(Attendance.duration_minutes), 0),
+            ),
+            person_id,
+            from_date,
+            to_date,
+        ).group_by(Attendance.status)
+        result = await self.db.execute(query)
+        return {row[0]: (row[1], row[2]) for row in result.all()}
+
     async def update(self, attendance_id: str, **kwargs) -> Optional[Attendance]:
         """Update attendance record."""
         attendance = await self.get_by_id(attendance_id)
@@ -1,13 +1,18 @@
 """Camera repository for database operations."""
 
-from typing import Optional
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.camera import Camera, CameraGroup, CameraHealth, CameraSnapshot
 
 
+# Bulk inserts larger than this go through PostgreSQL COPY
+COPY_THRESHOLD = 100
+
+
 class CameraGroupRepository:
     """Repository for camera group operations."""
 
@@ -86,6 +91,46 @@ class CameraRepository:
         await self.db.refresh(camera)
         return camera
 
+    async def bulk_create(self, rows: list[dict]) -> int:
+        """
+        Insert many cameras in one transaction.
+
+        Each row maps column names to values and must include the id. On
+        PostgreSQL, batches above COPY_THRESHOLD are sent with COPY; smaller
+        batches and other databases go through add_all.
+        """
+        if not rows:
+            return 0
+
+        if len(rows) > COPY_THRESHOLD and self.db.bind.dialect.name == "postgresql":
+            await self._copy_rows(rows)
+        else:
+            self.db.add_all([Camera(**row) for row in rows])
+        await self.db.commit()
+        return len(rows)
+
+    async def _copy_rows(self, rows: list[dict]) -> None:
+        """COPY rows into the cameras table, filling in column defaults the ORM would apply."""
+        columns = Camera.__table__.columns
+        now = datetime.now(timezone.utc)
+        defaults = {
+            column.name: column.default.arg
+            for column in columns
+            if column.default is not None and column.default.is_scalar
+        }
+        defaults.update(created_at=now, updated_at=now)
+
+        records = [
+            tuple(row[c.name] if row.get(c.name) is not None else defaults.get(c.name) for c in columns)
+            for row in rows
+        ]
+
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Camera.__tablename__, records=records, columns=[c.name for c in columns]
+        )
+
     async def get_by_id(self, camera_id: str) -> Optional[Camera]:
         """Get camera by ID."""
         result = await self.db.execute(select(Camera).where(Camera.id == camera_id))
@@ -96,6 +141,17 @@ class CameraRepository:
         result = await self.db.execute(select(Camera).where(Camera.rtsp_url == rtsp_url))
         return result.scalar_one_or_none()
 
+    async def get_existing_rtsp_urls(self, rtsp_urls: list[str]) -> set[str]:
+        """Return which of the given RTSP URLs already belong to a camera."""
+        existing = set()
+        # Chunked to stay well under the driver's bind-parameter limit
+        for start in range(0, len(rtsp_urls), 1000):
+            result = await self.db.execute(
+                select(Camera.rtsp_url).where(Camera.rtsp_url.in_(rtsp_urls[start : start + 1000]))
+            )
+            existing.update(result.scalars().all())
+        return existing
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> list[Camera]:
         """Get all cameras."""
         result = await self.db.execute(
@@ -110,20 +166,31 @@ class CameraRepository:
         )
         return result.scalars().all()
 
-    async def get_by_group(self, group_id: str) -> list[Camera]:
-        """Get all cameras in a group."""
-        result = await self.db.execute(
-            select(Camera).where(Camera.group_id == group_id).order_by(Camera.name)
-        )
+    async def get_by_group(self, group_id: str, skip: int = 0, limit: Optional[int] = None) -> list[Camera]:
+        """Get cameras in a group, optionally paged."""
+        query = select(Camera).where(Camera.group_id == group_id).order_by(Camera.name, Camera.id).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
         return result.scalars().all()
 
-    async def get_by_status(self, status: str) -> list[Camera]:
-        """Get cameras by status."""
-        result = await self.db.execute(
-            select(Camera).where(Camera.status == status).order_by(Camera.created_at.desc())
-        )
+    async def get_by_status(self, status: str, skip: int = 0, limit: Optional[int] = None) -> list[Camera]:
+        """Get cameras by status, optionally paged."""
+        query = select(Camera).where(Camera.status == status).order_by(Camera.created_at.desc()).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def stream_all(self, group_id: Optional[str] = None, chunk_size: int = 200) -> AsyncIterator[Camera]:
+        """Stream every camera, optionally in one group, through a server-side cursor."""
+        query = select(Camera).order_by(Camera.name, Camera.id)
+        if group_id:
+            query = query.where(Camera.group_id == group_id)
+        result = await self.db.stream_scalars(query.execution_options(yield_per=chunk_size))
+        async for camera in result:
+            yield camera
+
     async def get_with_detection_enabled(self) -> list[Camera]:
         """Get cameras with detection enabled."""
         result = await self.db.execute(
@@ -133,18 +200,39 @@ class CameraRepository:
 
     async def count_all(self) -> int:
         """Count total cameras."""
-        result = await self.db.execute(select(Camera))
-        return len(result.scalars().all())
+        result = await self.db.execute(select(func.count(Camera.id)))
+        return result.scalar() or 0
 
     async def count_active(self) -> int:
         """Count active cameras."""
-        result = await self.db.execute(select(Camera).where(Camera.is_active == True))
-        return len(result.scalars().all())
+        result = await self.db.execute(select(func.count(Camera.id)).where(Camera.is_active == True))
+        return result.scalar() or 0
+
+    async def count_by_group(self, group_id: str) -> int:
+        """Count cameras in a group."""
+        result = await self.db.execute(select(func.count(Camera.id)).where(Camera.group_id == group_id))
+        return result.scalar() or 0
 
     async def count_by_status(self, status: str) -> int:
         """Count cameras by status."""
-        result = await self.db.execute(select(Camera).where(Camera.status == status))
-        return len(result.scalars().all())
+        result = await self.db.execute(select(func.count(Camera.id)).where(Camera.status == status))
+        return result.scalar() or 0
+
+    async def get_summary_counts(self) -> dict[str, int]:
+        """Count cameras per summary dimension, and camera groups, in one query."""
+        result = await self.db.execute(
+            select(
+                func.count(Camera.id).label("total"),
+                func.count(Camera.id).filter(Camera.is_active == True).label("active"),
+                func.count(Camera.id).filter(Camera.status == "error").label("offline"),
+                func.count(Camera.id).filter(Camera.enable_recording == True).label("recording"),
+                func.count(Camera.id)
+                .filter(and_(Camera.is_active == True, Camera.enable_detection == True))
+                .label("detection_enabled"),
+                select(func.count(CameraGroup.id)).scalar_subquery().label("groups"),
+            )
+        )
+        return dict(result.one()._mapping)
 
     async def update(self, camera_id: str, **kwargs) -> Optional[Camera]:
         """Update camera."""
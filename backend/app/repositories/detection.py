@@ -1,9 +1,10 @@
 """Detection repository for database operations."""
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import and_, select
+from sqlalchemy import String, and_, case, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.detection import (
@@ -14,6 +15,50 @@ from app.models.detection import (
 )
 
 
+def _detection_json(page, postgres: bool):
+    """Build the JSON object for one detection row, in DetectionResponse shape."""
+    if postgres:
+        build = func.json_build_object
+
+        def iso(column):
+            return column
+
+        def flag(column):
+            return column
+
+    else:
+        # SQLite stores timestamps with a space and booleans as integers
+        build = func.json_object
+
+        def iso(column):
+            return func.replace(column, " ", "T")
+
+        def flag(column):
+            return func.json(case((column, "true"), else_="false"))
+
+    return build(
+        "id", page.c.id,
+        "camera_id", page.c.camera_id,
+        "detection_type", page.c.detection_type,
+        "confidence", page.c.confidence,
+        "bbox", build(
+            "x", page.c.bbox_x,
+            "y", page.c.bbox_y,
+            "width", page.c.bbox_width,
+            "height", page.c.bbox_height,
+        ),
+        "person_name", page.c.person_name,
+        "person_id", page.c.person_id,
+        "face_encoding", page.c.face_encoding,
+        "is_processed", flag(page.c.is_processed),
+        "processing_status", page.c.processing_status,
+        "frame_number", page.c.frame_number,
+        "frame_timestamp", iso(page.c.frame_timestamp),
+        "createdAt", iso(page.c.created_at),
+        "updatedAt", iso(page.c.updated_at),
+    )
+
+
 class DetectionProviderConfigRepository:
     """Repository for detection provider configuration."""
 
@@ -131,6 +176,47 @@ class DetectionRepository:
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def get_live_json(
+        self,
+        camera_id: Optional[str] = None,
+        detection_type: Optional[str] = None,
+        min_confidence: float = 0.0,
+        limit: int = 100,
+        offset: int = 0,
+        minutes: int = 5,
+    ) -> tuple[str, int]:
+        """
+        Get a page of live detections as a JSON array built by the database.
+
+        Filters run before the limit. Without a camera only the last
+        ``minutes`` of detections are considered. Returns the array text in
+        DetectionResponse shape and the number of rows in it.
+        """
+        query = select(Detection).where(Detection.confidence >= min_confidence)
+
+        if camera_id:
+            query = query.where(Detection.camera_id == camera_id)
+        else:
+            query = query.where(Detection.created_at >= datetime.utcnow() - timedelta(minutes=minutes))
+
+        if detection_type:
+            query = query.where(Detection.detection_type == detection_type)
+
+        page = query.order_by(Detection.created_at.desc()).offset(offset).limit(limit).subquery()
+
+        postgres = self.db.bind.dialect.name == "postgresql"
+        row = _detection_json(page, postgres)
+
+        if postgres:
+            array = func.json_agg(aggregate_order_by(row, page.c.created_at.desc()))
+        else:
+            array = func.json_group_array(row)
+
+        result = await self.db.execute(
+            select(func.coalesce(array.cast(String), literal("[]")), func.count()).select_from(page)
+        )
+        return tuple(result.one())
+
     async def get_by_person(
         self,
         person_id: str,
@@ -157,10 +243,8 @@ class DetectionRepository:
 
     async def count_by_camera(self, camera_id: str) -> int:
         """Count detections for camera."""
-        result = await self.db.execute(
-            select(Detection).where(Detection.camera_id == camera_id)
-        )
-        return len(result.scalars().all())
+        result = await self.db.execute(select(func.count(Detection.id)).where(Detection.camera_id == camera_id))
+        return result.scalar() or 0
 
     async def count_recent(
         self,
@@ -169,13 +253,59 @@ class DetectionRepository:
     ) -> int:
         """Count recent detections."""
         cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-        query = select(Detection).where(Detection.created_at >= cutoff_time)
+        query = select(func.count(Detection.id)).where(Detection.created_at >= cutoff_time)
 
         if camera_id:
             query = query.where(Detection.camera_id == camera_id)
 
         result = await self.db.execute(query)
-        return len(result.scalars().all())
+        return result.scalar() or 0
+
+    async def get_statistics(
+        self,
+        today_start: datetime,
+        hour_start: datetime,
+        camera_id: Optional[str] = None,
+    ) -> tuple[int, int, int, Optional[float], Optional[datetime]]:
+        """
+        Get detection totals in one aggregate query.
+
+        Returns the total count, the counts since ``today_start`` and
+        ``hour_start``, today's average confidence and the newest detection
+        timestamp.
+        """
+        today = Detection.created_at >= today_start
+        query = select(
+            func.count(Detection.id),
+            func.count(Detection.id).filter(today),
+            func.count(Detection.id).filter(Detection.created_at >= hour_start),
+            func.avg(Detection.confidence).filter(today),
+            func.max(Detection.created_at),
+        )
+
+        if camera_id:
+            query = query.where(Detection.camera_id == camera_id)
+
+        result = await self.db.execute(query)
+        return tuple(result.one())
+
+    async def get_type_person_counts(
+        self,
+        since: datetime,
+        camera_id: Optional[str] = None,
+    ) -> list[tuple[str, Optional[str], int]]:
+        """Count detections since a time per (detection type, person) pair."""
+        query = (
+            select(Detection.detection_type, Detection.person_id, func.count(Detection.id))
+            .where(Detection.created_at >= since)
+            .group_by(Detection.detection_type, Detection.person_id)
+        )
+
+        if camera_id:
+            query = query.where(Detection.camera_id == camera_id)
+
+        result = await self.db.execute(query)
+        return [tuple(row) for row in result.all()]
 
     async def update(self, detection_id: str, **kwargs) -> Optional[Detection]:
         """Update detection."""
@@ -280,6 +410,39 @@ class DetectionEventLogRepository:
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def stream_filtered(
+        self,
+        camera_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        severity: Optional[str] = None,
+        person_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+        chunk_size: int = 256,
+    ) -> AsyncIterator[DetectionEventLog]:
+        """Stream a page of events newest first, filtering in SQL before the limit."""
+        query = select(DetectionEventLog)
+
+        if camera_id:
+            query = query.where(DetectionEventLog.camera_id == camera_id)
+        if event_type:
+            query = query.where(DetectionEventLog.event_type == event_type)
+        if severity:
+            query = query.where(DetectionEventLog.severity == severity)
+        if person_id:
+            query = query.where(DetectionEventLog.person_id == person_id)
+        if start_time:
+            query = query.where(DetectionEventLog.created_at >= start_time)
+        if end_time:
+            query = query.where(DetectionEventLog.created_at <= end_time)
+
+        query = query.order_by(DetectionEventLog.created_at.desc()).offset(offset).limit(limit)
+        result = await self.db.stream_scalars(query.execution_options(yield_per=chunk_size))
+        async for event in result:
+            yield event
+
     async def delete_old_records(self, days: int = 90) -> int:
         """Delete old event logs."""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
@@ -1,9 +1,9 @@
 """Person repositories for database operations."""
 
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional, Sequence
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import Row, Select, and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.person import Person, PersonFaceEncoding, PersonImage
@@ -29,6 +29,10 @@ class PersonRepository:
         result = await self.db.execute(select(Person).where(Person.id == person_id))
         return result.scalar_one_or_none()
 
+    async def get_updated_at(self, person_id: str) -> Optional[datetime]:
+        """Get a person's last-modified time without loading the row."""
+        return await self.db.scalar(select(Person.updated_at).where(Person.id == person_id))
+
     async def get_by_email(self, email: str) -> Optional[Person]:
         """Get person by email."""
         result = await self.db.execute(select(Person).where(Person.email == email))
@@ -39,13 +43,67 @@ class PersonRepository:
         result = await self.db.execute(select(Person).where(Person.id_number == id_number))
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Person]:
-        """Get all persons."""
-        result = await self.db.execute(
-            select(Person).offset(skip).limit(limit).order_by(Person.created_at.desc())
-        )
+    @staticmethod
+    def _apply_filters(
+        query: Select,
+        status: Optional[str] = None,
+        person_type: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> Select:
+        """Apply the shared list filters."""
+        if status:
+            query = query.where(Person.status == status)
+        if person_type:
+            query = query.where(Person.person_type == person_type)
+        if department:
+            query = query.where(Person.department == department)
+        return query
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        person_type: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> list[Person]:
+        """Get a page of persons, newest first."""
+        query = self._apply_filters(select(Person), status, person_type, department)
+        result = await self.db.execute(query.order_by(Person.created_at.desc()).offset(skip).limit(limit))
         return result.scalars().all()
 
+    async def stream_page(
+        self,
+        columns: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        person_type: Optional[str] = None,
+        department: Optional[str] = None,
+        chunk_size: int = 50,
+    ) -> AsyncIterator[Row]:
+        """
+        Stream a page of persons, newest first, as plain rows of the given columns.
+
+        Selecting columns instead of the entity skips ORM hydration, the
+        identity map and the selectin loads of encodings and images.
+        """
+        query = self._apply_filters(select(*(getattr(Person, c) for c in columns)), status, person_type, department)
+        query = query.order_by(Person.created_at.desc()).offset(skip).limit(limit)
+        result = await self.db.stream(query.execution_options(yield_per=chunk_size))
+        async for row in result:
+            yield row
+
+    async def count_filtered(
+        self,
+        status: Optional[str] = None,
+        person_type: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> int:
+        """Count persons matching the list filters."""
+        query = self._apply_filters(select(func.count(Person.id)), status, person_type, department)
+        return await self.db.scalar(query) or 0
+
     async def get_by_status(self, status: str) -> list[Person]:
         """Get persons by status."""
         result = await self.db.execute(
@@ -74,19 +132,32 @@ class PersonRepository:
         )
         return result.scalars().all()
 
-    async def search(self, query: str) -> list[Person]:
-        """Search persons by name, email, or ID number."""
+    @staticmethod
+    def _search_clause(query: str):
+        """Match the query against name, email, or ID number."""
         search_term = f"%{query}%"
+        return (
+            (Person.first_name.ilike(search_term))
+            | (Person.last_name.ilike(search_term))
+            | (Person.email.ilike(search_term))
+            | (Person.id_number.ilike(search_term))
+        )
+
+    async def search(self, query: str, skip: int = 0, limit: int = 100) -> list[Person]:
+        """Search persons by name, email, or ID number, newest first."""
         result = await self.db.execute(
-            select(Person).where(
-                (Person.first_name.ilike(search_term))
-                | (Person.last_name.ilike(search_term))
-                | (Person.email.ilike(search_term))
-                | (Person.id_number.ilike(search_term))
-            )
+            select(Person)
+            .where(self._search_clause(query))
+            .order_by(Person.created_at.desc())
+            .offset(skip)
+            .limit(limit)
         )
         return result.scalars().all()
 
+    async def count_search(self, query: str) -> int:
+        """Count persons matching a search query."""
+        return await self.db.scalar(select(func.count(Person.id)).where(self._search_clause(query))) or 0
+
     async def count_all(self) -> int:
         """Count total persons."""
         result = await self.db.execute(select(func.count(Person.id)))
@@ -39,13 +39,14 @@ class CameraGroupResponse(CameraGroupBase):
     """Camera group response."""
 
     id: str = Field(..., description="Group ID")
-    createdAt: datetime = Field(..., description="Creation timestamp")
-    updatedAt: datetime = Field(..., description="Update timestamp")
+    created_at: datetime = Field(..., alias="createdAt", description="Creation timestamp")
+    updated_at: datetime = Field(..., alias="updatedAt", description="Update timestamp")
 
     class Config:
         """Schema config."""
 
         from_attributes = True
+        populate_by_name = True
 
 
 # ============================================================================
@@ -150,13 +151,14 @@ class CameraResponse(CameraBase):
     last_connected: Optional[datetime] = Field(None, description="Last successful connection")
     last_error: Optional[str] = Field(None, description="Last error message")
     connection_retries: int = Field(..., description="Connection retry count")
-    createdAt: datetime = Field(..., description="Creation timestamp")
-    updatedAt: datetime = Field(..., description="Update timestamp")
+    created_at: datetime = Field(..., alias="createdAt", description="Creation timestamp")
+    updated_at: datetime = Field(..., alias="updatedAt", description="Update timestamp")
 
     class Config:
         """Schema config."""
 
         from_attributes = True
+        populate_by_name = True
 
 
 class CameraListResponse(BaseModel):
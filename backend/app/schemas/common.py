@@ -38,10 +38,11 @@ class ErrorResponse(BaseModel):
 class PaginationMeta(BaseModel):
     """Pagination metadata."""
 
-    page: int = Field(..., description="Current page number")
+    page: Optional[int] = Field(None, description="Current page number (null in cursor mode)")
     pageSize: int = Field(..., description="Items per page")
-    total: int = Field(..., description="Total items")
-    totalPages: int = Field(..., description="Total pages")
+    total: Optional[int] = Field(None, description="Total items (null in cursor mode)")
+    totalPages: Optional[int] = Field(None, description="Total pages (null in cursor mode)")
+    nextCursor: Optional[str] = Field(None, description="Opaque cursor for the next page, if any")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
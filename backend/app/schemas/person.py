@@ -61,13 +61,14 @@ class PersonResponse(PersonBase):
     face_encoding_count: int = Field(..., description="Number of face encodings")
     enrolled_at: Optional[datetime] = Field(None, description="Enrollment date")
     last_face_enrolled: Optional[datetime] = Field(None, description="Last face enrollment date")
-    createdAt: datetime = Field(..., description="Creation timestamp")
-    updatedAt: datetime = Field(..., description="Update timestamp")
+    created_at: datetime = Field(..., alias="createdAt", description="Creation timestamp")
+    updated_at: datetime = Field(..., alias="updatedAt", description="Update timestamp")
 
     class Config:
         """Schema config."""
 
         from_attributes = True
+        populate_by_name = True
 
 
 # ============================================================================
@@ -232,6 +233,7 @@ class AttendanceResponse(AttendanceBase):
 
     id: str = Field(..., description="Attendance ID")
     person_id: str = Field(..., description="Person ID")
+    person_name: Optional[str] = Field(None, description="Person name")
 
     check_in_time: Optional[datetime] = Field(None, description="Check-in time")
     check_in_confidence: float = Field(..., description="Check-in confidence")
@@ -244,13 +246,14 @@ class AttendanceResponse(AttendanceBase):
     duration_minutes: Optional[int] = Field(None, description="Duration in minutes")
     is_manual: bool = Field(..., description="Is manual entry")
 
-    createdAt: datetime = Field(..., description="Creation timestamp")
-    updatedAt: datetime = Field(..., description="Update timestamp")
+    created_at: datetime = Field(..., alias="createdAt", description="Creation timestamp")
+    updated_at: datetime = Field(..., alias="updatedAt", description="Update timestamp")
 
     class Config:
         """Schema config."""
 
         from_attributes = True
+        populate_by_name = True
 
 
 # ============================================================================
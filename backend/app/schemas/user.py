@@ -44,16 +44,17 @@ class UserResponse(BaseModel):
     id: str = Field(..., description="User ID")
     name: str = Field(..., description="User name")
     email: str = Field(..., description="User email")
-    roleId: str = Field(..., description="Role ID")
+    role_id: str = Field(..., alias="roleId", description="Role ID")
     status: str = Field(..., description="User status")
-    lastActive: Optional[datetime] = Field(None, description="Last active timestamp")
-    createdAt: datetime = Field(..., description="Creation timestamp")
-    updatedAt: datetime = Field(..., description="Update timestamp")
+    last_active: Optional[datetime] = Field(None, alias="lastActive", description="Last active timestamp")
+    created_at: datetime = Field(..., alias="createdAt", description="Creation timestamp")
+    updated_at: datetime = Field(..., alias="updatedAt", description="Update timestamp")
 
     class Config:
         """Schema config."""
 
         from_attributes = True
+        populate_by_name = True
 
 
 class UserListResponse(BaseModel):
@@ -2,12 +2,13 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError, ValidationError
+from app.core.redis import cache_service
 from app.models.attendance import Attendance, AttendanceSession
 from app.repositories.attendance import (
     AttendanceRepository,
@@ -30,6 +31,21 @@ class AttendanceService:
         self.repo = AttendanceRepository(db)
         self.session_repo = AttendanceSessionRepository(db)
         self.person_service = PersonService(db)
+        self.cache = cache_service
+
+    @staticmethod
+    def default_range(
+        from_date: Optional[datetime],
+        to_date: Optional[datetime],
+    ) -> tuple[datetime, datetime]:
+        """
+        Fill in the default 30-day query window.
+
+        Resolve this once per request and pass the result to both the page and
+        the count query so they cover the same window.
+        """
+        now = datetime.utcnow()
+        return from_date or now - timedelta(days=30), to_date or now
 
     # =========================================================================
     # Check-in/Check-out Methods
@@ -108,6 +124,8 @@ class AttendanceService:
                 )
                 is_new = True
 
+            await self.cache.invalidate_person_status(person_id)
+            await self.cache.invalidate_daily_report(attendance_date.date())
             logger.info(f"Check-in recorded for {person_id} at {check_in_time}")
 
             return {
@@ -193,6 +211,8 @@ class AttendanceService:
                 duration_minutes=duration_minutes,
             )
 
+            await self.cache.invalidate_person_status(person_id)
+            await self.cache.invalidate_daily_report(attendance_date.date())
             logger.info(f"Check-out recorded for {person_id} at {check_out_time}")
 
             return {
@@ -229,23 +249,96 @@ class AttendanceService:
         person_id: str,
         from_date: Optional[datetime] = None,
         to_date: Optional[datetime] = None,
+        status: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
     ) -> list[Attendance]:
-        """Get attendance records for a person."""
-        if not from_date:
-            from_date = datetime.utcnow() - timedelta(days=30)
-        if not to_date:
-            to_date = datetime.utcnow()
+        """Get a page of attendance records for a person (SQL LIMIT/OFFSET)."""
+        from_date, to_date = self.default_range(from_date, to_date)
 
         return await self.repo.get_by_person(
             person_id,
             from_date=from_date,
             to_date=to_date,
+            status=status,
             limit=limit,
             offset=offset,
         )
 
+    async def count_person_attendance(
+        self,
+        person_id: str,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """Count attendance records for a person."""
+        from_date, to_date = self.default_range(from_date, to_date)
+
+        return await self.repo.count_by_person(person_id, from_date=from_date, to_date=to_date, status=status)
+
+    async def get_attendance_range(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[Attendance]:
+        """Get a page of attendance records for all persons in a date range."""
+        return await self.repo.get_in_range(from_date, to_date, status=status, limit=limit, offset=offset)
+
+    async def count_attendance_range(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        status: Optional[str] = None,
+    ) -> int:
+        """Count attendance records for all persons in a date range."""
+        return await self.repo.count_in_range(from_date, to_date, status=status)
+
+    async def list_after(
+        self,
+        cursor: Optional[tuple[datetime, str]],
+        limit: int,
+        person_id: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        status: Optional[str] = None,
+    ) -> tuple[list[Attendance], Optional[tuple[datetime, str]]]:
+        """
+        Keyset-paginate attendance records.
+
+        Args:
+            cursor: (attendance_date, id) of the last row already seen, or None for the first page
+            limit: Page size
+            person_id: Restrict to one person (uses the default 30-day window like get_person_attendance)
+            from_date: Range start
+            to_date: Range end
+            status: Filter by attendance status
+
+        Returns:
+            Page of records and the key to resume from, or None when there are no more rows
+        """
+        if person_id:
+            from_date, to_date = self.default_range(from_date, to_date)
+
+        records = await self.repo.get_page_after(
+            cursor,
+            limit + 1,
+            person_id=person_id,
+            from_date=from_date,
+            to_date=to_date,
+            status=status,
+        )
+
+        if len(records) <= limit:
+            return records, None
+
+        records = records[:limit]
+        last = records[-1]
+        return records, (last.attendance_date, last.id)
+
     async def get_daily_attendance(
         self,
         attendance_date: datetime,
@@ -257,24 +350,25 @@ class AttendanceService:
 
         return await self.repo.get_by_date_range(date_start, date_end, limit=limit)
 
+    async def stream_daily_attendance(self, attendance_date: datetime) -> AsyncIterator[Attendance]:
+        """Stream all attendance for a specific date without materializing the day."""
+        date_start = attendance_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        date_end = date_start + timedelta(days=1)
+
+        async for attendance in self.repo.stream_by_date_range(date_start, date_end):
+            yield attendance
+
     async def get_current_check_in_status(self, person_id: str) -> dict:
-        """Get current check-in status for a person."""
+        """Get current check-in status (and display name) for a person."""
         today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
 
-        attendance = await self.repo.get_by_person_and_date(person_id, today_start)
-
-        if not attendance:
-            return {
-                "person_id": person_id,
-                "checked_in": False,
-                "check_in_time": None,
-                "current_duration_minutes": None,
-                "status": "not_checked_in",
-            }
+        found = await self.repo.get_person_name_and_attendance(person_id, today_start)
+        person_name, attendance = found if found else (None, None)
 
-        if not attendance.check_in_time:
+        if not attendance or not attendance.check_in_time:
             return {
                 "person_id": person_id,
+                "person_name": person_name,
                 "checked_in": False,
                 "check_in_time": None,
                 "current_duration_minutes": None,
@@ -284,6 +378,7 @@ class AttendanceService:
         if attendance.check_out_time:
             return {
                 "person_id": person_id,
+                "person_name": person_name,
                 "checked_in": False,
                 "check_in_time": attendance.check_in_time,
                 "check_out_time": attendance.check_out_time,
@@ -297,6 +392,7 @@ class AttendanceService:
 
         return {
             "person_id": person_id,
+            "person_name": person_name,
             "checked_in": True,
             "check_in_time": attendance.check_in_time,
             "current_duration_minutes": current_duration_minutes,
@@ -314,27 +410,13 @@ class AttendanceService:
         to_date: Optional[datetime] = None,
     ) -> dict:
         """Get attendance statistics for a person."""
-        if not from_date:
-            from_date = datetime.utcnow() - timedelta(days=30)
-        if not to_date:
-            to_date = datetime.utcnow()
-
-        records = await self.repo.get_by_person(
-            person_id,
-            from_date=from_date,
-            to_date=to_date,
-            limit=1000,
-        )
-
-        # Count by status
-        status_count = {}
-        total_duration = 0
+        from_date, to_date = self.default_range(from_date, to_date)
 
-        for record in records:
-            status = record.status
-            status_count[status] = status_count.get(status, 0) + 1
-            if record.duration_minutes:
-                total_duration += record.duration_minutes
+        # Aggregate in SQL (GROUP BY status) rather than loading rows
+        totals = await self.repo.get_status_totals(person_id, from_date, to_date)
+        status_count = {status: count for status, (count, _) in totals.items()}
+        total_records = sum(status_count.values())
+        total_duration = sum(duration for _, duration in totals.values())
 
         days_diff = (to_date - from_date).days
         working_days = days_diff  # Simplified (doesn't account for weekends)
@@ -344,30 +426,35 @@ class AttendanceService:
             "from_date": from_date,
             "to_date": to_date,
             "total_working_days": working_days,
-            "total_attendance_records": len(records),
+            "total_attendance_records": total_records,
             "status_breakdown": status_count,
             "days_present": status_count.get("present", 0),
             "days_absent": status_count.get("absent", 0),
             "days_late": status_count.get("late", 0),
+            "days_early_leave": status_count.get("early_leave", 0),
             "presence_percentage": (status_count.get("present", 0) / working_days * 100) if working_days > 0 else 0,
             "total_duration_minutes": total_duration,
-            "average_duration_minutes": total_duration // len(records) if records else 0,
+            "average_duration_minutes": total_duration // total_records if total_records else 0,
         }
 
     async def get_daily_attendance_summary(self, attendance_date: datetime) -> dict:
-        """Get daily attendance summary."""
-        records = await self.get_daily_attendance(attendance_date)
+        """Get daily attendance summary (cached per day)."""
+        report_date = attendance_date.date()
+        cached = await self.cache.get_cached_daily_report(report_date)
+        if cached is not None:
+            return cached
 
-        status_count = {}
-        for record in records:
-            status = record.status
-            status_count[status] = status_count.get(status, 0) + 1
+        # Count per status in SQL; the day's rows are never loaded
+        date_start = attendance_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        date_end = date_start + timedelta(days=1) - timedelta(microseconds=1)
+        totals = await self.repo.get_status_totals(None, date_start, date_end)
 
-        total = len(records)
+        status_count = {status: count for status, (count, _) in totals.items()}
+        total = sum(status_count.values())
         present = status_count.get("present", 0)
 
-        return {
-            "date": attendance_date,
+        summary = {
+            "date": report_date.isoformat(),
             "total_persons": total,
             "present": present,
             "absent": status_count.get("absent", 0),
@@ -376,6 +463,8 @@ class AttendanceService:
             "presence_percentage": (present / total * 100) if total > 0 else 0,
             "status_breakdown": status_count,
         }
+        await self.cache.cache_daily_report(report_date, summary)
+        return summary
 
     # =========================================================================
     # Attendance Session Management
@@ -431,12 +520,11 @@ class AttendanceService:
         existing = await self.repo.get_by_person_and_date(person_id, date_start)
 
         if existing:
-            updated = await self.repo.update(
+            attendance = await self.repo.update(
                 existing.id,
                 status=status,
                 notes=reason,
             )
-            return updated
         else:
             attendance_id = str(uuid4())
             attendance = await self.repo.create(
@@ -447,4 +535,6 @@ class AttendanceService:
                 notes=reason,
                 is_manual=True,
             )
-            return attendance
+
+        await self.cache.invalidate_daily_report(date_start.date())
+        return attendance
@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -26,6 +26,25 @@ from app.schemas.camera import (
 
 logger = logging.getLogger(__name__)
 
+# Camera columns included in exports, in column order
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "rtsp_url",
+    "resolution",
+    "fps",
+    "codec",
+    "location",
+    "group_id",
+    "is_active",
+    "is_primary",
+    "enable_recording",
+    "enable_snapshots",
+    "enable_detection",
+    "detection_sensitivity",
+)
+
 
 class CameraGroupService:
     """Service for camera group operations."""
@@ -68,9 +87,9 @@ class CameraGroupService:
     async def delete_group(self, group_id: str) -> bool:
         """Delete camera group."""
         # Check if group has cameras
-        cameras = await CameraRepository(self.db).get_by_group(group_id)
-        if cameras:
-            raise ValidationError(f"Cannot delete group with {len(cameras)} cameras")
+        camera_count = await CameraRepository(self.db).count_by_group(group_id)
+        if camera_count:
+            raise ValidationError(f"Cannot delete group with {camera_count} cameras")
 
         return await self.repo.delete(group_id)
 
@@ -133,6 +152,10 @@ class CameraService:
         """Get cameras in a group."""
         return await self.repo.get_by_group(group_id)
 
+    async def list_cameras_by_group(self, group_id: str, skip: int = 0, limit: int = 100) -> list[Camera]:
+        """List one page of cameras in a group."""
+        return await self.repo.get_by_group(group_id, skip=skip, limit=limit)
+
     async def update_camera(self, camera_id: str, request: CameraUpdate) -> Camera:
         """Update camera."""
         camera = await self.get_camera(camera_id)
@@ -164,18 +187,16 @@ class CameraService:
 
     async def get_summary(self) -> dict:
         """Get camera system summary."""
-        total = await self.repo.count_all()
-        active = await self.repo.count_active()
-        offline = await self.repo.count_by_status("error")
-        recording = len([c for c in await self.repo.get_all() if c.enable_recording])
-        detection_enabled = len(await self.repo.get_with_detection_enabled())
+        counts = await self.repo.get_summary_counts()
+        total, offline = counts["total"], counts["offline"]
 
         return {
             "total_cameras": total,
-            "active_cameras": active,
+            "active_cameras": counts["active"],
             "offline_cameras": offline,
-            "recording_cameras": recording,
-            "detection_enabled": detection_enabled,
+            "recording_cameras": counts["recording"],
+            "detection_enabled": counts["detection_enabled"],
+            "total_groups": counts["groups"],
             "health_check_status": "healthy" if offline == 0 else "warning" if offline < (total / 2) else "critical",
         }
 
@@ -236,40 +257,47 @@ class CameraService:
                 "error": str(e),
             }
 
-    async def import_cameras(self, cameras_data: list[dict], group_id: Optional[str] = None) -> dict:
-        """Import cameras from data."""
-        imported = 0
+    async def import_cameras(self, cameras_data: list[dict], group_id: Optional[str] = None,
+                             first_row: int = 1) -> dict:
+        """Import cameras from data; first_row numbers the rows in reported errors."""
         skipped = 0
         errors = []
 
+        # Validate every row first; invalid rows are reported, not imported
+        requests = []
         for idx, camera_data in enumerate(cameras_data):
             try:
-                # Check for duplicate RTSP URL
-                existing = await self.repo.get_by_rtsp_url(camera_data.get("rtsp_url", ""))
-                if existing:
-                    skipped += 1
-                    continue
-
-                # Create camera
-                request = CameraCreate(
-                    name=camera_data.get("name", f"Camera {imported + 1}"),
-                    rtsp_url=camera_data.get("rtsp_url"),
-                    username=camera_data.get("username"),
-                    password=camera_data.get("password"),
-                    resolution=camera_data.get("resolution", "1920x1080"),
-                    fps=camera_data.get("fps", 30),
-                    codec=camera_data.get("codec", "h264"),
-                    location=camera_data.get("location"),
-                    group_id=group_id or camera_data.get("group_id"),
+                requests.append(
+                    CameraCreate(
+                        name=camera_data.get("name", f"Camera {len(requests) + 1}"),
+                        rtsp_url=camera_data.get("rtsp_url"),
+                        username=camera_data.get("username"),
+                        password=camera_data.get("password"),
+                        resolution=camera_data.get("resolution", "1920x1080"),
+                        fps=camera_data.get("fps", 30),
+                        codec=camera_data.get("codec", "h264"),
+                        location=camera_data.get("location"),
+                        group_id=group_id or camera_data.get("group_id"),
+                    )
                 )
-                await self.create_camera(request)
-                imported += 1
             except Exception as e:
                 errors.append({
-                    "row": idx + 1,
+                    "row": first_row + idx,
                     "error": str(e),
                 })
 
+        # Skip RTSP URLs that already exist or repeat earlier in the import
+        seen = await self.repo.get_existing_rtsp_urls([r.rtsp_url for r in requests])
+        rows = []
+        for request in requests:
+            if request.rtsp_url in seen:
+                skipped += 1
+                continue
+            seen.add(request.rtsp_url)
+            rows.append({"id": str(uuid4()), **request.dict()})
+
+        imported = await self.repo.bulk_create(rows)
+
         return {
             "imported_count": imported,
             "skipped_count": skipped,
@@ -279,35 +307,23 @@ class CameraService:
     async def export_cameras(self, group_id: Optional[str] = None,
                            include_credentials: bool = False) -> list[dict]:
         """Export cameras to data format."""
-        if group_id:
-            cameras = await self.repo.get_by_group(group_id)
-        else:
-            cameras = await self.repo.get_all()
-
-        exported = []
-        for camera in cameras:
-            camera_data = {
-                "id": camera.id,
-                "name": camera.name,
-                "description": camera.description,
-                "rtsp_url": camera.rtsp_url,
-                "resolution": camera.resolution,
-                "fps": camera.fps,
-                "codec": camera.codec,
-                "location": camera.location,
-                "group_id": camera.group_id,
-                "is_active": camera.is_active,
-                "is_primary": camera.is_primary,
-                "enable_recording": camera.enable_recording,
-                "enable_snapshots": camera.enable_snapshots,
-                "enable_detection": camera.enable_detection,
-                "detection_sensitivity": camera.detection_sensitivity,
-            }
-
-            if include_credentials:
-                camera_data["username"] = camera.username
-                camera_data["password"] = camera.password
-
-            exported.append(camera_data)
-
-        return exported
+        return [row async for row in self.stream_export_rows(group_id, include_credentials)]
+
+    async def stream_export_rows(self, group_id: Optional[str] = None,
+                                 include_credentials: bool = False) -> AsyncIterator[dict]:
+        """Stream cameras as export rows, one at a time."""
+        async for camera in self.repo.stream_all(group_id):
+            yield self._export_row(camera, include_credentials)
+
+    @staticmethod
+    def export_fields(include_credentials: bool = False) -> list[str]:
+        """Column names of an export row."""
+        fields = list(EXPORT_FIELDS)
+        if include_credentials:
+            fields += ["username", "password"]
+        return fields
+
+    @staticmethod
+    def _export_row(camera: Camera, include_credentials: bool) -> dict:
+        """Build the export row for one camera."""
+        return {field: getattr(camera, field) for field in CameraService.export_fields(include_credentials)}
@@ -4,6 +4,7 @@ import base64
 import io
 import json
 import logging
+from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
@@ -27,7 +28,7 @@ class DetectionProviderService:
     def __init__(self):
         """Initialize detection provider service."""
         self.timeout = settings.DETECTION_PROVIDER_TIMEOUT or 30
-        self.max_retries = settings.DETECTION_PROVIDER_MAX_RETRIES or 3
+        self.max_retries = settings.DETECTION_PROVIDER_RETRY_ATTEMPTS or 3
 
     async def send_frame_to_provider(
         self,
@@ -169,6 +170,7 @@ class DetectionProviderService:
             # based on the actual provider's response format
 
             detections_data = provider_response.get("detections", [])
+            received_at = datetime.utcnow()
 
             for detection_data in detections_data:
                 try:
@@ -195,8 +197,8 @@ class DetectionProviderService:
                         processing_status="completed",
                         frame_number=provider_response.get("frame_number"),
                         frame_timestamp=provider_response.get("frame_timestamp"),
-                        createdAt=__import__("datetime").datetime.utcnow(),
-                        updatedAt=__import__("datetime").datetime.utcnow(),
+                        createdAt=received_at,
+                        updatedAt=received_at,
                     )
 
                     detections.append(detection)
@@ -2,9 +2,10 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import uuid4
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError, ValidationError
@@ -32,6 +33,18 @@ from app.services.detection_provider import DetectionProviderService
 logger = logging.getLogger(__name__)
 
 
+def compact_detection(d: Detection) -> dict:
+    """Build the compact detection dict that is cached per camera and sent over the WebSocket."""
+    return {
+        "id": d.id,
+        "detection_type": d.detection_type,
+        "confidence": d.confidence,
+        "bbox": {"x": d.bbox_x, "y": d.bbox_y, "width": d.bbox_width, "height": d.bbox_height},
+        "person_name": d.person_name,
+        "person_id": d.person_id,
+    }
+
+
 class DetectionService:
     """Service for detection operations."""
 
@@ -85,6 +98,7 @@ class DetectionService:
             is_active=request.is_active,
             test_status="untested",
         )
+        await self.cache.invalidate_provider_config()
         logger.info(f"Created detection provider config: {config_id}")
         return config
 
@@ -103,6 +117,7 @@ class DetectionService:
         if not updated:
             raise NotFoundError(f"Provider config {config_id} not found")
 
+        await self.cache.invalidate_provider_config()
         logger.info(f"Updated detection provider config: {config_id}")
         return updated
 
@@ -111,6 +126,7 @@ class DetectionService:
         await self.get_provider_config(config_id)  # Verify exists
         result = await self.config_repo.delete(config_id)
         if result:
+            await self.cache.invalidate_provider_config()
             logger.info(f"Deleted detection provider config: {config_id}")
         return result
 
@@ -152,6 +168,7 @@ class DetectionService:
                 last_tested=datetime.utcnow(),
                 last_error=last_error,
             )
+            await self.cache.invalidate_provider_config()
 
             logger.info(f"Provider test completed: {config.provider_name} - {test_status}")
             return result
@@ -223,23 +240,7 @@ class DetectionService:
                 stored_detections.append(db_detection)
 
             # Cache live detections
-            detection_dicts = [
-                {
-                    "id": d.id,
-                    "detection_type": d.detection_type,
-                    "confidence": d.confidence,
-                    "bbox": {
-                        "x": d.bbox_x,
-                        "y": d.bbox_y,
-                        "width": d.bbox_width,
-                        "height": d.bbox_height,
-                    },
-                    "person_name": d.person_name,
-                    "person_id": d.person_id,
-                }
-                for d in stored_detections
-            ]
-            await self.cache.cache_live_detections(camera_id, detection_dicts)
+            await self.cache.cache_live_detections(camera_id, [compact_detection(d) for d in stored_detections])
 
             # Create event log
             await self.create_event_log(
@@ -285,7 +286,7 @@ class DetectionService:
         offset: int = 0,
         use_cache: bool = True,
     ) -> dict:
-        """Get live detections with optional caching."""
+        """Get live detections, in compact_detection form, with optional caching."""
         # Try cache first
         if use_cache and camera_id:
             cached = await self.cache.get_cached_live_detections(camera_id)
@@ -319,33 +320,58 @@ class DetectionService:
         # Filter by confidence
         detections = [d for d in detections if d.confidence >= min_confidence]
 
+        detection_dicts = [compact_detection(d) for d in detections]
+
         # Cache if camera_id provided
-        if use_cache and camera_id and detections:
-            detection_dicts = [
-                {
-                    "id": d.id,
-                    "detection_type": d.detection_type,
-                    "confidence": d.confidence,
-                    "bbox": {
-                        "x": d.bbox_x,
-                        "y": d.bbox_y,
-                        "width": d.bbox_width,
-                        "height": d.bbox_height,
-                    },
-                    "person_name": d.person_name,
-                    "person_id": d.person_id,
-                }
-                for d in detections
-            ]
+        if use_cache and camera_id and detection_dicts:
             await self.cache.cache_live_detections(camera_id, detection_dicts)
 
         return {
-            "detections": detections,
+            "detections": detection_dicts,
             "total_detections": len(detections),
             "last_updated": datetime.utcnow(),
             "cache_hit": False,
         }
 
+    async def get_live_detections_json(
+        self,
+        camera_id: Optional[str] = None,
+        detection_type: Optional[str] = None,
+        min_confidence: float = 0.5,
+        limit: int = 100,
+        offset: int = 0,
+        use_cache: bool = True,
+    ) -> dict:
+        """
+        Get live detections as a JSON array built by the database.
+
+        Pages are cached per camera under their filter/page parameters, so a
+        cache hit returns exactly the body the database read produced.
+        """
+        params = (detection_type, min_confidence, limit, offset)
+        if use_cache and camera_id:
+            cached = await self.cache.get_cached_live_detections_json(camera_id, params)
+            if cached:
+                return {**cached, "cache_hit": True}
+
+        detections_json, count = await self.repo.get_live_json(
+            camera_id=camera_id,
+            detection_type=detection_type,
+            min_confidence=min_confidence,
+            limit=limit,
+            offset=offset,
+        )
+        page = {
+            "detections_json": detections_json,
+            "total_detections": count,
+            "last_updated": datetime.utcnow(),
+        }
+
+        if use_cache and camera_id:
+            await self.cache.cache_live_detections_json(camera_id, params, page)
+
+        return {**page, "cache_hit": False}
+
     async def get_detection(self, detection_id: str) -> Detection:
         """Get detection by ID."""
         detection = await self.repo.get_by_id(detection_id)
@@ -414,7 +440,7 @@ class DetectionService:
         logger.info(f"Created event log: {event_id} - {event_type}")
         return event
 
-    async def get_detection_events(
+    def stream_detection_events(
         self,
         camera_id: Optional[str] = None,
         event_type: Optional[str] = None,
@@ -424,45 +450,21 @@ class DetectionService:
         end_time: Optional[datetime] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> dict:
-        """Get detection events with filtering."""
-        # Get events by camera if specified
-        if camera_id:
-            events = await self.event_repo.get_by_camera(
-                camera_id=camera_id,
-                limit=limit + offset,
-                offset=0,
-            )
-        else:
-            # Get recent events
-            events = await self.event_repo.get_recent(limit=limit + offset)
-
-        # Filter by event type
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
-
-        # Filter by severity
-        if severity:
-            events = [e for e in events if e.severity == severity]
-
-        # Filter by person ID
-        if person_id:
-            events = [e for e in events if e.person_id == person_id]
+    ) -> AsyncIterator[DetectionEventLog]:
+        """Stream detection events with filtering; without a camera or start time only the last 5 minutes."""
+        if not camera_id and not start_time:
+            start_time = datetime.utcnow() - timedelta(minutes=5)
 
-        # Filter by time range
-        if start_time:
-            events = [e for e in events if e.createdAt >= start_time]
-        if end_time:
-            events = [e for e in events if e.createdAt <= end_time]
-
-        # Apply pagination
-        events = events[offset : offset + limit]
-
-        return {
-            "events": events,
-            "total_events": len(events),
-            "camera_id": camera_id,
-        }
+        return self.event_repo.stream_filtered(
+            camera_id=camera_id,
+            event_type=event_type,
+            severity=severity,
+            person_id=person_id,
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+            offset=offset,
+        )
 
     # =========================================================================
     # Statistics Methods
@@ -480,56 +482,34 @@ class DetectionService:
             return cached_stats
 
         now = datetime.utcnow()
-
-        # Count total detections
-        total_detections = await self.repo.count_by_camera(camera_id) if camera_id else 0
-
-        # Count detections today
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        recent_today = await self.repo.get_recent(camera_id=camera_id, minutes=int((now - today_start).total_seconds() / 60))
-        detections_today = len(recent_today)
 
-        # Count detections this hour
-        recent_hour = await self.repo.get_recent(camera_id=camera_id, minutes=60)
-        detections_this_hour = len(recent_hour)
-
-        # Calculate average confidence
-        if recent_today:
-            average_confidence = sum(d.confidence for d in recent_today) / len(recent_today)
-        else:
-            average_confidence = 0.0
-
-        # Get most detected person
-        if recent_today:
-            person_counts = {}
-            for d in recent_today:
-                if d.person_id:
-                    person_counts[d.person_id] = person_counts.get(d.person_id, 0) + 1
-            most_detected_person = max(person_counts, key=person_counts.get) if person_counts else None
-        else:
-            most_detected_person = None
-
-        # Get detection type breakdown
-        if recent_today:
-            type_counts = {}
-            for d in recent_today:
-                type_counts[d.detection_type] = type_counts.get(d.detection_type, 0) + 1
-            detection_types = type_counts
-        else:
-            detection_types = {}
+        # Totals, today's/this hour's counts, average confidence and last timestamp in one query
+        (
+            total_detections,
+            detections_today,
+            detections_this_hour,
+            average_confidence,
+            last_detection_timestamp,
+        ) = await self.repo.get_statistics(today_start, now - timedelta(hours=1), camera_id=camera_id)
+
+        # Today's type and person breakdowns from one grouped query
+        detection_types: dict[str, int] = {}
+        person_counts: dict[str, int] = {}
+        for detection_type, person_id, count in await self.repo.get_type_person_counts(today_start, camera_id):
+            detection_types[detection_type] = detection_types.get(detection_type, 0) + count
+            if person_id:
+                person_counts[person_id] = person_counts.get(person_id, 0) + count
+        most_detected_person = max(person_counts, key=person_counts.get) if person_counts else None
 
         # Get number of active cameras
         cameras_active = 1 if camera_id else 0
 
-        # Get last detection timestamp
-        recent = await self.repo.get_recent(camera_id=camera_id, limit=1)
-        last_detection_timestamp = recent[0].createdAt if recent else None
-
         stats = {
             "total_detections": total_detections,
             "detections_today": detections_today,
             "detections_this_hour": detections_this_hour,
-            "average_confidence": round(average_confidence, 3),
+            "average_confidence": round(average_confidence or 0.0, 3),
             "most_detected_person": most_detected_person,
             "detection_types": detection_types,
             "cameras_active": cameras_active,
@@ -612,7 +592,13 @@ class DetectionService:
 
     async def get_queue_stats(self) -> dict:
         """Get processing queue statistics."""
-        return await self.queue_repo.get_queue_stats()
+        cached = await self.cache.get_cached_queue_stats()
+        if cached:
+            return cached
+
+        stats = await self.queue_repo.get_queue_stats()
+        await self.cache.cache_queue_stats(stats)
+        return stats
 
     # =========================================================================
     # Cleanup Methods
@@ -642,11 +628,15 @@ class DetectionService:
 
     async def get_detection_summary(self) -> dict:
         """Get detection system summary."""
+        cached = await self.cache.get_cached_detection_summary()
+        if cached:
+            return cached
+
         config = await self.config_repo.get_active()
-        queue_stats = await self.queue_repo.get_queue_stats()
+        queue_stats = await self.get_queue_stats()
         stats = await self.get_detection_statistics()
 
-        return {
+        summary = {
             "provider_configured": config is not None,
             "provider_name": config.provider_name if config else None,
             "provider_active": config.is_active if config else False,
@@ -654,3 +644,5 @@ class DetectionService:
             "queue_stats": queue_stats,
             "detection_stats": stats,
         }
+        await self.cache.cache_detection_summary(summary)
+        return summary
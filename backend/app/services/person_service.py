@@ -2,12 +2,15 @@
 
 import base64
 import logging
-from typing import Optional
-from uuid import uuid4
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import NotFoundError, ValidationError
+from app.core.redis import cache_service
+from app.db.base import new_id
 from app.models.person import Person, PersonFaceEncoding, PersonImage
 from app.repositories.person import (
     PersonFaceEncodingRepository,
@@ -35,6 +38,7 @@ class PersonService:
         self.encoding_repo = PersonFaceEncodingRepository(db)
         self.image_repo = PersonImageRepository(db)
         self.face_service = FaceRecognitionService()
+        self.cache = cache_service
 
     # =========================================================================
     # Person CRUD Operations
@@ -54,7 +58,7 @@ class PersonService:
             if existing:
                 raise ValidationError(f"Person with ID number {request.id_number} already exists")
 
-        person_id = str(uuid4())
+        person_id = new_id()
         person = await self.repo.create(
             person_id=person_id,
             first_name=request.first_name,
@@ -68,6 +72,7 @@ class PersonService:
             organization=request.organization,
             status=request.status,
         )
+        await self.cache.invalidate_list_counts(self.cache.PERSON_PREFIX)
 
         logger.info(f"Created person: {person_id} - {person.first_name} {person.last_name}")
         return person
@@ -79,6 +84,10 @@ class PersonService:
             raise NotFoundError(f"Person {person_id} not found")
         return person
 
+    async def get_person_updated_at(self, person_id: str) -> Optional[datetime]:
+        """Get a person's last-modified time (None if the person does not exist)."""
+        return await self.repo.get_updated_at(person_id)
+
     async def get_person_by_email(self, email: str) -> Person:
         """Get person by email."""
         person = await self.repo.get_by_email(email)
@@ -105,6 +114,7 @@ class PersonService:
         updated = await self.repo.update(person_id, **request.dict(exclude_unset=True))
         if not updated:
             raise NotFoundError(f"Person {person_id} not found")
+        await self.cache.invalidate_list_counts(self.cache.PERSON_PREFIX)
 
         logger.info(f"Updated person: {person_id}")
         return updated
@@ -114,6 +124,7 @@ class PersonService:
         await self.get_person(person_id)  # Verify exists
         result = await self.repo.delete(person_id)
         if result:
+            await self.cache.invalidate_list_counts(self.cache.PERSON_PREFIX)
             logger.info(f"Deleted person: {person_id}")
         return result
 
@@ -126,25 +137,60 @@ class PersonService:
         department: Optional[str] = None,
     ) -> list[Person]:
         """List persons with optional filtering."""
-        persons = await self.repo.get_all(skip=skip, limit=limit)
+        return await self.repo.get_all(
+            skip=skip,
+            limit=limit,
+            status=status,
+            person_type=person_type,
+            department=department,
+        )
+
+    def stream_persons(
+        self,
+        columns: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        person_type: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> AsyncIterator[Row]:
+        """Stream one page of persons as rows of the given columns."""
+        return self.repo.stream_page(
+            columns,
+            skip=skip,
+            limit=limit,
+            status=status,
+            person_type=person_type,
+            department=department,
+        )
 
-        # Filter by status
-        if status:
-            persons = [p for p in persons if p.status == status]
+    async def count_persons(
+        self,
+        status: Optional[str] = None,
+        person_type: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> int:
+        """Count persons matching the list filters (cached per filter set)."""
+        filters = (status, person_type, department)
+        cached = await self.cache.get_cached_list_count(self.cache.PERSON_PREFIX, filters)
+        if cached is not None:
+            return cached
 
-        # Filter by person type
-        if person_type:
-            persons = [p for p in persons if p.person_type == person_type]
+        total = await self.repo.count_filtered(status=status, person_type=person_type, department=department)
+        await self.cache.cache_list_count(self.cache.PERSON_PREFIX, filters, total)
+        return total
 
-        # Filter by department
-        if department:
-            persons = [p for p in persons if p.department == department]
+    async def search_persons(self, query: str, skip: int = 0, limit: int = 100) -> tuple[list[Person], int]:
+        """Search persons by name, email, or ID number; returns one page and the total match count."""
+        persons = await self.repo.search(query, skip=skip, limit=limit)
 
-        return persons
+        filters = ("search", query)
+        total = await self.cache.get_cached_list_count(self.cache.PERSON_PREFIX, filters)
+        if total is None:
+            total = await self.repo.count_search(query)
+            await self.cache.cache_list_count(self.cache.PERSON_PREFIX, filters, total)
 
-    async def search_persons(self, query: str) -> list[Person]:
-        """Search persons by name, email, or ID number."""
-        return await self.repo.search(query)
+        return persons, total
 
     # =========================================================================
     # Face Enrollment Methods
@@ -199,7 +245,7 @@ class PersonService:
             face_confidence = min(1.0, face_area_percentage * 2)  # Normalize to 0-1
 
             # Create face image record
-            image_id = str(uuid4())
+            image_id = new_id()
             image = await self.image_repo.create(
                 image_id=image_id,
                 person_id=person_id,
@@ -216,7 +262,7 @@ class PersonService:
             )
 
             # Create face encoding record
-            encoding_id = str(uuid4())
+            encoding_id = new_id()
             face_encoding = await self.encoding_repo.create(
                 encoding_id=encoding_id,
                 person_id=person_id,
@@ -233,7 +279,7 @@ class PersonService:
             await self.repo.update(
                 person_id,
                 face_encoding_count=total_encodings,
-                last_face_enrolled=__import__("datetime").datetime.utcnow(),
+                last_face_enrolled=datetime.utcnow(),
             )
 
             logger.info(f"Enrolled face for person {person_id} - encoding {encoding_id}")
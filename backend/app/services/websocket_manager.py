@@ -1,55 +1,147 @@
 """WebSocket connection manager for real-time updates."""
 
-import json
+import asyncio
 import logging
+from collections import deque
 from typing import Callable, Optional
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
 
 
+class Outbox:
+    """
+    Bounded queue of encoded frames waiting to be sent to one connection.
+
+    When full, the oldest droppable frame (a reply to the client) is shed
+    first; broadcast frames are only shed once no replies are left, oldest
+    first, so a slow client keeps receiving the newest detections.
+    """
+
+    def __init__(self, maxsize: int):
+        """Initialize an empty outbox."""
+        self.maxsize = maxsize
+        self.frames: deque[tuple[str, bool]] = deque()
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, frame: str, droppable: bool) -> bool:
+        """Queue a frame without waiting; returns False if the frame itself was shed."""
+        if len(self.frames) >= self.maxsize:
+            self.dropped += 1
+            for i, (_, queued_droppable) in enumerate(self.frames):
+                if queued_droppable:
+                    del self.frames[i]
+                    break
+            else:
+                if droppable:
+                    return False
+                self.frames.popleft()
+
+        self.frames.append((frame, droppable))
+        self.ready.set()
+        return True
+
+    async def get(self) -> str:
+        """Wait for and return the next frame."""
+        while not self.frames:
+            self.ready.clear()
+            await self.ready.wait()
+        return self.frames.popleft()[0]
+
+
 class ConnectionManager:
     """Manage WebSocket connections and broadcasting."""
 
+    # Frames queued per connection before the oldest are shed
+    OUTBOX_SIZE = 64
+
     def __init__(self):
         """Initialize connection manager."""
-        self.active_connections: dict[str, list[WebSocket]] = {}
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        self.connection_clients: dict[WebSocket, str] = {}  # websocket -> client_id
         self.subscriptions: dict[WebSocket, set[str]] = {}
+        self.outboxes: dict[WebSocket, Outbox] = {}
+        self.senders: dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, client_id: str):
         """Accept and register a WebSocket connection."""
         await websocket.accept()
         if client_id not in self.active_connections:
-            self.active_connections[client_id] = []
-        self.active_connections[client_id].append(websocket)
+            self.active_connections[client_id] = set()
+        self.active_connections[client_id].add(websocket)
+        self.connection_clients[websocket] = client_id
         self.subscriptions[websocket] = set()
+        self.outboxes[websocket] = Outbox(self.OUTBOX_SIZE)
+        self.senders[websocket] = asyncio.create_task(self._sender(websocket, client_id))
         logger.info(f"WebSocket client connected: {client_id}")
 
     async def disconnect(self, websocket: WebSocket, client_id: str):
         """Unregister and close a WebSocket connection."""
         if client_id in self.active_connections:
-            self.active_connections[client_id].remove(websocket)
+            self.active_connections[client_id].discard(websocket)
             if not self.active_connections[client_id]:
                 del self.active_connections[client_id]
 
+        self.connection_clients.pop(websocket, None)
+
         if websocket in self.subscriptions:
             del self.subscriptions[websocket]
 
+        self.outboxes.pop(websocket, None)
+        sender = self.senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
+
         logger.info(f"WebSocket client disconnected: {client_id}")
 
+    async def _sender(self, websocket: WebSocket, client_id: str):
+        """Drain a connection's outbox, disconnecting it if a send fails."""
+        outbox = self.outboxes[websocket]
+        try:
+            while True:
+                await websocket.send_text(await outbox.get())
+        except Exception as e:
+            logger.warning(f"Failed to send message to WebSocket: {e}")
+            await self.disconnect(websocket, client_id)
+
+    def send(self, websocket: WebSocket, message: dict, droppable: bool = True) -> bool:
+        """Queue a message for one connection; replies are droppable under backpressure."""
+        return self.send_encoded(websocket, orjson.dumps(message).decode(), droppable)
+
+    def send_encoded(self, websocket: WebSocket, frame: str, droppable: bool = True) -> bool:
+        """Queue an already encoded JSON frame for one connection."""
+        outbox = self.outboxes.get(websocket)
+        if outbox is None:
+            return False
+        return outbox.put(frame, droppable)
+
     async def subscribe(self, websocket: WebSocket, channel: str):
         """Subscribe connection to a channel."""
         if websocket in self.subscriptions:
             self.subscriptions[websocket].add(channel)
             logger.debug(f"Client subscribed to channel: {channel}")
 
+    async def subscribe_many(self, websocket: WebSocket, channels: list[str]):
+        """Subscribe connection to several channels at once."""
+        if websocket in self.subscriptions:
+            self.subscriptions[websocket].update(channels)
+            logger.debug(f"Client subscribed to channels: {channels}")
+
     async def unsubscribe(self, websocket: WebSocket, channel: str):
         """Unsubscribe connection from a channel."""
         if websocket in self.subscriptions:
             self.subscriptions[websocket].discard(channel)
             logger.debug(f"Client unsubscribed from channel: {channel}")
 
+    async def unsubscribe_many(self, websocket: WebSocket, channels: list[str]):
+        """Unsubscribe connection from several channels at once."""
+        if websocket in self.subscriptions:
+            self.subscriptions[websocket].difference_update(channels)
+            logger.debug(f"Client unsubscribed from channels: {channels}")
+
     async def broadcast_to_channel(
         self,
         channel: str,
@@ -57,38 +149,27 @@ class ConnectionManager:
         exclude_connection: Optional[WebSocket] = None,
     ):
         """Broadcast message to all connections subscribed to a channel."""
-        disconnected = []
-
-        for websocket, channels in self.subscriptions.items():
-            if channel in channels and websocket != exclude_connection:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.warning(f"Failed to send message to WebSocket: {e}")
-                    disconnected.append(websocket)
-
-        # Clean up disconnected connections
-        for websocket in disconnected:
-            # Find and remove from active connections
-            for client_id, conns in list(self.active_connections.items()):
-                if websocket in conns:
-                    await self.disconnect(websocket, client_id)
+        targets = [
+            websocket
+            for websocket, channels in self.subscriptions.items()
+            if channel in channels and websocket != exclude_connection
+        ]
+        self._fan_out(message, targets)
 
     async def broadcast_to_all(self, message: dict):
         """Broadcast message to all connected clients."""
-        disconnected = []
-
-        for client_id, connections in self.active_connections.items():
-            for websocket in connections:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.warning(f"Failed to send message to WebSocket: {e}")
-                    disconnected.append((client_id, websocket))
-
-        # Clean up disconnected connections
-        for client_id, websocket in disconnected:
-            await self.disconnect(websocket, client_id)
+        self._fan_out(message, list(self.outboxes))
+
+    def _fan_out(self, message: dict, targets: list[WebSocket]):
+        """Encode a message once and queue it, undroppable, on every target's outbox."""
+        if not targets:
+            return
+
+        frame = orjson.dumps(message).decode()
+        for websocket in targets:
+            outbox = self.outboxes.get(websocket)
+            if outbox is not None:
+                outbox.put(frame, droppable=False)
 
     def get_subscriptions(self, websocket: WebSocket) -> set[str]:
         """Get channels subscribed by a connection."""
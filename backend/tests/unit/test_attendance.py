@@ -0,0 +1,340 @@
+"""Unit tests for attendance pagination, repository queries and status caching."""
+
+import base64
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.attendance import _attendance_page, _decode_cursor, _encode_cursor
+from app.core.redis import CacheService
+from app.models.attendance import Attendance
+from app.models.person import Person
+from app.repositories.attendance import AttendanceRepository
+from app.schemas.common import PaginationMeta
+from app.schemas.person import AttendanceResponse
+from app.services.attendance_service import AttendanceService
+
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+BASE_DATE = datetime(2024, 1, 31, 9, 0, 0)
+
+
+class FakeAsyncRedis:
+    """Minimal in-memory stand-in for the asyncio Redis client."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def delete(self, key):
+        return 1 if self.store.pop(key, None) is not None else 0
+
+
+class FakeRedisClient:
+    """RedisClient stand-in exposing only the asyncio client."""
+
+    def __init__(self):
+        self.async_client = FakeAsyncRedis()
+
+
+@pytest.fixture
+async def db_session():
+    """Create an in-memory database session with a few attendance rows."""
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Person.__table__.create)
+        await conn.run_sync(Attendance.__table__.create)
+
+    AsyncSessionLocal = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async with AsyncSessionLocal() as session:
+        session.add(Person(id="PERSON-1", first_name="Ada", last_name="Lovelace", person_type="employee"))
+        session.add(Person(id="PERSON-2", first_name="Alan", last_name="Turing", person_type="employee"))
+
+        # Ten days for PERSON-1 (every third one late), two days for PERSON-2
+        for day in range(10):
+            session.add(
+                Attendance(
+                    id=f"ATT-1-{day:02d}",
+                    person_id="PERSON-1",
+                    attendance_date=BASE_DATE - timedelta(days=day),
+                    status="late" if day % 3 == 0 else "present",
+                )
+            )
+        for day in range(2):
+            session.add(
+                Attendance(
+                    id=f"ATT-2-{day:02d}",
+                    person_id="PERSON-2",
+                    attendance_date=BASE_DATE - timedelta(days=day),
+                    status="present",
+                )
+            )
+        await session.commit()
+
+        yield session
+
+    await engine.dispose()
+
+
+class TestCursorEncoding:
+    """Tests for the opaque keyset cursor."""
+
+    def test_cursor_round_trip(self):
+        """Test that an encoded cursor decodes to the same seek key."""
+        key = (datetime(2024, 1, 15, 8, 30, 12, 345678), str(uuid4()))
+
+        assert _decode_cursor(_encode_cursor(key)) == key
+
+    def test_cursor_is_url_safe(self):
+        """Test that the cursor can be passed as a query parameter unescaped."""
+        cursor = _encode_cursor((BASE_DATE, "ATT-1-00"))
+
+        assert "+" not in cursor
+        assert "/" not in cursor
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not-a-cursor",
+            base64.urlsafe_b64encode(b"[]").decode(),
+            base64.urlsafe_b64encode(b'{"id": "x"}').decode(),
+            base64.urlsafe_b64encode(b'{"d": "yesterday", "id": "x"}').decode(),
+        ],
+    )
+    def test_malformed_cursor_returns_400(self, cursor):
+        """Test that malformed cursors are rejected with 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            _decode_cursor(cursor)
+
+        assert exc_info.value.status_code == 400
+
+
+class TestAttendancePageSerialization:
+    """Tests for the list-page JSON serializer."""
+
+    @pytest.mark.asyncio
+    async def test_page_body_matches_schema(self, db_session):
+        """Test that the fast list serializer emits what AttendanceResponse would."""
+        records = await AttendanceRepository(db_session).get_by_person("PERSON-1", limit=2)
+
+        response = _attendance_page(records, PaginationMeta(pageSize=2))
+        body = orjson.loads(response.body)
+
+        assert body["data"] == [
+            AttendanceResponse.model_validate(r).model_dump(mode="json", by_alias=True) for r in records
+        ]
+        assert body["meta"]["pageSize"] == 2
+
+
+class TestAttendanceRepositoryQueries:
+    """Tests for attendance page and count queries."""
+
+    @pytest.mark.asyncio
+    async def test_count_by_person(self, db_session):
+        """Test counting a person's records with date and status filters."""
+        repo = AttendanceRepository(db_session)
+
+        assert await repo.count_by_person("PERSON-1") == 10
+        assert await repo.count_by_person("PERSON-1", status="late") == 4
+        assert await repo.count_by_person(
+            "PERSON-1",
+            from_date=BASE_DATE - timedelta(days=4),
+            to_date=BASE_DATE,
+        ) == 5
+
+    @pytest.mark.asyncio
+    async def test_get_by_person_pages_newest_first(self, db_session):
+        """Test that person pages are ordered newest first and honour offset."""
+        repo = AttendanceRepository(db_session)
+
+        first = await repo.get_by_person("PERSON-1", limit=3)
+        second = await repo.get_by_person("PERSON-1", limit=3, offset=3)
+
+        assert [r.id for r in first] == ["ATT-1-00", "ATT-1-01", "ATT-1-02"]
+        assert [r.id for r in second] == ["ATT-1-03", "ATT-1-04", "ATT-1-05"]
+        assert first[0].person_name == "Ada Lovelace"
+
+    @pytest.mark.asyncio
+    async def test_person_name_and_attendance(self, db_session):
+        """Test fetching a person's name with their attendance for a day."""
+        repo = AttendanceRepository(db_session)
+
+        name, attendance = await repo.get_person_name_and_attendance("PERSON-2", BASE_DATE)
+        assert name == "Alan Turing"
+        assert attendance.id == "ATT-2-00"
+
+        name, attendance = await repo.get_person_name_and_attendance("PERSON-2", BASE_DATE - timedelta(days=5))
+        assert name == "Alan Turing"
+        assert attendance is None
+
+        assert await repo.get_person_name_and_attendance("PERSON-404", BASE_DATE) is None
+
+    @pytest.mark.asyncio
+    async def test_range_queries_match_count(self, db_session):
+        """Test that range page and count agree for the same filters."""
+        repo = AttendanceRepository(db_session)
+        from_date, to_date = BASE_DATE - timedelta(days=1), BASE_DATE
+
+        records = await repo.get_in_range(from_date, to_date, limit=100)
+        total = await repo.count_in_range(from_date, to_date)
+
+        assert total == len(records) == 4
+
+        late = await repo.get_in_range(from_date, to_date, status="late")
+        assert [r.id for r in late] == ["ATT-1-00"]
+        assert await repo.count_in_range(from_date, to_date, status="late") == 1
+
+    @pytest.mark.asyncio
+    async def test_person_stats_aggregate(self, db_session):
+        """Test that person statistics are aggregated per status."""
+        service = AttendanceService(db_session)
+
+        stats = await service.get_person_attendance_stats(
+            "PERSON-1", BASE_DATE - timedelta(days=30), BASE_DATE
+        )
+
+        assert stats["total_attendance_records"] == 10
+        assert stats["status_breakdown"] == {"present": 6, "late": 4}
+        assert stats["days_present"] == 6
+        assert stats["days_late"] == 4
+        assert stats["days_early_leave"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_daily_attendance(self, db_session):
+        """Test streaming one day's records in a stable order."""
+        service = AttendanceService(db_session)
+
+        streamed = [r.id async for r in service.stream_daily_attendance(BASE_DATE)]
+
+        assert streamed == ["ATT-1-00", "ATT-2-00"]
+
+    @pytest.mark.asyncio
+    async def test_daily_summary_counts_in_sql(self, db_session):
+        """Test the daily summary status counts."""
+        service = AttendanceService(db_session)
+
+        summary = await service.get_daily_attendance_summary(BASE_DATE - timedelta(days=1))
+
+        assert summary["total_persons"] == 2
+        assert summary["present"] == 2
+        assert summary["status_breakdown"] == {"present": 2}
+
+
+class TestListAfter:
+    """Tests for keyset pagination in the attendance service."""
+
+    @pytest.mark.asyncio
+    async def test_next_key_is_last_row_of_page(self, db_session):
+        """Test that a full page returns the seek key of its last row."""
+        service = AttendanceService(db_session)
+        from_date = BASE_DATE - timedelta(days=30)
+
+        records, next_key = await service.list_after(
+            None, 4, person_id="PERSON-1", from_date=from_date, to_date=BASE_DATE
+        )
+
+        assert len(records) == 4
+        assert next_key == (records[-1].attendance_date, records[-1].id)
+
+    @pytest.mark.asyncio
+    async def test_walks_all_pages_without_gaps(self, db_session):
+        """Test that following next keys visits every row exactly once."""
+        service = AttendanceService(db_session)
+        from_date = BASE_DATE - timedelta(days=30)
+
+        seen, key = [], None
+        while True:
+            records, key = await service.list_after(
+                key, 4, person_id="PERSON-1", from_date=from_date, to_date=BASE_DATE
+            )
+            seen.extend(r.id for r in records)
+            if key is None:
+                break
+
+        assert seen == [f"ATT-1-{day:02d}" for day in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_exact_last_page_has_no_next_key(self, db_session):
+        """Test that a page ending exactly on the last row returns no next key."""
+        service = AttendanceService(db_session)
+        from_date = BASE_DATE - timedelta(days=30)
+
+        records, next_key = await service.list_after(
+            None, 2, from_date=from_date, to_date=BASE_DATE, status="present", person_id="PERSON-2"
+        )
+
+        assert len(records) == 2
+        assert next_key is None
+
+
+class TestPersonStatusCache:
+    """Tests for the attendance status and report caches."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a cache service backed by the fake client."""
+        cache = CacheService()
+        cache.redis = FakeRedisClient()
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_round_trip_with_ttl(self, cache):
+        """Test that a cached status is returned and expires after the status TTL."""
+        status = {"person_id": "PERSON-1", "is_checked_in": True, "check_in_time": BASE_DATE.isoformat()}
+
+        assert await cache.cache_person_status("PERSON-1", status) is True
+        assert await cache.get_cached_person_status("PERSON-1") == status
+        assert cache.redis.async_client.ttls["attendance:status:PERSON-1"] == CacheService.PERSON_STATUS_TTL
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self, cache):
+        """Test that invalidation drops the cached status."""
+        await cache.cache_person_status("PERSON-1", {"is_checked_in": False})
+
+        assert await cache.invalidate_person_status("PERSON-1") is True
+        assert await cache.get_cached_person_status("PERSON-1") is None
+        assert await cache.invalidate_person_status("PERSON-1") is False
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_a_cache_miss(self, cache):
+        """Test that Redis failures degrade to a miss instead of raising."""
+
+        async def broken(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        cache.redis.async_client.get = broken
+        cache.redis.async_client.set = broken
+
+        assert await cache.get_cached_person_status("PERSON-1") is None
+        assert await cache.cache_person_status("PERSON-1", {}) is False
+
+    @pytest.mark.asyncio
+    async def test_daily_report_ttl_depends_on_day(self, cache):
+        """Test that today's report expires quickly and past reports live for a day."""
+        today = datetime.utcnow().date()
+        past = today - timedelta(days=3)
+
+        await cache.cache_daily_report(today, {"total_persons": 1})
+        await cache.cache_daily_report(past, {"total_persons": 2})
+
+        ttls = cache.redis.async_client.ttls
+        assert ttls[f"attendance:daily:{today.isoformat()}"] == CacheService.DAILY_REPORT_TTL
+        assert ttls[f"attendance:daily:{past.isoformat()}"] == CacheService.DAILY_REPORT_PAST_TTL
+        assert await cache.get_cached_daily_report(past) == {"total_persons": 2}
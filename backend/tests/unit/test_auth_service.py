@@ -1,18 +1,42 @@
 """Unit tests for authentication service and security module."""
 
+import asyncio
 import json
-from datetime import timedelta
+import threading
+import time
+from datetime import datetime, timedelta
 
 import pytest
-
+from fastapi import FastAPI
+from fastapi.security import HTTPAuthorizationCredentials
+from httpx import AsyncClient
+from passlib.hash import bcrypt
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.auth import (
+    _REVOKE_LIVE_SESSION,
+    _USER_WITH_ROLE_BY_EMAIL,
+    _token_claims,
+    purge_expired_sessions,
+)
+from app.api.v1 import auth as auth_api
+from app.api.v1.auth import router as auth_router
+from app.core import deps, security
 from app.core.config import settings
+from app.core.deps import get_current_user, invalidate_token
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     hash_password,
+    hash_password_async,
+    new_token_id,
+    verify_and_update_password,
     verify_password,
     verify_token,
 )
+from app.db.session import get_db
+from app.models.user import Role, User, UserSession, parse_permissions
 
 
 class TestPasswordHashing:
@@ -77,6 +101,61 @@ class TestPasswordHashing:
         assert verify_password("p@ssw0rd!#$%^&*", hashed) is False
 
 
+class TestPasswordUpgrade:
+    """Tests for transparent bcrypt -> Argon2id password upgrades."""
+
+    def test_new_hashes_use_argon2id(self):
+        """Test that new password hashes are Argon2id."""
+        assert hash_password("secure_password_123").startswith("$argon2id$")
+
+    @pytest.mark.asyncio
+    async def test_bcrypt_hash_verifies_and_is_upgraded(self):
+        """Test that a legacy bcrypt hash verifies and yields an Argon2id replacement."""
+        legacy = bcrypt.using(rounds=4).hash("secure_password_123")
+
+        verified, new_hash = await verify_and_update_password("secure_password_123", legacy)
+
+        assert verified is True
+        assert new_hash.startswith("$argon2id$")
+        assert verify_password("secure_password_123", new_hash)
+
+    @pytest.mark.asyncio
+    async def test_current_hash_is_not_upgraded(self):
+        """Test that an Argon2id hash verifies without a replacement."""
+        hashed = hash_password("secure_password_123")
+
+        assert await verify_and_update_password("secure_password_123", hashed) == (True, None)
+        assert await verify_and_update_password("wrong", hashed) == (False, None)
+
+
+class TestHashingConcurrency:
+    """Tests for bounding concurrent password hashing."""
+
+    @pytest.mark.asyncio
+    async def test_hashing_is_bounded_by_slots(self, monkeypatch):
+        """Test that no more hashes run at once than there are hashing slots."""
+        lock = threading.Lock()
+        running, peak = 0, 0
+
+        def slow_hash(password):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return password
+
+        monkeypatch.setattr(security, "hash_password", slow_hash)
+        monkeypatch.setattr(security, "_hashing_slots", asyncio.Semaphore(2))
+
+        results = await asyncio.gather(*(hash_password_async(f"pw-{i}") for i in range(6)))
+
+        assert results == [f"pw-{i}" for i in range(6)]
+        assert peak == 2
+
+
 class TestTokenCreation:
     """Tests for JWT token creation."""
 
@@ -280,3 +359,214 @@ class TestTokenSecurity:
 
         with pytest.raises(Exception):
             verify_token(modified_token)
+
+
+class TestCurrentUserCache:
+    """Tests for the per-token cache in get_current_user."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self, monkeypatch):
+        """Give each test its own cache."""
+        monkeypatch.setattr(deps, "_token_cache", {})
+
+    @pytest.mark.asyncio
+    async def test_token_is_verified_once(self, monkeypatch):
+        """Test that repeated requests with one token reuse the verified user."""
+        calls = []
+        monkeypatch.setattr(deps, "verify_token", lambda token: calls.append(token) or verify_token(token))
+        token = create_access_token({"sub": "user-1", "permissions": ["persons:read"]})
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        first = await get_current_user(credentials)
+        second = await get_current_user(credentials)
+
+        assert second is first
+        assert len(calls) == 1
+        assert token not in str(list(deps._token_cache))
+        invalidate_token(token)
+        assert await get_current_user(credentials) is not first
+
+    @pytest.mark.asyncio
+    async def test_entry_does_not_outlive_token(self):
+        """Test that a token expiring before the TTL is not cached past its exp."""
+        token = create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=5))
+        await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+        (expires_at, _), = deps._token_cache.values()
+        assert expires_at - time.monotonic() <= 5
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, monkeypatch):
+        """Test that a full cache drops its oldest entry."""
+        monkeypatch.setattr(deps, "TOKEN_CACHE_MAXSIZE", 2)
+        tokens = [create_access_token({"sub": f"user-{i}"}) for i in range(3)]
+        for token in tokens:
+            await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+        assert list(deps._token_cache) == [deps._token_key(t) for t in tokens[1:]]
+
+
+class TestUserRoleLoading:
+    """Tests for loading a user's role alongside the user."""
+
+    @pytest.fixture
+    async def db_session(self):
+        """Create an in-memory database with one role and two users."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Role.__table__.create)
+            await conn.run_sync(User.__table__.create)
+
+        AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with AsyncSessionLocal() as session:
+            session.add(Role(id="operator", name="Operator", permissions=json.dumps(["cameras:read"])))
+            session.add(User(email="op@example.com", name="Op", hashed_password="x", role_id="operator"))
+            session.add(User(email="ghost@example.com", name="Ghost", hashed_password="x", role_id="missing"))
+            await session.commit()
+
+            yield session
+
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_role_is_joined_with_user(self, db_session):
+        """Test that the login statement fetches the role in the user query."""
+        result = await db_session.execute(_USER_WITH_ROLE_BY_EMAIL, {"email": "op@example.com"})
+        user = result.scalar_one()
+
+        assert user.role.id == "operator"
+        assert json.loads(user.role.permissions) == ["cameras:read"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_role_loads_as_none(self, db_session):
+        """Test that a user whose role row is missing still loads, with no role."""
+        result = await db_session.execute(_USER_WITH_ROLE_BY_EMAIL, {"email": "ghost@example.com"})
+
+        assert result.scalar_one().role is None
+
+    @pytest.mark.asyncio
+    async def test_token_claims_embed_permission_list(self, db_session):
+        """Test that token claims carry the role's permissions as a list."""
+        result = await db_session.execute(_USER_WITH_ROLE_BY_EMAIL, {"email": "op@example.com"})
+        user = result.scalar_one()
+
+        claims = _token_claims(user, user.role)
+        payload = verify_token(create_access_token(data=claims))
+
+        assert payload["permissions"] == ["cameras:read"]
+        assert _token_claims(user, None)["permissions"] == []
+
+    def test_permissions_are_parsed_once_per_value(self):
+        """Test that repeated parses of the same permissions string hit the memo."""
+        raw = json.dumps(["attendance:read", "attendance:write"])
+        parse_permissions(raw)
+        hits = parse_permissions.cache_info().hits
+
+        assert parse_permissions(raw) == ("attendance:read", "attendance:write")
+        assert parse_permissions.cache_info().hits == hits + 1
+
+    def test_role_permission_list(self):
+        """Test that Role.permission_list decodes the column and treats empty as no permissions."""
+        assert Role(id="viewer", name="Viewer", permissions='["cameras:read"]').permission_list == ["cameras:read"]
+        assert Role(id="none", name="None", permissions="").permission_list == []
+
+
+class TestRefreshTokenStorage:
+    """Tests for tracking and revoking refresh tokens by JWT ID."""
+
+    @pytest.fixture
+    async def db_session(self):
+        """Create an in-memory database with a live and an expired session."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(UserSession.__table__.create)
+
+        AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with AsyncSessionLocal() as session:
+            session.add(
+                UserSession(
+                    user_id="user-1",
+                    jti="a" * 32,
+                    expires_at=datetime.utcnow() + timedelta(days=1),
+                )
+            )
+            session.add(
+                UserSession(
+                    user_id="user-2",
+                    jti="b" * 32,
+                    expires_at=datetime.utcnow() - timedelta(days=1),
+                )
+            )
+            await session.commit()
+
+            yield session
+
+        await engine.dispose()
+
+    def test_refresh_tokens_carry_unique_jti(self):
+        """Test that each refresh token gets its own 32-char jti, or keeps the given one."""
+        first = verify_token(create_refresh_token(data={"sub": "user-1"}))
+        second = verify_token(create_refresh_token(data={"sub": "user-1"}))
+        jti = new_token_id()
+
+        assert len(first["jti"]) == 32
+        assert first["jti"] != second["jti"]
+        assert verify_token(create_refresh_token(data={"sub": "user-1", "jti": jti}))["jti"] == jti
+
+    def test_access_tokens_have_no_jti(self):
+        """Test that access tokens cannot be presented as refresh tokens."""
+        assert "jti" not in verify_token(create_access_token(data={"sub": "user-1"}))
+
+    @staticmethod
+    async def _revoke(db_session, jti):
+        """Run the refresh endpoint's revoke-and-return statement."""
+        result = await db_session.execute(_REVOKE_LIVE_SESSION, {"jti": jti, "now": datetime.utcnow()})
+        return result.scalar_one_or_none()
+
+    @pytest.mark.asyncio
+    async def test_revoke_returns_owner_once(self, db_session):
+        """Test that a live token is revoked in one statement and cannot be reused."""
+        assert await self._revoke(db_session, "a" * 32) == "user-1"
+        assert await self._revoke(db_session, "a" * 32) is None
+
+    @pytest.mark.asyncio
+    async def test_expired_or_missing_jti_is_not_revoked(self, db_session):
+        """Test that expired sessions and tokens without a jti match nothing."""
+        assert await self._revoke(db_session, "b" * 32) is None
+        assert await self._revoke(db_session, None) is None
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_and_returns_empty_204(self, db_session):
+        """Test that logout deletes the session by jti and answers 204 with no body."""
+
+        async def session_override():
+            yield db_session
+
+        app = FastAPI()
+        app.include_router(auth_router)
+        app.dependency_overrides[get_db] = session_override
+        token = create_refresh_token(data={"sub": "user-1", "jti": "a" * 32})
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.post("/auth/logout", json={"refreshToken": token})
+            again = await client.post("/auth/logout", json={"refreshToken": token})
+            garbage = await client.post("/auth/logout", json={"refreshToken": "not-a-jwt"})
+
+        assert first.status_code == again.status_code == garbage.status_code == 204
+        assert first.content == b""
+        assert await self._revoke(db_session, "a" * 32) is None
+
+    @pytest.mark.asyncio
+    async def test_purge_deletes_only_expired_sessions(self, db_session, monkeypatch):
+        """Test that the periodic cleanup drops expired sessions and keeps live ones."""
+        monkeypatch.setattr(
+            auth_api, "AsyncSessionLocal", sessionmaker(db_session.bind, class_=AsyncSession)
+        )
+
+        assert await purge_expired_sessions() == 1
+        assert await purge_expired_sessions() == 0
+        assert await self._revoke(db_session, "a" * 32) == "user-1"
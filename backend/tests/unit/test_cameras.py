@@ -0,0 +1,358 @@
+"""Unit tests for camera permissions, repository paging, counts, response schemas, imports and exports."""
+
+import csv
+import io
+import json
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import cameras as cameras_api
+from app.core.deps import CurrentUser, get_current_user
+from app.db.session import get_db
+from app.models.camera import Camera, CameraGroup
+from app.repositories.camera import CameraRepository
+from app.schemas.common import PaginationMeta
+from app.schemas.camera import CameraGroupResponse, CameraResponse
+from app.services.camera_service import CameraService
+
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+@pytest.fixture
+async def db_session():
+    """Create an in-memory database with two camera groups."""
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(CameraGroup.__table__.create)
+        await conn.run_sync(Camera.__table__.create)
+
+    AsyncSessionLocal = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async with AsyncSessionLocal() as session:
+        session.add(CameraGroup(id="GROUP-A", name="Lobby"))
+        session.add(CameraGroup(id="GROUP-B", name="Parking"))
+
+        # Five cameras in the lobby (the odd ones in error), one in parking
+        for i in range(5):
+            session.add(
+                Camera(
+                    id=f"CAM-A-{i}",
+                    name=f"Lobby {i}",
+                    rtsp_url=f"rtsp://lobby/{i}",
+                    group_id="GROUP-A",
+                    status="error" if i % 2 else "live",
+                )
+            )
+        session.add(Camera(id="CAM-B-0", name="Parking 0", rtsp_url="rtsp://parking/0", group_id="GROUP-B"))
+        await session.commit()
+
+        yield session
+
+    await engine.dispose()
+
+
+class TestCameraRepositoryPaging:
+    """Tests for SQL-side paging and counting of cameras."""
+
+    @pytest.mark.asyncio
+    async def test_group_pages_and_count(self, db_session):
+        """Test that group listing pages in SQL and the count matches the group size."""
+        service = CameraService(db_session)
+
+        first = await service.list_cameras_by_group("GROUP-A", skip=0, limit=2)
+        last = await service.list_cameras_by_group("GROUP-A", skip=4, limit=2)
+
+        assert [c.id for c in first] == ["CAM-A-0", "CAM-A-1"]
+        assert [c.id for c in last] == ["CAM-A-4"]
+        assert await service.repo.count_by_group("GROUP-A") == 5
+        assert await service.repo.count_by_group("GROUP-X") == 0
+
+    @pytest.mark.asyncio
+    async def test_unpaged_group_returns_all(self, db_session):
+        """Test that callers without a limit still get the whole group."""
+        cameras = await CameraRepository(db_session).get_by_group("GROUP-A")
+
+        assert len(cameras) == 5
+
+    @pytest.mark.asyncio
+    async def test_status_pages_and_counts(self, db_session):
+        """Test status filtering with SQL paging and aggregate counts."""
+        repo = CameraRepository(db_session)
+
+        page = await repo.get_by_status("error", skip=1, limit=5)
+
+        assert len(page) == 1
+        assert await repo.count_by_status("error") == 2
+        assert await repo.count_all() == 6
+        assert await repo.count_active() == 6
+
+
+class TestCameraSummary:
+    """Tests for the single-query camera summary."""
+
+    @pytest.mark.asyncio
+    async def test_summary_counts(self, db_session):
+        """Test every summary dimension, including groups, from one aggregate query."""
+        camera = await db_session.get(Camera, "CAM-B-0")
+        camera.enable_recording = True
+        camera.enable_detection = False
+        await db_session.commit()
+
+        summary = await CameraService(db_session).get_summary()
+
+        assert summary == {
+            "total_cameras": 6,
+            "active_cameras": 6,
+            "offline_cameras": 2,
+            "recording_cameras": 1,
+            "detection_enabled": 5,
+            "total_groups": 2,
+            "health_check_status": "warning",
+        }
+
+
+class TestCameraResponseSchema:
+    """Tests for building camera responses straight from ORM rows."""
+
+    @pytest.mark.asyncio
+    async def test_camera_response_from_orm(self, db_session):
+        """Test that model_validate maps every column and dumps camelCase timestamps."""
+        camera = await CameraRepository(db_session).get_by_id("CAM-A-1")
+
+        body = CameraResponse.model_validate(camera).model_dump(by_alias=True)
+
+        assert body["id"] == "CAM-A-1"
+        assert body["rtsp_url"] == "rtsp://lobby/1"
+        assert body["status"] == "error"
+        assert body["createdAt"] == camera.created_at
+        assert body["updatedAt"] == camera.updated_at
+        assert "created_at" not in body
+
+    @pytest.mark.asyncio
+    async def test_group_response_from_orm(self, db_session):
+        """Test that camera groups validate from ORM rows the same way."""
+        group = await db_session.get(CameraGroup, "GROUP-B")
+
+        body = CameraGroupResponse.model_validate(group).model_dump(by_alias=True)
+
+        assert body["name"] == "Parking"
+        assert body["createdAt"] == group.created_at
+
+    @pytest.mark.asyncio
+    async def test_page_body_matches_schema(self, db_session):
+        """Test that the fast list serializer emits what CameraResponse would."""
+        cameras = await CameraRepository(db_session).get_by_group("GROUP-A", limit=2)
+
+        response = cameras_api._camera_page(cameras, PaginationMeta(page=1, pageSize=2, total=5, totalPages=3))
+        body = orjson.loads(response.body)
+
+        assert body["success"] is True
+        assert body["data"] == [
+            CameraResponse.model_validate(c).model_dump(mode="json", by_alias=True) for c in cameras
+        ]
+        assert body["meta"]["totalPages"] == 3
+
+
+class TestCameraExportStream:
+    """Tests for the streamed camera export."""
+
+    @pytest.fixture
+    def session_factory(self, db_session, monkeypatch):
+        """Point the export stream's own session at the test database."""
+        monkeypatch.setattr(cameras_api, "AsyncSessionLocal", lambda: db_session)
+
+    @pytest.mark.asyncio
+    async def test_stream_rows_match_list_export(self, db_session):
+        """Test that streamed export rows equal the materialized export."""
+        service = CameraService(db_session)
+
+        streamed = [row async for row in service.stream_export_rows("GROUP-A")]
+
+        assert streamed == await service.export_cameras("GROUP-A")
+        assert [row["id"] for row in streamed] == [f"CAM-A-{i}" for i in range(5)]
+        assert "password" not in streamed[0]
+
+    @pytest.mark.asyncio
+    async def test_csv_download_is_chunked(self, session_factory, monkeypatch):
+        """Test that the CSV stream flushes every EXPORT_CHUNK_ROWS rows and parses back."""
+        monkeypatch.setattr(cameras_api, "EXPORT_CHUNK_ROWS", 2)
+
+        chunks = [chunk async for chunk in cameras_api._export_csv(None, include_credentials=True)]
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+
+        assert len(chunks) == 3
+        assert len(rows) == 6
+        assert list(rows[0]) == CameraService.export_fields(include_credentials=True)
+
+    @pytest.mark.asyncio
+    async def test_json_download_shape(self, session_factory):
+        """Test that the JSON stream keeps the {"cameras": [...], "count": n} shape."""
+        chunks = [chunk async for chunk in cameras_api._export_json("GROUP-B", include_credentials=False)]
+        body = json.loads(b"".join(chunks))
+
+        assert body["count"] == 1
+        assert body["cameras"][0]["name"] == "Parking 0"
+
+
+class TestCameraImport:
+    """Tests for bulk camera import."""
+
+    @pytest.mark.asyncio
+    async def test_import_skips_duplicates_and_reports_invalid_rows(self, db_session):
+        """Test that existing and repeated RTSP URLs are skipped and bad rows reported."""
+        service = CameraService(db_session)
+
+        result = await service.import_cameras(
+            [
+                {"name": "Gate", "rtsp_url": "rtsp://gate/1"},
+                {"name": "Gate again", "rtsp_url": "rtsp://gate/1"},
+                {"name": "Old lobby", "rtsp_url": "rtsp://lobby/0"},
+                {"name": "Bad", "rtsp_url": "http://not-rtsp"},
+                {"name": "Dock", "rtsp_url": "rtsp://dock/1", "codec": "MJPEG"},
+            ],
+            group_id="GROUP-B",
+        )
+
+        assert result["imported_count"] == 2
+        assert result["skipped_count"] == 2
+        assert [e["row"] for e in result["errors"]] == [4]
+        assert await service.repo.count_by_group("GROUP-B") == 3
+
+        dock = await service.repo.get_by_rtsp_url("rtsp://dock/1")
+        assert dock.codec == "mjpeg"
+        assert dock.status == "idle"
+        assert dock.created_at is not None
+
+    @pytest.mark.asyncio
+    async def test_large_import_in_one_batch(self, db_session):
+        """Test importing more rows than the COPY threshold (add_all outside PostgreSQL)."""
+        service = CameraService(db_session)
+        rows = [{"name": f"Cam {i}", "rtsp_url": f"rtsp://bulk/{i}"} for i in range(150)]
+
+        result = await service.import_cameras(rows)
+
+        assert result["imported_count"] == 150
+        assert await service.repo.count_all() == 156
+
+
+class TestCameraPermissions:
+    """Tests for the route-level camera permission checks."""
+
+    @pytest.fixture
+    def client_for(self):
+        """Build a client for the cameras router as a user with the given permissions."""
+        opened = []
+
+        async def fake_db():
+            opened.append(True)
+            yield None
+
+        def build(permissions):
+            app = FastAPI()
+            app.include_router(cameras_api.router, prefix="/cameras")
+            app.dependency_overrides[get_current_user] = lambda: CurrentUser("u1", "u1@example.com", "viewer", permissions)
+            app.dependency_overrides[get_db] = fake_db
+            return TestClient(app), opened
+
+        return build
+
+    def test_denied_before_db_session(self, client_for):
+        """Test that a missing permission is rejected with the route's message and no DB session."""
+        client, opened = client_for(["attendance:read"])
+
+        response = client.get("/cameras")
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "You don't have permission to view cameras"
+        assert opened == []
+
+    def test_write_routes_need_write_permission(self, client_for):
+        """Test that read-only users cannot reach write routes."""
+        client, _ = client_for(["cameras:read"])
+
+        response = client.delete("/cameras/CAM-1")
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "You don't have permission to manage cameras"
+
+    def test_wildcard_and_set_lookup(self):
+        """Test that permission checks honour the wildcard and exact entries."""
+        admin = CurrentUser("u1", "a@example.com", "admin", ["*"])
+        viewer = CurrentUser("u2", "v@example.com", "viewer", ["cameras:read", "attendance:read"])
+
+        assert admin.has_permission("cameras:write")
+        assert viewer.has_permission("cameras:read")
+        assert not viewer.has_permission("cameras:write")
+        assert viewer.permissions == ["cameras:read", "attendance:read"]
+
+
+class TestCameraFileEndpoints:
+    """Tests for the multipart import and the streamed export routes."""
+
+    @pytest.fixture
+    def app(self, db_session, monkeypatch):
+        """Build an app serving the cameras router against the test database."""
+
+        async def session_override():
+            yield db_session
+
+        monkeypatch.setattr(cameras_api, "AsyncSessionLocal", lambda: db_session)
+        app = FastAPI()
+        app.include_router(cameras_api.router, prefix="/cameras")
+        app.dependency_overrides[get_current_user] = lambda: CurrentUser("u1", "a@example.com", "admin", ["*"])
+        app.dependency_overrides[get_db] = session_override
+        return app
+
+    @pytest.mark.asyncio
+    async def test_csv_upload_is_imported_in_batches(self, app, db_session, monkeypatch):
+        """Test that an uploaded CSV is parsed in batches with file-wide row numbers."""
+        monkeypatch.setattr(cameras_api, "IMPORT_CHUNK_ROWS", 2)
+        upload = "\ufeffname,rtsp_url\nGate,rtsp://gate/1\nOld,rtsp://lobby/0\nBad,http://x\nDock,rtsp://dock/1\n"
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post(
+                "/cameras/import",
+                files={"file": ("cameras.csv", upload.encode(), "text/csv")},
+                data={"group_id": "GROUP-B"},
+            )
+
+        body = response.json()["data"]
+        assert body["success"] is True
+        assert body["imported_count"] == 2
+        assert body["skipped_count"] == 1
+        assert [e["row"] for e in body["errors"]] == [3]
+        assert await CameraRepository(db_session).count_by_group("GROUP-B") == 3
+
+    @pytest.mark.asyncio
+    async def test_json_upload(self, app):
+        """Test importing an uploaded JSON export."""
+        upload = json.dumps({"cameras": [{"name": "Roof", "rtsp_url": "rtsp://roof/1"}], "count": 1})
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post(
+                "/cameras/import",
+                files={"file": ("cameras.json", upload.encode(), "application/json")},
+                data={"format": "json"},
+            )
+
+        assert response.json()["data"]["imported_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_export_route_streams_attachment(self, app):
+        """Test that /export streams a CSV attachment rather than resolving as a camera id."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/cameras/export", params={"group_id": "GROUP-B"})
+
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == 'attachment; filename="cameras_GROUP-B.csv"'
+        assert [row["id"] for row in csv.DictReader(io.StringIO(response.text))] == ["CAM-B-0"]
@@ -0,0 +1,750 @@
+"""Unit tests for detection frame intake and response serialization."""
+
+import asyncio
+import base64
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import detections as detections_api
+from app.core.deps import CurrentUser, get_current_user, require_permission
+from app.core.redis import CacheService
+from app.models.detection import Detection, DetectionEventLog
+from app.repositories.detection import DetectionRepository
+from app.schemas.detection import DetectionEventLogResponse, DetectionProviderConfigUpdate, DetectionResponse
+from app.services.detection_service import DetectionService
+from app.services.websocket_manager import ConnectionManager, Outbox, ws_manager
+
+
+FRAME = b"\xff\xd8\xff\xe0 not really a jpeg \xff\xd9"
+CREATED = datetime(2024, 1, 31, 9, 0, 0)
+
+
+def make_detection(**overrides):
+    """Build a stand-in for a stored Detection row."""
+    row = dict(
+        id="DET-1",
+        camera_id="CAM-1",
+        detection_type="face",
+        confidence=0.92,
+        bbox_x=0.1,
+        bbox_y=0.2,
+        bbox_width=0.3,
+        bbox_height=0.4,
+        person_name="Ada Lovelace",
+        person_id="PERSON-1",
+        face_encoding=None,
+        is_processed=True,
+        processing_status="completed",
+        frame_number=42,
+        frame_timestamp=CREATED,
+        created_at=CREATED,
+        updated_at=CREATED,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+def make_event(**overrides):
+    """Build a stand-in for a stored DetectionEventLog row."""
+    row = dict(
+        id="EVT-1",
+        detection_id="DET-1",
+        camera_id="CAM-1",
+        event_type="person_recognized",
+        severity="info",
+        message="Recognized Ada Lovelace",
+        person_id="PERSON-1",
+        person_name="Ada Lovelace",
+        confidence_score=0.92,
+        action_taken=None,
+        action_timestamp=None,
+        source_system="detection_service",
+        created_at=CREATED,
+        updated_at=CREATED,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+class FakeAsyncRedis:
+    """Minimal in-memory stand-in for the asyncio Redis client."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def delete(self, key):
+        return 1 if self.store.pop(key, None) is not None else 0
+
+
+class FakeQueueRepository:
+    """Counts queue statistics queries."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_queue_stats(self):
+        self.calls += 1
+        return {"pending": 2, "processing": 1, "completed": 5, "failed": 0}
+
+
+class FakeConfigRepository:
+    """Returns one active provider config and accepts updates."""
+
+    async def get_by_id(self, config_id):
+        return SimpleNamespace(id=config_id)
+
+    async def update(self, config_id, **fields):
+        return SimpleNamespace(id=config_id, **fields)
+
+
+class FakeDetectionService:
+    """Records the frames it is sent and reports one detection per frame."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_live_detections_json(self, camera_id=None, **filters):
+        return {
+            "detections_json": '[{"id": "DET-1"}, {"id": "DET-2"}]',
+            "total_detections": 2,
+            "last_updated": CREATED,
+            "cache_hit": False,
+        }
+
+    async def send_frame_for_detection(self, camera_id, frame_data, frame_number=None, frame_timestamp=None):
+        self.calls.append((camera_id, frame_data, frame_number, frame_timestamp))
+        return {
+            "success": True,
+            "camera_id": camera_id,
+            "detection_count": 1,
+            "detections": [make_detection(camera_id=camera_id)],
+            "processing_time_ms": 1,
+        }
+
+
+@pytest.fixture
+def client():
+    """Build a client for the detections router with a recording service."""
+    service = FakeDetectionService()
+    app = FastAPI()
+    app.include_router(detections_api.router, prefix="/detections")
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        "u1", "u1@example.com", "operator", ["detections:read", "detections:write"]
+    )
+    app.dependency_overrides[detections_api.get_detection_service] = lambda: service
+    return TestClient(app), service
+
+
+@pytest.fixture
+async def db_session():
+    """Create an in-memory database with detections for two cameras."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Detection.__table__.create)
+
+    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        now = datetime.utcnow()
+        # Newest first: DET-0 is a low-confidence person, DET-3 a face on another camera
+        for i, (camera_id, detection_type, confidence) in enumerate(
+            [("CAM-1", "person", 0.3), ("CAM-1", "face", 0.9), ("CAM-1", "face", 0.8), ("CAM-2", "face", 0.95)]
+        ):
+            row = vars(make_detection(
+                id=f"DET-{i}",
+                camera_id=camera_id,
+                detection_type=detection_type,
+                confidence=confidence,
+                is_processed=i % 2 == 1,
+                created_at=now - timedelta(seconds=i),
+                updated_at=now - timedelta(seconds=i),
+            ))
+            session.add(Detection(**row))
+        await session.commit()
+
+        yield session
+
+    await engine.dispose()
+
+
+class TestSendFrame:
+    """Tests for raw and legacy JSON frame uploads."""
+
+    def test_raw_frame_with_header_metadata(self, client):
+        """Test that an octet-stream body is passed through untouched with header metadata."""
+        client, service = client
+
+        response = client.post(
+            "/detections/send-frame",
+            content=FRAME,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "X-Camera-Id": "CAM-1",
+                "X-Frame-Number": "42",
+                "X-Frame-Timestamp": "2024-01-31T09:00:00",
+            },
+        )
+
+        assert response.status_code == 201
+        assert service.calls == [("CAM-1", FRAME, 42, datetime(2024, 1, 31, 9, 0, 0))]
+        assert response.json()["data"]["detections"][0]["bbox"] == {"x": 0.1, "y": 0.2, "width": 0.3, "height": 0.4}
+
+    def test_raw_frame_requires_camera_id(self, client):
+        """Test that a raw frame without X-Camera-Id is rejected before processing."""
+        client, service = client
+
+        response = client.post(
+            "/detections/send-frame",
+            content=FRAME,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+        assert response.status_code == 422
+        assert service.calls == []
+
+    def test_legacy_json_frame(self, client):
+        """Test that the base64 JSON body is still accepted."""
+        client, service = client
+
+        response = client.post(
+            "/detections/send-frame",
+            json={"camera_id": "CAM-1", "frame_data": base64.b64encode(FRAME).decode(), "frame_number": 7},
+        )
+
+        assert response.status_code == 201
+        assert service.calls == [("CAM-1", FRAME, 7, None)]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"frame_data": base64.b64encode(FRAME).decode()},
+            {"camera_id": "CAM-1", "frame_data": "not base64!"},
+        ],
+    )
+    def test_invalid_json_frame_returns_422(self, client, body):
+        """Test that a JSON body missing fields or with bad base64 is rejected."""
+        client, service = client
+
+        response = client.post("/detections/send-frame", json=body)
+
+        assert response.status_code == 422
+        assert service.calls == []
+
+
+class TestDetectionResponses:
+    """Tests for building responses from stored rows without validation."""
+
+    def test_constructed_response_matches_validated(self):
+        """Test that the unvalidated builder dumps exactly what validation would."""
+        row = make_detection()
+
+        built = detections_api._detection_response(row)
+        validated = DetectionResponse(
+            id=row.id,
+            camera_id=row.camera_id,
+            detection_type=row.detection_type,
+            confidence=row.confidence,
+            bbox={"x": row.bbox_x, "y": row.bbox_y, "width": row.bbox_width, "height": row.bbox_height},
+            person_name=row.person_name,
+            person_id=row.person_id,
+            face_encoding=row.face_encoding,
+            is_processed=row.is_processed,
+            processing_status=row.processing_status,
+            frame_number=row.frame_number,
+            frame_timestamp=row.frame_timestamp,
+            createdAt=row.created_at,
+            updatedAt=row.updated_at,
+        )
+
+        assert built.model_dump(mode="json") == validated.model_dump(mode="json")
+
+
+class TestDetectionPermissions:
+    """Tests for the route-level detection permission checks."""
+
+    def test_denied_before_service_is_built(self):
+        """Test that a missing permission is rejected with the route's message and no service."""
+        built = []
+
+        def service_factory():
+            built.append(True)
+            return FakeDetectionService()
+
+        app = FastAPI()
+        app.include_router(detections_api.router, prefix="/detections")
+        app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+            "u1", "u1@example.com", "viewer", ["detections:read"]
+        )
+        app.dependency_overrides[detections_api.get_detection_service] = service_factory
+        client = TestClient(app)
+
+        response = client.post(
+            "/detections/send-frame",
+            content=FRAME,
+            headers={"Content-Type": "application/octet-stream", "X-Camera-Id": "CAM-1"},
+        )
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "You don't have permission to send frames for detection"
+        assert built == []
+        assert client.get("/detections/live").status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_denial_reuses_one_exception(self):
+        """Test that a permission dependency raises the same prebuilt 403 without growing its traceback."""
+        checker = require_permission("detections:write", "nope")
+        viewer = CurrentUser("u1", "u1@example.com", "viewer", ["detections:read"])
+        raised = []
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await checker(viewer)
+            raised.append(exc_info.value)
+
+        assert raised[0] is raised[1]
+        assert (raised[1].status_code, raised[1].detail) == (403, "nope")
+        depth, tb = 0, raised[1].__traceback__
+        while tb:
+            depth, tb = depth + 1, tb.tb_next
+        assert depth <= 3
+        assert await checker(CurrentUser("u2", "u2@example.com", "operator", ["detections:write"])) is not None
+
+
+class TestLiveDetectionsJson:
+    """Tests for the database-built live detections array."""
+
+    @pytest.mark.asyncio
+    async def test_rows_match_schema(self, db_session):
+        """Test that each aggregated row validates to what the ORM row would produce."""
+        repo = DetectionRepository(db_session)
+
+        text, count = await repo.get_live_json(camera_id="CAM-1", min_confidence=0.5)
+        rows = orjson.loads(text)
+
+        expected = [detections_api._detection_response(await repo.get_by_id(i)) for i in ("DET-1", "DET-2")]
+        assert count == 2
+        assert [DetectionResponse.model_validate(row) for row in rows] == expected
+        assert rows[0]["is_processed"] is True
+
+    @pytest.mark.asyncio
+    async def test_filters_apply_before_limit(self, db_session):
+        """Test that type and confidence filters run in SQL, before paging."""
+        repo = DetectionRepository(db_session)
+
+        text, count = await repo.get_live_json(camera_id="CAM-1", detection_type="face", limit=1, offset=1)
+
+        assert count == 1
+        assert [row["id"] for row in orjson.loads(text)] == ["DET-2"]
+
+    @pytest.mark.asyncio
+    async def test_recent_across_cameras_and_empty(self, db_session):
+        """Test the all-camera recent window and an empty page."""
+        repo = DetectionRepository(db_session)
+
+        text, count = await repo.get_live_json(min_confidence=0.9)
+        assert [row["id"] for row in orjson.loads(text)] == ["DET-1", "DET-3"]
+        assert count == 2
+
+        assert await repo.get_live_json(camera_id="CAM-404") == ("[]", 0)
+
+    @pytest.mark.asyncio
+    async def test_compact_detections_same_on_cache_hit(self, db_session):
+        """Test that live detections come back as the same compact dicts from the database and the cache."""
+        service = DetectionService(db_session)
+        service.cache = CacheService()
+        service.cache.redis = SimpleNamespace(async_client=FakeAsyncRedis())
+        stored = {}
+
+        async def cache_live_detections(camera_id, detections):
+            stored[camera_id] = {"detections": detections, "count": len(detections), "timestamp": "now"}
+
+        async def get_cached_live_detections(camera_id):
+            return stored.get(camera_id)
+
+        service.cache.cache_live_detections = cache_live_detections
+        service.cache.get_cached_live_detections = get_cached_live_detections
+
+        miss = await service.get_live_detections(camera_id="CAM-1", min_confidence=0.5)
+        hit = await service.get_live_detections(camera_id="CAM-1", min_confidence=0.5)
+
+        assert miss["cache_hit"] is False and hit["cache_hit"] is True
+        assert hit["detections"] == miss["detections"]
+        assert miss["detections"][0] == {
+            "id": "DET-1",
+            "detection_type": "face",
+            "confidence": 0.9,
+            "bbox": {"x": 0.1, "y": 0.2, "width": 0.3, "height": 0.4},
+            "person_name": "Ada Lovelace",
+            "person_id": "PERSON-1",
+        }
+
+
+    @pytest.mark.asyncio
+    async def test_live_endpoint_same_on_cache_hit(self, db_session):
+        """Test that /live returns the same body from the database and the cache, per filter set."""
+        service = DetectionService(db_session)
+        service.cache = CacheService()
+        redis = FakeAsyncRedis()
+        service.cache.redis = SimpleNamespace(async_client=redis)
+        app = FastAPI()
+        app.include_router(detections_api.router, prefix="/detections")
+        app.dependency_overrides[get_current_user] = lambda: CurrentUser("u1", "u1@example.com", "viewer", ["*"])
+        app.dependency_overrides[detections_api.get_detection_service] = lambda: service
+        params = {"camera_id": "CAM-1", "detection_type": "face", "limit": 1, "offset": 1}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            miss = (await client.get("/detections/live", params=params)).json()["data"]
+            hit = (await client.get("/detections/live", params=params)).json()["data"]
+            other = (await client.get("/detections/live", params={**params, "offset": 0})).json()["data"]
+
+        assert (miss.pop("cache_hit"), hit.pop("cache_hit"), other["cache_hit"]) == (False, True, False)
+        assert hit == miss
+        assert [d["id"] for d in miss["detections"]] == ["DET-2"]
+        assert {"camera_id", "processing_status", "createdAt"} <= set(miss["detections"][0])
+        assert "T" in miss["last_updated"]
+        assert [d["id"] for d in other["detections"]] == ["DET-1"]
+        assert all(ttl == CacheService.LIVE_DETECTIONS_TTL for ttl in redis.ttls.values())
+
+class TestDetectionStatistics:
+    """Tests for the aggregate detection statistics queries."""
+
+    @pytest.mark.asyncio
+    async def test_statistics_aggregate_in_sql(self, db_session):
+        """Test that camera statistics come from the aggregate queries, not loaded rows."""
+        service = DetectionService(db_session)
+        service.cache = CacheService()
+        service.cache.redis = SimpleNamespace(async_client=FakeAsyncRedis())
+        newest = (await DetectionRepository(db_session).get_recent(camera_id="CAM-1", limit=1))[0]
+
+        stats = await service.get_detection_statistics("CAM-1")
+
+        assert stats == {
+            "total_detections": 3,
+            "detections_today": 3,
+            "detections_this_hour": 3,
+            "average_confidence": 0.667,
+            "most_detected_person": "PERSON-1",
+            "detection_types": {"face": 2, "person": 1},
+            "cameras_active": 1,
+            "last_detection_timestamp": newest.created_at,
+        }
+        assert await DetectionRepository(db_session).count_by_camera("CAM-2") == 1
+
+
+class TestDirectSerialization:
+    """Tests for the list endpoints that serialize rows without Pydantic."""
+
+    def test_live_detections_splice_database_json(self, client):
+        """Test that /live wraps the database-built array in the success envelope."""
+        client, _ = client
+
+        response = client.get("/detections/live", params={"camera_id": "CAM-1"})
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "success": True,
+            "data": {
+                "camera_id": "CAM-1",
+                "detections": [{"id": "DET-1"}, {"id": "DET-2"}],
+                "total_detections": 2,
+                "last_updated": "2024-01-31T09:00:00",
+                "cache_hit": False,
+            },
+            "meta": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_events_stream_matches_schema(self, monkeypatch):
+        """Test that the streamed /events body is what DetectionEventLogResponse would emit, filtered before paging."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(DetectionEventLog.__table__.create)
+
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        events = [
+            make_event(id="EVT-0", severity="alert", created_at=CREATED, updated_at=CREATED),
+            *(
+                make_event(id=f"EVT-{i}", created_at=CREATED - timedelta(minutes=i), updated_at=CREATED)
+                for i in range(1, 4)
+            ),
+            make_event(id="EVT-4", camera_id="CAM-2", created_at=CREATED, updated_at=CREATED),
+        ]
+        async with session_factory() as session:
+            session.add_all(DetectionEventLog(**vars(e)) for e in events)
+            await session.commit()
+        monkeypatch.setattr(detections_api, "AsyncSessionLocal", session_factory)
+
+        chunks = [chunk async for chunk in detections_api._events_body(2, 0, camera_id="CAM-1", severity="info")]
+        body = orjson.loads(b"".join(chunks))
+        await engine.dispose()
+
+        assert body["success"] is True
+        assert body["data"] == [
+            DetectionEventLogResponse.model_validate(
+                {**vars(e), "createdAt": e.created_at, "updatedAt": e.updated_at}
+            ).model_dump(mode="json")
+            for e in events[1:3]
+        ]
+        assert body["meta"] == {"page": 1, "pageSize": 2, "total": 2, "totalPages": 1, "nextCursor": None}
+
+
+class TestWebSocketDispatch:
+    """Tests for the detection WebSocket message handlers."""
+
+    @pytest.fixture
+    def ws_client(self):
+        """Build a client for the detections router; the WebSocket needs no request-scoped database."""
+        app = FastAPI()
+        app.include_router(detections_api.router, prefix="/detections")
+        return TestClient(app)
+
+    def test_stats_use_a_session_per_message(self, ws_client, monkeypatch):
+        """Test that get_stats opens and closes its own session instead of holding one per connection."""
+        sessions = []
+
+        class FakeSession:
+            async def __aenter__(self):
+                sessions.append("open")
+                return None
+
+            async def __aexit__(self, *exc):
+                sessions.append("closed")
+
+        class StatsService:
+            def __init__(self, db):
+                pass
+
+            async def get_queue_stats(self):
+                return {"pending": 1}
+
+        monkeypatch.setattr(detections_api, "AsyncSessionLocal", FakeSession)
+        monkeypatch.setattr(detections_api, "DetectionService", StatsService)
+
+        with ws_client.websocket_connect("/detections/ws/client-3") as websocket:
+            assert sessions == []
+            websocket.send_json({"type": "get_stats"})
+            stats = websocket.receive_json()
+
+        assert stats == {"type": "stats", "queue_stats": {"pending": 1}}
+        assert sessions == ["open", "closed"]
+
+    def test_messages_are_dispatched_by_type(self, ws_client):
+        """Test that known types reach their handler and others get an error reply."""
+        with ws_client.websocket_connect("/detections/ws/client-1") as websocket:
+            websocket.send_text('{"type": "PING"}')
+            pong = websocket.receive_json()
+
+            websocket.send_json({"type": "unsubscribe", "event_types": ["alert"]})
+            unsubscribed = websocket.receive_json()
+
+            websocket.send_json({"type": "dance"})
+            unknown = websocket.receive_json()
+
+            websocket.send_text("not json")
+            invalid = websocket.receive_json()
+
+        assert pong["type"] == "pong"
+        assert unsubscribed == {
+            "type": "subscription",
+            "event_types": ["alert"],
+            "subscribed": False,
+            "message": "Unsubscribed from event types: alert",
+        }
+        assert unknown == {"type": "error", "message": "Unknown message type: dance"}
+        assert invalid == {"type": "error", "message": "Invalid JSON format"}
+
+    def test_channel_names_are_shared_objects(self):
+        """Test that channel names are built once per id and reused."""
+        camera_id = "".join(["CAM-", "77"])
+
+        assert detections_api._camera_channel(camera_id) == "camera:CAM-77"
+        assert detections_api._camera_channel(camera_id) is detections_api._camera_channel("CAM-77")
+        assert detections_api._event_channel("alert") is detections_api._event_channel("alert")
+
+    def test_event_types_subscribe_in_one_batch(self, ws_client):
+        """Test that all requested event channels are (un)subscribed with one reply each."""
+        with ws_client.websocket_connect("/detections/ws/client-2") as websocket:
+            websocket.send_json({"type": "subscribe", "event_types": ["alert", "info"]})
+            subscribed = websocket.receive_json()
+            channels = set().union(*ws_manager.subscriptions.values())
+
+            websocket.send_json({"type": "unsubscribe", "event_types": ["alert"]})
+            websocket.receive_json()
+            remaining = set().union(*ws_manager.subscriptions.values())
+
+        assert subscribed["message"] == "Subscribed to event types: alert, info"
+        assert {"events:alert", "events:info"} <= channels
+        assert "events:alert" not in remaining
+        assert "events:info" in remaining
+
+
+class TestSubscribePayloadCache:
+    """Tests for the shared per-camera subscribe reply."""
+
+    @pytest.mark.asyncio
+    async def test_subscribers_share_one_query_until_a_detection(self, monkeypatch):
+        """Test that concurrent subscribers share one computation and a new detection invalidates it."""
+        calls = []
+
+        async def compute(camera_id, min_confidence):
+            calls.append((camera_id, min_confidence))
+            await asyncio.sleep(0)
+            return f'{{"camera_id": "{camera_id}", "call": {len(calls)}}}'
+
+        monkeypatch.setattr(detections_api, "_compute_subscribe_payload", compute)
+        monkeypatch.setattr(detections_api, "_subscribe_payloads", {})
+
+        first, second = await asyncio.gather(
+            detections_api._subscribe_payload("CAM-1", 0.5),
+            detections_api._subscribe_payload("CAM-1", 0.51),
+        )
+        assert first == second
+        assert calls == [("CAM-1", 0.5)]
+
+        await detections_api.broadcast_detection("DET-9", "CAM-1", "face", 0.9)
+        assert await detections_api._subscribe_payload("CAM-1", 0.5) != first
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_computation_is_not_cached(self, monkeypatch):
+        """Test that a failed query is retried by the next subscriber."""
+
+        async def broken(camera_id, min_confidence):
+            raise ConnectionError("db down")
+
+        monkeypatch.setattr(detections_api, "_compute_subscribe_payload", broken)
+        monkeypatch.setattr(detections_api, "_subscribe_payloads", {})
+
+        with pytest.raises(ConnectionError):
+            await detections_api._subscribe_payload("CAM-1", 0.5)
+
+        assert detections_api._subscribe_payloads == {}
+
+
+class TestDetectionCaching:
+    """Tests for the dashboard read caches."""
+
+    @pytest.fixture
+    def service(self):
+        """Build a detection service with fake repositories and an in-memory cache."""
+        cache = CacheService()
+        cache.redis = SimpleNamespace(async_client=FakeAsyncRedis())
+        service = DetectionService(None)
+        service.cache = cache
+        service.queue_repo = FakeQueueRepository()
+        service.config_repo = FakeConfigRepository()
+        return service
+
+    def test_ttl_jitter_stays_within_ten_percent(self):
+        """Test that jittered TTLs spread around the base TTL by at most 10%."""
+        ttls = {CacheService._jittered(100) for _ in range(200)}
+
+        assert min(ttls) >= 90
+        assert max(ttls) <= 110
+        assert len(ttls) > 1
+
+    @pytest.mark.asyncio
+    async def test_queue_stats_served_from_cache(self, service):
+        """Test that queue statistics hit the database once per TTL window."""
+        first = await service.get_queue_stats()
+        second = await service.get_queue_stats()
+
+        assert first == second == {"pending": 2, "processing": 1, "completed": 5, "failed": 0}
+        assert service.queue_repo.calls == 1
+        assert 9 <= service.cache.redis.async_client.ttls["detection:queue_stats"] <= 11
+
+    @pytest.mark.asyncio
+    async def test_provider_config_update_invalidates_cache(self, service):
+        """Test that changing the provider config drops the cached config and summary."""
+        await service.cache.cache_provider_config({"id": "CFG-1", "timeout_seconds": 30})
+        await service.cache.cache_detection_summary({"provider_configured": True})
+
+        await service.update_provider_config("CFG-1", DetectionProviderConfigUpdate(timeout_seconds=60))
+
+        assert await service.cache.get_cached_provider_config() is None
+        assert await service.cache.get_cached_detection_summary() is None
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that records text frames or fails on send."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(data)
+
+
+class TestBroadcastFanOut:
+    """Tests for the connection manager's queued broadcast."""
+
+    @pytest.mark.asyncio
+    async def test_channel_broadcast_encodes_once_and_drops_dead_sockets(self, monkeypatch):
+        """Test that one encoded frame reaches every subscriber and failed sockets are disconnected."""
+        manager = ConnectionManager()
+        alive, dead, other = FakeWebSocket(), FakeWebSocket(fail=True), FakeWebSocket()
+        for client_id, websocket in (("a", alive), ("b", dead), ("c", other)):
+            await manager.connect(websocket, client_id)
+        await manager.subscribe_many(alive, ["camera:CAM-1"])
+        await manager.subscribe_many(dead, ["camera:CAM-1"])
+
+        encodes = []
+        real_dumps = orjson.dumps
+        monkeypatch.setattr(
+            "app.services.websocket_manager.orjson.dumps", lambda obj: encodes.append(obj) or real_dumps(obj)
+        )
+
+        await manager.broadcast_to_channel("camera:CAM-1", {"type": "detection", "id": "DET-1"})
+        await asyncio.sleep(0.01)
+
+        assert len(encodes) == 1
+        assert orjson.loads(alive.sent[0]) == {"type": "detection", "id": "DET-1"}
+        assert other.sent == []
+        assert dead not in manager.subscriptions
+        assert "b" not in manager.active_connections
+        assert manager.get_total_connections() == 2
+
+        for client_id, websocket in (("a", alive), ("c", other)):
+            await manager.disconnect(websocket, client_id)
+        assert manager.senders == {}
+
+    def test_full_outbox_sheds_replies_before_broadcasts(self):
+        """Test that a full outbox drops the oldest reply first and keeps broadcast frames."""
+        outbox = Outbox(3)
+        outbox.put("reply-1", droppable=True)
+        outbox.put("detection-1", droppable=False)
+        outbox.put("reply-2", droppable=True)
+
+        assert outbox.put("detection-2", droppable=False) is True
+        assert outbox.put("detection-3", droppable=False) is True
+        assert [frame for frame, _ in outbox.frames] == ["detection-1", "detection-2", "detection-3"]
+
+        # Only broadcasts left: new replies are shed, new broadcasts replace the oldest
+        assert outbox.put("reply-3", droppable=True) is False
+        assert outbox.put("detection-4", droppable=False) is True
+        assert [frame for frame, _ in outbox.frames] == ["detection-2", "detection-3", "detection-4"]
+        assert outbox.dropped == 4
@@ -0,0 +1,206 @@
+"""Unit tests for person endpoints and queries."""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import persons as persons_api
+from app.core.deps import CurrentUser, get_current_user
+from app.db.session import get_db
+from app.core.responses import PydanticResponse
+from app.models.person import Person, PersonFaceEncoding, PersonImage
+from app.schemas.common import PaginatedResponse, PaginationMeta
+from app.schemas.person import PersonResponse
+
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+CREATED = datetime(2024, 1, 31, 9, 0, 0)
+
+
+@pytest.fixture
+async def db_session():
+    """Create an in-memory database with five persons across two departments."""
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+
+    async with engine.begin() as conn:
+        for table in (Person.__table__, PersonImage.__table__, PersonFaceEncoding.__table__):
+            await conn.run_sync(table.create)
+
+    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        people = [
+            ("Ada", "Lovelace"),
+            ("Alan", "Turing"),
+            ("Grace", "Hopper"),
+            ("Alonzo", "Church"),
+            ("Edsger", "Dijkstra"),
+        ]
+        for i, (first_name, last_name) in enumerate(people):
+            session.add(
+                Person(
+                    id=f"PERSON-{i}",
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=f"{first_name.lower()}@example.com",
+                    person_type="employee",
+                    department="Research" if i % 2 else "Engineering",
+                    created_at=CREATED,
+                    updated_at=CREATED,
+                )
+            )
+        await session.commit()
+
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def app(db_session, monkeypatch):
+    """Build an app serving the persons router against the test database."""
+
+    async def session_override():
+        yield db_session
+
+    app = FastAPI()
+    app.include_router(persons_api.router, prefix="/persons")
+    monkeypatch.setattr(persons_api, "AsyncSessionLocal", sessionmaker(db_session.bind, class_=AsyncSession))
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser("u1", "a@example.com", "admin", ["*"])
+    app.dependency_overrides[get_db] = session_override
+    return app
+
+
+class TestPersonResponses:
+    """Tests for person response bodies."""
+
+    @pytest.mark.asyncio
+    async def test_person_response_from_orm(self, db_session):
+        """Test that PersonResponse reads the ORM row directly and dumps camelCase timestamps."""
+        person = await db_session.get(Person, "PERSON-0")
+
+        body = PersonResponse.model_validate(person).model_dump(mode="json", by_alias=True)
+
+        assert body["first_name"] == "Ada"
+        assert body["createdAt"] == body["updatedAt"] == "2024-01-31T09:00:00"
+        assert body["face_encoding_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_person_body(self, app):
+        """Test that GET /persons/{id} serializes the validated person."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/persons/PERSON-1")).json()
+
+        assert body["success"] is True
+        assert body["data"]["id"] == "PERSON-1"
+        assert body["data"]["last_name"] == "Turing"
+        assert body["data"]["createdAt"] == "2024-01-31T09:00:00"
+
+    @pytest.mark.asyncio
+    async def test_get_person_not_modified(self, app):
+        """Test that GET /persons/{id} answers a matching If-None-Match with 304."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            etag = (await client.get("/persons/PERSON-1")).headers["etag"]
+            cached = await client.get("/persons/PERSON-1", headers={"If-None-Match": etag})
+            missing = await client.get("/persons/NOPE", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert missing.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_constructed_response_matches_validated(self, db_session):
+        """Test that the unvalidated fast path emits the same body as model_validate."""
+        person = await db_session.get(Person, "PERSON-3")
+
+        fast = persons_api._to_person_response(person)
+
+        validated = PersonResponse.model_validate(person)
+        assert fast.model_dump_json(by_alias=True) == validated.model_dump_json(by_alias=True)
+        assert fast.model_fields_set == set(PersonResponse.model_fields)
+
+
+class TestPersonList:
+    """Tests for the paginated person list."""
+
+    @pytest.mark.asyncio
+    async def test_total_counts_all_matches(self, app):
+        """Test that the total is the SQL count of matches, not the page length plus offset."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/persons", params={"page": 2, "page_size": 2})).json()
+
+        assert len(body["data"]) == 2
+        assert body["meta"]["total"] == 5
+        assert body["meta"]["totalPages"] == 3
+
+    @pytest.mark.asyncio
+    async def test_filters_apply_before_paging(self, app):
+        """Test that filters run in SQL so a page is filled with matching rows."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/persons", params={"department": "Research", "page_size": 1})).json()
+
+        assert len(body["data"]) == 1
+        assert body["data"][0]["department"] == "Research"
+        assert body["meta"]["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_search_pages_in_sql(self, app):
+        """Test that search returns only the requested page with the full match count."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/persons/search", params={"q": "al", "page_size": 1, "page": 2})).json()
+
+        assert len(body["data"]) == 1
+        assert body["data"][0]["first_name"] in {"Alan", "Alonzo"}
+        assert body["meta"]["total"] == 2
+        assert body["meta"]["totalPages"] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_streamed_page_matches_response_model(self, app, db_session):
+        """Test that the streamed list body is what PaginatedResponse would serialize."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/persons", params={"department": "Research"})
+
+        persons = [await db_session.get(Person, person_id) for person_id in ("PERSON-1", "PERSON-3")]
+        expected = PaginatedResponse[PersonResponse](
+            data=[PersonResponse.model_validate(p) for p in persons],
+            meta=PaginationMeta(page=1, pageSize=20, total=2, totalPages=1),
+        )
+        body = response.json()
+        body["data"].sort(key=lambda p: p["id"])
+        assert response.headers["content-type"] == "application/json"
+        assert body == expected.model_dump(mode="json", by_alias=True)
+
+    @pytest.mark.asyncio
+    async def test_large_search_page_serialized_off_loop(self, app, monkeypatch):
+        """Test that a search page serialized on a worker thread is byte-identical to the inline one."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            inline = (await client.get("/persons/search", params={"q": "a"})).content
+            monkeypatch.setattr(PydanticResponse, "OFFLOAD_MIN_ITEMS", 1)
+            offloaded = (await client.get("/persons/search", params={"q": "a"})).content
+
+        assert offloaded == inline
+
+
+class TestPersonPermissions:
+    """Tests for the route-level permission checks."""
+
+    @pytest.mark.asyncio
+    async def test_denied_before_session_is_opened(self, app):
+        """Test that a missing permission is a 403 without resolving the service's session."""
+
+        async def no_session():
+            raise AssertionError("session opened for a denied request")
+            yield  # pragma: no cover
+
+        viewer = CurrentUser("u2", "v@example.com", "viewer", ["persons:read"])
+        app.dependency_overrides[get_current_user] = lambda: viewer
+        app.dependency_overrides[get_db] = no_session
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.delete("/persons/PERSON-0")
+
+        assert response.status_code == 403
+        assert response.json()["detail"] == "You don't have permission to manage persons"
@@ -0,0 +1,287 @@
+"""Unit tests for the user and role endpoints."""
+
+import json
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import roles as roles_api
+from app.api.v1 import users as users_api
+from app.core.deps import CurrentUser, get_current_user
+from app.core.redis import cache_service
+from app.db.session import get_db
+from app.models.user import Role, User
+from app.schemas.common import PaginatedResponse, PaginationMeta, SuccessResponse
+from app.schemas.user import RoleResponse, UserResponse
+
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+CREATED = datetime(2024, 1, 31, 9, 0, 0)
+
+
+class FakeAsyncRedis:
+    """Minimal in-memory stand-in for the asyncio Redis client."""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+
+class FakeRedisClient:
+    """RedisClient stand-in exposing only the asyncio client."""
+
+    def __init__(self):
+        self.async_client = FakeAsyncRedis()
+
+
+@pytest.fixture
+async def db_session():
+    """Create an in-memory database with two roles and three users."""
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Role.__table__.create)
+        await conn.run_sync(User.__table__.create)
+
+    AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        for role_id, permissions in [("admin", ["*"]), ("operator", ["users:read"])]:
+            session.add(
+                Role(
+                    id=role_id,
+                    name=role_id.title(),
+                    permissions=json.dumps(permissions),
+                    created_at=CREATED,
+                    updated_at=CREATED,
+                )
+            )
+        for i, (name, role_id) in enumerate([("Ada", "admin"), ("Alan", "operator"), ("Grace", "operator")]):
+            session.add(
+                User(
+                    id=f"USER-{i}",
+                    email=f"{name.lower()}@example.com",
+                    name=name,
+                    hashed_password="x",
+                    role_id=role_id,
+                    created_at=CREATED,
+                    updated_at=CREATED,
+                )
+            )
+        await session.commit()
+
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def app(db_session, monkeypatch):
+    """Build an app serving the users and roles routers against the test database."""
+
+    async def session_override():
+        yield db_session
+
+    app = FastAPI()
+    app.include_router(users_api.router)
+    monkeypatch.setattr(users_api, "AsyncSessionLocal", sessionmaker(db_session.bind, class_=AsyncSession))
+    app.include_router(roles_api.router)
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser("USER-0", "ada@example.com", "admin", ["*"])
+    app.dependency_overrides[get_db] = session_override
+    return app
+
+
+class TestDirectResponses:
+    """Tests for handlers that return their body without response_model re-validation."""
+
+    @pytest.mark.asyncio
+    async def test_user_body_matches_response_model(self, app, db_session):
+        """Test that GET /users/{id} emits what the declared response_model would."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/users/USER-1")
+
+        user = await db_session.get(User, "USER-1")
+        expected = SuccessResponse[UserResponse](data=UserResponse.model_validate(user))
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == expected.model_dump(mode="json", by_alias=True)
+        assert {"roleId", "lastActive", "createdAt", "updatedAt"} <= set(response.json()["data"])
+
+    @pytest.mark.asyncio
+    async def test_create_keeps_201(self, app):
+        """Test that returning the response directly keeps the route's 201 status."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.post(
+                "/users", json={"name": "Linus", "email": "linus@example.com", "roleId": "operator", "password": "pw"}
+            )
+
+        assert response.status_code == 201
+        assert response.json()["data"]["email"] == "linus@example.com"
+        assert UUID(response.json()["data"]["id"]).version == 7
+
+    @pytest.mark.asyncio
+    async def test_duplicate_email_is_rejected_by_constraint(self, app):
+        """Test that create and update report a taken email as 400 via the unique constraint."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            created = await client.post(
+                "/users", json={"name": "Ada", "email": "ada@example.com", "roleId": "admin", "password": "pw"}
+            )
+            updated = await client.put("/users/USER-1", json={"email": "grace@example.com"})
+            unchanged = (await client.get("/users/USER-1")).json()
+
+        assert created.status_code == updated.status_code == 400
+        assert updated.json()["detail"] == "User with this email already exists"
+        assert unchanged["data"]["email"] == "alan@example.com"
+
+    @pytest.mark.asyncio
+    async def test_roles_body(self, app):
+        """Test that roles are returned with their parsed permission lists."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/roles")).json()
+
+        assert [RoleResponse.model_validate(r).permissions for r in body["data"]] == [["*"], ["users:read"]]
+        assert body["data"][0]["createdAt"] == "2024-01-31T09:00:00"
+
+
+class TestUserList:
+    """Tests for the paginated user list."""
+
+    @pytest.mark.asyncio
+    async def test_total_is_counted_in_sql(self, app):
+        """Test that the total covers every match while only one page is returned."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/users", params={"page_size": 2})).json()
+
+        assert len(body["data"]) == 2
+        assert body["meta"]["total"] == 3
+        assert body["meta"]["totalPages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_streamed_page_matches_response_model(self, app, db_session):
+        """Test that the streamed list body is what PaginatedResponse would serialize."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/users", params={"role_id": "operator"})
+
+        users = [await db_session.get(User, user_id) for user_id in ("USER-1", "USER-2")]
+        expected = PaginatedResponse[UserResponse](
+            data=[UserResponse.model_validate(u) for u in users],
+            meta=PaginationMeta(page=1, pageSize=20, total=2, totalPages=1),
+        )
+        body = response.json()
+        body["data"].sort(key=lambda u: u["id"])
+        assert response.headers["content-type"] == "application/json"
+        assert body == expected.model_dump(mode="json", by_alias=True)
+
+    @pytest.mark.asyncio
+    async def test_total_respects_filter(self, app):
+        """Test that the count uses the same filter as the page."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/users", params={"role_id": "operator"})).json()
+
+        assert {u["id"] for u in body["data"]} == {"USER-1", "USER-2"}
+        assert body["meta"]["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_filters_are_combined_with_and(self, app):
+        """Test that search, role and status filters must all match."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            body = (await client.get("/users", params={"search": "alan", "role_id": "operator"})).json()
+            none = (await client.get("/users", params={"search": "ada", "role_id": "operator"})).json()
+
+        assert [u["id"] for u in body["data"]] == ["USER-1"]
+        assert body["meta"]["total"] == 1
+        assert none["data"] == [] and none["meta"]["total"] == 0
+
+
+class TestUserCountCache:
+    """Tests for the cached user list total."""
+
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        """Back the shared cache service with the fake client."""
+        fake = FakeRedisClient()
+        monkeypatch.setattr(cache_service, "redis", fake)
+        return fake.async_client
+
+    @pytest.mark.asyncio
+    async def test_pages_share_one_count(self, app, db_session, redis):
+        """Test that the total is cached per filter set, independent of the page."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            await client.get("/users", params={"page_size": 1})
+            count_keys = [k for k in redis.store if k.startswith("user:count:0:")]
+
+            db_session.add(User(id="USER-X", email="x@example.com", name="X", hashed_password="x", role_id="admin"))
+            await db_session.commit()
+            body = (await client.get("/users", params={"page": 2, "page_size": 1})).json()
+
+        assert len(count_keys) == 1
+        assert redis.ttls[count_keys[0]] == cache_service.LIST_COUNT_TTL
+        assert body["meta"]["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_create_invalidates_count(self, app, redis):
+        """Test that creating a user retires the cached totals."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            await client.get("/users")
+            await client.post(
+                "/users", json={"name": "Linus", "email": "linus@example.com", "roleId": "operator", "password": "pw"}
+            )
+            body = (await client.get("/users")).json()
+
+        assert redis.store["user:count:ver"] == "1"
+        assert body["meta"]["total"] == 4
+
+
+class TestConditionalGets:
+    """Tests for ETag / If-None-Match on single-resource GETs."""
+
+    @pytest.mark.asyncio
+    async def test_user_not_modified(self, app, db_session):
+        """Test that a matching If-None-Match gets an empty 304 until the user changes."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.get("/users/USER-1")
+            etag = first.headers["etag"]
+            cached = await client.get("/users/USER-1", headers={"If-None-Match": etag})
+
+            user = await db_session.get(User, "USER-1")
+            user.updated_at = datetime(2024, 2, 1, 9, 0, 0)
+            await db_session.commit()
+            changed = await client.get("/users/USER-1", headers={"If-None-Match": etag})
+
+        assert etag.startswith('W/"')
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_roles_not_modified(self, app, db_session):
+        """Test that the roles ETag is stable and changes when a role is added."""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            etag = (await client.get("/roles")).headers["etag"]
+            cached = await client.get("/roles", headers={"If-None-Match": f'"other", {etag}'})
+
+            db_session.add(Role(id="viewer", name="Viewer", permissions="[]", created_at=CREATED, updated_at=CREATED))
+            await db_session.commit()
+            changed = await client.get("/roles", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert changed.status_code == 200
+        assert len(changed.json()["data"]) == 3
@@ -4,6 +4,7 @@ import logging
 from celery import Celery
 from celery.schedules import crontab
 
+from app.core.celery_serialization import ORJSON_SERIALIZER
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -18,9 +19,11 @@ app = Celery(
 # Configure Celery
 app.conf.update(
     # Task configuration
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer=settings.CELERY_TASK_SERIALIZER,
+    # json stays accepted so messages queued before the switch still run
+    accept_content=[ORJSON_SERIALIZER, "json"],
+    result_accept_content=[ORJSON_SERIALIZER, "json"],
+    result_serializer=settings.CELERY_RESULT_SERIALIZER,
     timezone="UTC",
     enable_utc=True,
     # Result configuration
@@ -32,8 +35,12 @@ app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes hard limit
     task_soft_time_limit=25 * 60,  # 25 minutes soft limit
-    # Worker configuration
-    worker_prefetch_multiplier=4,
+    # Worker configuration: reserve one task at a time and ack after the run
+    # so a lost worker's task is redelivered (Redis' default one-hour
+    # visibility timeout is longer than task_time_limit)
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
     worker_max_tasks_per_child=1000,
     # Routing configuration
     task_default_queue="default",